@@ -0,0 +1,112 @@
+"""
+StokKontrolListesi sayfa ayrıştırma benchmark'ı.
+
+Eski yol (xmltodict + alan alan dönüştürme) ile tablo tabanlı akış
+ayrıştırıcısını aynı sentetik sayfalar üzerinde karşılaştırır.
+
+Kullanım:
+    python benchmarks/stock_parse_benchmark.py [satır_sayısı] [tekrar]
+"""
+import io
+import sys
+import time
+import xmltodict
+from pttavm.models.stock import (
+    Stock, StockWarranty, StockDimensions,
+    StockPrice, StockProduct
+)
+from pttavm.utils.stock_parser import parse_stock_page
+
+ROW = """<a:StokKontrolDetay>
+<a:Aciklama>Kisa aciklama {i}</a:Aciklama><a:Agirlik>1.25</a:Agirlik><a:Aktif>true</a:Aktif>
+<a:Barkod>BRK-{i}</a:Barkod><a:BoyX>10</a:BoyX><a:BoyY>20</a:BoyY><a:BoyZ>30</a:BoyZ>
+<a:Desi>2</a:Desi><a:Durum>Mevcut</a:Durum><a:GarantiSuresi>24</a:GarantiSuresi>
+<a:GarantiVerenFirma>Firma</a:GarantiVerenFirma><a:Gtin>869{i:010d}</a:Gtin>
+<a:Iskonto>0</a:Iskonto><a:KDVOran>20</a:KDVOran><a:KDVli>120.5</a:KDVli><a:KDVsiz>100.42</a:KDVsiz>
+<a:KargoProfilId>3</a:KargoProfilId><a:Mevcut>true</a:Mevcut><a:Miktar>{i}</a:Miktar>
+<a:ShopId>42</a:ShopId><a:SingleBox>false</a:SingleBox><a:UrunAdi>Urun {i}</a:UrunAdi>
+<a:UrunId>{i}</a:UrunId><a:UrunKodu>KOD-{i}</a:UrunKodu><a:UrunUrl>https://www.pttavm.com/urun-{i}</a:UrunUrl>
+<a:UzunAciklama>&lt;p&gt;{description}&lt;/p&gt;</a:UzunAciklama><a:YeniKategoriId>1234</a:YeniKategoriId>
+</a:StokKontrolDetay>"""
+
+def build_page(rows: int) -> bytes:
+    description = "Uzun aciklama " * 50
+    items = "".join(ROW.format(i=i, description=description) for i in range(rows))
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"><soap:Body>
+<StokKontrolListesiResponse xmlns="http://tempuri.org/">
+<StokKontrolListesiResult xmlns:a="http://schemas.datacontract.org/2004/07/ePttAVMService">
+{items}
+</StokKontrolListesiResult></StokKontrolListesiResponse></soap:Body></soap:Envelope>""".encode('utf-8')
+
+def legacy_parse(content: bytes):
+    """0.1.5 sürümündeki ayrıştırma yolu"""
+    body = xmltodict.parse(content)['soap:Envelope']['soap:Body']
+    response = body['StokKontrolListesiResponse']['StokKontrolListesiResult']
+    stocks = []
+    for data in response.get('a:StokKontrolDetay', []):
+        stocks.append(Stock(
+            description=data.get('a:Aciklama'),
+            weight=float(data.get('a:Agirlik', 0)),
+            is_active=data.get('a:Aktif') == 'true',
+            barcode=data.get('a:Barkod'),
+            dimensions=StockDimensions(
+                x=float(data.get('a:BoyX', 0)),
+                y=float(data.get('a:BoyY', 0)),
+                z=float(data.get('a:BoyZ', 0))
+            ),
+            desi=float(data.get('a:Desi', 0)),
+            status=data.get('a:Durum'),
+            warranty=StockWarranty(
+                warranty_period=int(data.get('a:GarantiSuresi', 0)),
+                warranty_company=data.get('a:GarantiVerenFirma')
+            ),
+            gtin=data.get('a:Gtin'),
+            price=StockPrice(
+                price_discount=float(data.get('a:Iskonto', 0)),
+                price_vat_rate=float(data.get('a:KDVOran', 0)),
+                price_with_vat=float(data.get('a:KDVli', 0)),
+                price_without_vat=float(data.get('a:KDVsiz', 0))
+            ),
+            cargo_profile_id=int(data.get('a:KargoProfilId', 0)),
+            is_available=data.get('a:Mevcut') == 'true',
+            quantity=int(data.get('a:Miktar', 0)),
+            shop_id=int(data.get('a:ShopId', 0)),
+            is_single_box=data.get('a:SingleBox') == 'true',
+            product=StockProduct(
+                product_name=data.get('a:UrunAdi'),
+                product_id=int(data.get('a:UrunId', 0)),
+                product_code=data.get('a:UrunKodu'),
+                product_url=data.get('a:UrunUrl'),
+                product_long_description=data.get('a:UzunAciklama')
+            ),
+            category_id=int(data.get('a:YeniKategoriId', 0))
+        ))
+    return stocks
+
+def fast_parse(content: bytes):
+    return parse_stock_page(io.BytesIO(content), [])
+
+def bench(name: str, parser, content: bytes, rows: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stocks = parser(content)
+        best = min(best, time.perf_counter() - start)
+    assert len(stocks) == rows
+    print(f"{name:<10} {rows / best:>12,.0f} satır/sn  ({best * 1000:.1f} ms/sayfa)")
+    return best
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    content = build_page(rows)
+    print(f"Sayfa: {rows} satır, {len(content) / 1024:.0f} KB")
+
+    assert legacy_parse(content) == fast_parse(content)
+    before = bench("önce", legacy_parse, content, rows, repeat)
+    after = bench("sonra", fast_parse, content, rows, repeat)
+    print(f"Hızlanma: {before / after:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+StokGuncelleV2Bulk istek gövdesi oluşturma benchmark'ı.
+
+Eski f-string ``+=`` yolu ile ``XmlWriter`` tabanlı serileştiriciyi uzun
+açıklamalı 100 ürünlük gövdeler üzerinde karşılaştırır: süre, gövde boyutu,
+tepe bellek kullanımı ve gövdenin açıklamaları bozmadan geri okunup okunmadığı.
+
+Kullanım:
+    python benchmarks/xml_serialize_benchmark.py [ürün_sayısı] [tekrar]
+"""
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pttavm.models.product_update import ProductUpdateV2, ProductImage, ProductPart
+from pttavm.models.variant import Variant, VariantAttribute
+from pttavm.services.product_service import ProductService
+
+EPT = "{http://schemas.datacontract.org/2004/07/ePttAVMService}"
+
+def build_products(count: int):
+    description = "<p>Uzun &amp; detaylı ürün açıklaması</p>" * 200
+    return [
+        ProductUpdateV2(
+            barcode=f"BRK-{i}",
+            product_name=f"Ürün {i}",
+            product_code=f"KOD-{i}",
+            category_id=1234,
+            description="Kısa açıklama",
+            vat_rate=20,
+            price_without_vat=100.42,
+            quantity=i,
+            long_description=description,
+            parts=[ProductPart(part_no=1, desi=2.5, comment="Koli")],
+            product_images=[ProductImage(url=f"https://img.example.com/{i}/{n}.jpg", order=n) for n in range(1, 6)],
+            variants=[
+                Variant(
+                    main_barcode=f"BRK-{i}", variant_barcode=f"BRK-{i}-{size}", quantity=5,
+                    attributes=[VariantAttribute(name="Beden", value=size)]
+                )
+                for size in ("S", "M", "L", "XL")
+            ]
+        )
+        for i in range(count)
+    ]
+
+def legacy_params(products):
+    """0.1.5 sürümündeki f-string gövde oluşturma yolu"""
+    # Tüm ürünler için XML oluştur
+    products_xml = ""
+    for product in products:
+        # Parça listesini hazırla
+        parts_xml = ""
+        if product.parts:
+            for part in product.parts:
+                parts_xml += f"""
+                <ept:PartRequest>
+                    <ept:Desi>{part.desi}</ept:Desi>
+                    <ept:PartComment>{part.comment or ''}</ept:PartComment>
+                    <ept:PartNo>{part.part_no}</ept:PartNo>
+                </ept:PartRequest>"""
+
+        # Resim listesini hazırla
+        images_xml = ""
+        if product.product_images:
+            for image in product.product_images:
+                images_xml += f"""
+                <ept:UrunResim>
+                    <ept:Sira>{image.order}</ept:Sira>
+                    <ept:Url>{image.url}</ept:Url>
+                </ept:UrunResim>"""
+
+        # Varyant listesini hazırla
+        variants_xml = ""
+        if product.variants:
+            for variant in product.variants:
+                attrs_xml = ""
+                for attr in variant.attributes:
+                    attrs_xml += f"""
+                    <ept:VariantAttr>
+                        <ept:Deger>{attr.value}</ept:Deger>
+                        <ept:Fiyat>{attr.price}</ept:Fiyat>
+                        <ept:FiyatFarkiMi>{str(attr.is_price_difference).lower()}</ept:FiyatFarkiMi>
+                        <ept:Tanim>{attr.name}</ept:Tanim>
+                    </ept:VariantAttr>"""
+
+                variants_xml += f"""
+                <ept:Variant>
+                    <ept:AnaUrunKodu>{variant.main_barcode}</ept:AnaUrunKodu>
+                    <ept:Attributes>{attrs_xml}</ept:Attributes>
+                    <ept:Miktar>{variant.quantity}</ept:Miktar>
+                    <ept:VariantBarkod>{variant.variant_barcode}</ept:VariantBarkod>
+                </ept:Variant>"""
+
+        # Her ürün için XML oluştur
+        products_xml += f"""
+        <ept:StokUrun>
+            <ept:Aciklama>{product.description}</ept:Aciklama>
+            <ept:AdminCode>{product.admin_code}</ept:AdminCode>
+            <ept:Agirlik>{product.weight}</ept:Agirlik>
+            <ept:Aktif>{str(product.is_active).lower()}</ept:Aktif>
+            <ept:AltKategoriAdi>{product.subcategory_name}</ept:AltKategoriAdi>
+            <ept:AltKategoriId>{product.subcategory_id}</ept:AltKategoriId>
+            <ept:AnaKategoriId>{product.main_category_id}</ept:AnaKategoriId>
+            <ept:Barkod>{product.barcode}</ept:Barkod>
+            <ept:BoyX>{product.dimensions[0]}</ept:BoyX>
+            <ept:BoyY>{product.dimensions[1]}</ept:BoyY>
+            <ept:BoyZ>{product.dimensions[2]}</ept:BoyZ>
+            <ept:Desi>{product.desi}</ept:Desi>
+            <ept:Durum>{product.status}</ept:Durum>
+            <ept:GarantiSuresi>{product.warranty_period}</ept:GarantiSuresi>
+            <ept:GarantiVerenFirma>{product.warranty_company}</ept:GarantiVerenFirma>
+            <ept:Gtin>{product.gtin}</ept:Gtin>
+            <ept:IsAdmin>{str(product.is_admin).lower()}</ept:IsAdmin>
+            <ept:Iskonto>{product.discount}</ept:Iskonto>
+            <ept:KDVOran>{product.vat_rate}</ept:KDVOran>
+            <ept:KDVli>{product.price_with_vat}</ept:KDVli>
+            <ept:KDVsiz>{product.price_without_vat}</ept:KDVsiz>
+            <ept:KargoProfilId>{product.cargo_profile_id}</ept:KargoProfilId>
+            <ept:KategoriBilgisiGuncelle>{str(product.update_category_info).lower()}</ept:KategoriBilgisiGuncelle>
+            <ept:Mevcut>{str(product.is_available).lower()}</ept:Mevcut>
+            <ept:Miktar>{product.quantity}</ept:Miktar>
+            <ept:Parts>{parts_xml if parts_xml else None}</ept:Parts>
+            <ept:SatisBaslangicTarihi>{product.sale_start_date.isoformat() if product.sale_start_date else None}</ept:SatisBaslangicTarihi>
+            <ept:SatisBitisTarihi>{product.sale_end_date.isoformat() if product.sale_end_date else None}</ept:SatisBitisTarihi>
+            <ept:ShopId>{product.shop_id}</ept:ShopId>
+            <ept:SingleBox>{str(product.is_single_box).lower()}</ept:SingleBox>
+            <ept:Tag>{product.tag}</ept:Tag>
+            <ept:TahminiKargoSuresi>{product.estimated_shipping_time}</ept:TahminiKargoSuresi>
+            <ept:TedarikciAltKategoriAdi>{product.supplier_subcategory_name}</ept:TedarikciAltKategoriAdi>
+            <ept:TedarikciAltKategoriId>{product.supplier_subcategory_id}</ept:TedarikciAltKategoriId>
+            <ept:TedarikciSanalKategoriId>{product.supplier_virtual_category_id}</ept:TedarikciSanalKategoriId>
+            <ept:UrunAdi>{product.product_name}</ept:UrunAdi>
+            <ept:UrunId>{product.product_id}</ept:UrunId>
+            <ept:UrunKodu>{product.product_code}</ept:UrunKodu>
+            <ept:UrunResimleri>{images_xml if images_xml else None}</ept:UrunResimleri>
+            <ept:UrunUrl>{product.product_url}</ept:UrunUrl>
+            <ept:UzunAciklama>{product.long_description}</ept:UzunAciklama>
+            <ept:VariantListesi>{variants_xml if variants_xml else None}</ept:VariantListesi>
+            <ept:YeniKategoriId>{product.category_id}</ept:YeniKategoriId>
+        </ept:StokUrun>"""
+    return {"items": products_xml}
+
+def legacy_serialize(params) -> str:
+    """0.1.5 sürümündeki parametre serileştirme yolu"""
+    param_xml = ""
+    for key, value in params.items():
+        param_xml += f"<tem:{key}>{value}</tem:{key}>"
+    return param_xml
+
+def legacy_body(service: ProductService, products) -> bytes:
+    prefix, suffix, _ = service._envelope_parts("StokGuncelleV2Bulk")
+    return prefix + legacy_serialize(legacy_params(products)).encode('utf-8') + suffix
+
+def fast_body(service: ProductService, products) -> bytes:
+    return service._build_request("StokGuncelleV2Bulk", service._products_v2_bulk_params(products))[1]
+
+def round_trips(body: bytes, products) -> bool:
+    """Gövde geçerli XML mi ve uzun açıklamalar bozulmadan geri okunuyor mu"""
+    try:
+        root = ET.fromstring(body)
+    except ET.ParseError:
+        return False
+    texts = [item.text for item in root.iter(f"{EPT}UzunAciklama")]
+    return texts == [product.long_description for product in products]
+
+def bench(name: str, build, service, products, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = build(service, products)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    body = build(service, products)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    correct = "evet" if round_trips(body, products) else "hayır"
+    print(
+        f"{name:<8} {best * 1000:>8.2f} ms/gövde  {len(body) / 1024:>6.0f} KB  "
+        f"tepe bellek {peak / 1024:>6.0f} KB  doğru XML: {correct}"
+    )
+    return best
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    service = ProductService(username="test_user", password="test_pass")
+    products = build_products(count)
+
+    before = bench("önce", legacy_body, service, products, repeat)
+    after = bench("sonra", fast_body, service, products, repeat)
+    print(f"Oran (önce / sonra): {before / after:.2f}x")
+
+if __name__ == "__main__":
+    main()
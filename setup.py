@@ -25,6 +25,9 @@ setup(
             "twine",
             "build"
         ],
+        "async": [
+            "httpx>=0.23.0"
+        ],
     },
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -1,4 +1,5 @@
 from .client import PTTClient
+from .async_client import AsyncPTTClient
 from .services.category_service import CategoryService
 from .services.stock_service import StockService
 from .services.product_service import ProductService
@@ -8,6 +9,7 @@ from .utils.version import get_version
 
 __all__ = [
     'PTTClient',
+    'AsyncPTTClient',
     'CategoryService',
     'StockService',
     'ProductService',
@@ -0,0 +1,388 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, List, Optional, Dict, Iterable
+from .services.base_service import BaseService
+from .services.category_service import CategoryService
+from .services.stock_service import StockService
+from .services.product_service import ProductService
+from .services.version_service import VersionService
+from .models.category import Category
+from .models.stock import Stock
+from .models.variant import StockPriceUpdate, StockPriceUpdateResult
+from .models.product import ProductActivation, ProductUpdateError
+from .models.barcode import BarcodeCheckResult, BarcodeError
+from .models.variant import ValidationError
+from .models.product_update import ProductUpdateV2
+from .utils.transport import AsyncHttpTransport
+from .utils.concurrency import map_bounded_async
+
+class _RequestBuilderTransport:
+    """
+    Transport of the services used by AsyncPTTClient.
+
+    The services only build requests and parse responses there, so they
+    get this placeholder instead of opening a ``requests.Session`` each.
+    """
+
+    def post(self, url, data, headers=None, timeout=None):
+        raise RuntimeError("AsyncPTTClient sends requests through its async transport")
+
+    def close(self):
+        pass
+
+class AsyncPTTClient:
+    """
+    PTT AVM API'si için asyncio tabanlı istemci.
+    PTTClient ile aynı işlemleri awaitable olarak sunar; SOAP zarfı oluşturma
+    ve yanıt ayrıştırma servislerle ortaktır.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        timeout: float = 30,
+        compress_responses: bool = True,
+        compress_requests: bool = False,
+        compress_min_size: int = 1024,
+        transport: Optional[AsyncHttpTransport] = None
+    ):
+        """
+        Args:
+            username: PTT AVM kullanıcı adı
+            password: PTT AVM şifresi
+            max_connections: Eşzamanlı maksimum bağlantı sayısı
+            max_keepalive_connections: Açık tutulacak boştaki bağlantı sayısı
+            keepalive_expiry: Boştaki bağlantının açık tutulma süresi (saniye)
+            timeout: İstek zaman aşımı (saniye)
+            compress_responses: False ise sıkıştırılmamış yanıt iste (Accept-Encoding: identity);
+                                HTTP kütüphanesi varsayılan olarak gzip/deflate ister ve çözer
+            compress_requests: compress_min_size baytı aşan istek gövdelerini gzip ile sıkıştır
+            compress_min_size: Sıkıştırılacak en küçük istek gövdesi (bayt)
+            transport: Hazır bir async transport (verilmezse oluşturulur)
+        """
+        self.username = username
+        self.password = password
+
+        if transport is None:
+            transport = AsyncHttpTransport(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+                timeout=timeout,
+                compress_responses=compress_responses,
+                compress_requests=compress_requests,
+                compress_min_size=compress_min_size
+            )
+        self._transport = transport
+
+        # Servisler yalnızca istek oluşturma ve yanıt ayrıştırma için kullanılır;
+        # kendi HTTP oturumlarını açmamaları için boş bir transport alırlar
+        builder = _RequestBuilderTransport()
+        self._category_service = CategoryService(username=username, password=password, transport=builder)
+        self._stock_service = StockService(username=username, password=password, transport=builder)
+        self._product_service = ProductService(username=username, password=password, transport=builder)
+        self._version_service = VersionService(username=username, password=password, transport=builder)
+
+    async def _post(self, service: BaseService, operation: str, params: Dict = None):
+        """SOAP isteğini async transport üzerinden gönderir."""
+        headers, body = service._build_request(operation, params)
+        return await self._transport.post(
+            service.API_URL,
+            data=body,
+            headers=headers
+        )
+
+    async def _call(self, service: BaseService, operation: str, params: Dict = None):
+        """
+        SOAP çağrısını async transport üzerinden yapar.
+
+        Args:
+            service: İsteği oluşturacak ve yanıtı ayrıştıracak servis
+            operation: Operasyon adı
+            params: Operasyon parametreleri
+        """
+        try:
+            response = await self._post(service, operation, params)
+
+            return service._parse_response(
+                operation, response.status_code, response.content, response.text
+            )
+
+        except Exception as e:
+            raise Exception(f"API call failed: {str(e)}")
+
+    async def _call_raw(self, service: BaseService, operation: str, params: Dict = None) -> bytes:
+        """SOAP çağrısını yapar ve ham yanıt gövdesini döndürür."""
+        try:
+            response = await self._post(service, operation, params)
+
+            return service._check_response(
+                response.status_code, response.content, response.text
+            )
+
+        except Exception as e:
+            raise Exception(f"API call failed: {str(e)}")
+
+    # Category Operations
+    async def get_category(self, category_id: int) -> Optional[Category]:
+        """Kategori bilgilerini getirir."""
+        try:
+            response = await self._call(self._category_service, 'GetCategory', {'id': category_id})
+
+            if not response:
+                return None
+
+            return Category.from_dict(response)
+
+        except Exception as e:
+            raise Exception(f"Failed to get categories: {str(e)}")
+
+    # Stock Operations
+    async def get_stock(self, barcode: str) -> Optional[Stock]:
+        """Tek bir ürünün stok bilgisini getirir."""
+        try:
+            content = await self._call_raw(
+                self._stock_service, "StokKontrolListesi", {"Barkod": barcode}
+            )
+            return self._stock_service._parse_single_stock_response(content)
+
+        except Exception as e:
+            raise Exception(f"Failed to get stock info: {str(e)}")
+
+    async def get_stocks(self, page: int = 0) -> List[Stock]:
+        """Stok listesini sayfa sayfa getirir."""
+        try:
+            content = await self._call_raw(
+                self._stock_service, "StokKontrolListesi", {"SearchPage": page}
+            )
+            return self._stock_service._parse_stock_list_response(content)
+
+        except Exception as e:
+            raise Exception(f"Failed to get stock list: {str(e)}")
+
+    async def _iter_stock_pages(self, max_concurrency: int = 4) -> AsyncIterator[List[Stock]]:
+        """
+        Stok sayfalarını sırasıyla döndürür; en fazla max_concurrency sayfa
+        aynı anda istenir. İlk boş ya da ITEMS_PER_PAGE'den kısa sayfada durur.
+        """
+        pending = deque()
+        next_page = 0
+        try:
+            # Pencereyi doldur
+            for _ in range(max(1, max_concurrency)):
+                pending.append(asyncio.ensure_future(self.get_stocks(next_page)))
+                next_page += 1
+
+            while pending:
+                stocks = await pending.popleft()
+
+                if not stocks:
+                    return
+
+                # Sayfa doluysa sıradaki sayfayı hemen kuyruğa ekle
+                if len(stocks) >= StockService.ITEMS_PER_PAGE:
+                    pending.append(asyncio.ensure_future(self.get_stocks(next_page)))
+                    next_page += 1
+
+                yield stocks
+
+                if len(stocks) < StockService.ITEMS_PER_PAGE:
+                    return
+        finally:
+            # Son sayfadan sonrası için açılmış istekleri iptal et
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def get_all_stocks(self, progress_callback=None, max_concurrency: int = 4) -> List[Stock]:
+        """
+        Tüm stok listesini getirir. Sayfalar en fazla max_concurrency eşzamanlı
+        istekle önceden çekilir; progress_callback yine sayfa sırasıyla çağrılır.
+        """
+        try:
+            all_stocks = []
+            page = 0
+
+            async for stocks in self._iter_stock_pages(max_concurrency):
+                all_stocks.extend(stocks)
+                page += 1
+
+                if progress_callback:
+                    progress_callback(stocks, page, len(all_stocks))
+
+            return all_stocks
+
+        except Exception as e:
+            raise Exception(f"Failed to get all stocks: {str(e)}")
+
+    async def get_stock_count(self, max_concurrency: int = 4) -> int:
+        """Toplam stok sayısını getirir."""
+        try:
+            total_count = 0
+
+            async for stocks in self._iter_stock_pages(max_concurrency):
+                total_count += len(stocks)
+
+            return total_count
+
+        except Exception as e:
+            raise Exception(f"Failed to get total stock count: {str(e)}")
+
+    async def update_stock_price(self, update_data: StockPriceUpdate) -> bool:
+        """Stok ve fiyat bilgilerini günceller."""
+        try:
+            response = await self._call(
+                self._stock_service,
+                "StokFiyatGuncelle3",
+                self._stock_service._stock_price_params(update_data)
+            )
+
+            return True if response else False
+
+        except Exception as e:
+            raise Exception(f"Failed to update stock price: {str(e)}")
+
+    async def update_stock_price_bulk(
+        self,
+        update_data_list: Iterable[StockPriceUpdate],
+        max_concurrency: int = 10
+    ) -> List[StockPriceUpdateResult]:
+        """
+        Stok ve fiyat bilgilerini toplu olarak, eşzamanlı günceller; barkod bazında sonuç döndürür.
+        Liste max_concurrency işçi tarafından sırayla tüketilir; bellek kullanımı girişle büyümez.
+        """
+        outcomes = await map_bounded_async(self.update_stock_price, update_data_list, max_concurrency)
+        return [
+            StockPriceUpdateResult(barcode=update_data.barcode, success=bool(success))
+            if error is None
+            else StockPriceUpdateResult(barcode=update_data.barcode, success=False, error=str(error))
+            for update_data, success, error in outcomes
+        ]
+
+    # Product Operations
+    async def check_barcode(self, barcode: str) -> BarcodeCheckResult:
+        """Tekil barkod kontrolü yapar."""
+        try:
+            self._product_service._validate_barcode(barcode)
+
+            response = await self._call(
+                self._product_service, "BarkodKontrol", {"Barkod": barcode.strip()}
+            )
+
+            return self._product_service._barcode_check_result(barcode, response)
+
+        except ValidationError as e:
+            raise ValidationError(f"Invalid barcode: {str(e)}")
+        except Exception as e:
+            raise BarcodeError(f"Barcode check failed: {str(e)}")
+
+    async def check_barcodes_bulk(
+        self,
+        barcodes: Iterable[str],
+        max_concurrency: int = 10
+    ) -> List[BarcodeCheckResult]:
+        """Sınırsız sayıda barkodu tekrarsız, 100'lük eşzamanlı isteklerle kontrol eder."""
+        async def check(bulk_check) -> List[BarcodeCheckResult]:
+            response = await self._call(
+                self._product_service,
+                "BarkodKontrolBulk",
+                self._product_service._bulk_barcode_params(bulk_check)
+            )
+            return self._product_service._bulk_barcode_results(bulk_check, response)
+
+        try:
+            normalized = self._product_service._normalize_bulk_barcodes(barcodes)
+            chunks = self._product_service._bulk_barcode_chunks(normalized)
+
+            checked = {}
+            for _, results, error in await map_bounded_async(check, chunks, max_concurrency):
+                if error is not None:
+                    raise error
+                for result in results:
+                    checked[result.barcode] = result
+
+            return [checked[barcode] for barcode in normalized]
+
+        except ValidationError as e:
+            raise ValidationError(f"Invalid barcodes: {str(e)}")
+        except Exception as e:
+            raise BarcodeError(f"Bulk barcode check failed: {str(e)}")
+
+    async def activate_product(self, product_id: int, is_active: bool = True) -> bool:
+        """Ürünü aktif/pasif yapar."""
+        activation = ProductActivation(
+            product_id=product_id,
+            is_active=is_active
+        )
+        try:
+            response = await self._call(
+                self._product_service,
+                "AktifYap",
+                self._product_service._activation_params(activation)
+            )
+
+            return True if response else False
+
+        except Exception as e:
+            raise ProductUpdateError(f"Failed to activate product: {str(e)}")
+
+    async def update_product_v2(self, product: ProductUpdateV2) -> bool:
+        """Ürün bilgilerini günceller (V2)."""
+        try:
+            response = await self._call(
+                self._product_service,
+                "StokGuncelleV2",
+                self._product_service._product_v2_params(product)
+            )
+
+            return True if response else False
+
+        except Exception as e:
+            raise ProductUpdateError(f"Failed to update product: {str(e)}")
+
+    async def update_products_v2_bulk(self, products: List[ProductUpdateV2]) -> bool:
+        """Birden fazla ürünü toplu olarak günceller (V2)."""
+        try:
+            response = await self._call(
+                self._product_service,
+                "StokGuncelleV2Bulk",
+                self._product_service._products_v2_bulk_params(products)
+            )
+
+            return True if response else False
+
+        except ValidationError as e:
+            raise ValidationError(f"Invalid products data: {str(e)}")
+        except Exception as e:
+            raise ProductUpdateError(f"Failed to update products in bulk: {str(e)}")
+
+    # Version Operations
+    async def get_version(self) -> Dict[str, str]:
+        """API versiyonunu getirir."""
+        try:
+            response = await self._call(self._version_service, 'GetVersion')
+            return {
+                'version': response if response else 'unknown'
+            }
+        except Exception as e:
+            raise Exception(f"Failed to get version: {str(e)}")
+
+    # Utility Methods
+    def get_compression_stats(self) -> Dict[str, Dict[str, int]]:
+        """Operasyon bazında sıkıştırma öncesi/sonrası bayt sayılarını ve kazancı (bytes_saved) döndürür."""
+        return self._transport.compression_stats.snapshot()
+
+    async def close(self):
+        """Paylaşılan bağlantı havuzunu kapatır."""
+        await self._transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
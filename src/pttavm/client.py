@@ -1,15 +1,31 @@
-from typing import List, Optional, Dict
+import os
+from typing import List, Optional, Dict, Iterator, Union, Iterable
 from .services.category_service import CategoryService
 from .services.stock_service import StockService
 from .services.product_service import ProductService
 from .services.version_service import VersionService
 from .models.category import Category
+from .models.category_tree import CategoryTree
+from .utils.category_index import CategoryIndex
 from .models.stock import Stock
+from .models.stock_table import StockTable
 from .models.product import Product
-from .models.variant import StockPriceUpdate
-from .models.product import ProductActivation, ProductUpdateError
+from .models.variant import StockPriceUpdate, StockPriceUpdateResult, StockUpdateError, ValidationError
+from .models.product import ProductActivation, ProductUpdateError, ActivationResult
 from .models.barcode import BarcodeCheckResult, BulkBarcodeCheck, BarcodeError
-from .models.product_update import ProductUpdateV2
+from .models.product_update import ProductUpdateV2, BulkUpdateReport
+from .utils.transport import HttpTransport
+from .utils.retry import RetryPolicy, CircuitBreaker, RetryMetrics
+from .utils.rate_limiter import RateLimiter
+from .utils.write_buffer import StockUpdateBuffer
+from .utils.outbox import UpdateOutbox, DONE, SUPERSEDED
+from .utils.barcode_cache import BarcodeCache
+from .utils.fingerprint import PayloadFingerprints
+from .utils.product_index import ProductIdIndex
+from .utils.concurrency import map_bounded
+from .utils.catalog_sync import CatalogItem, plan_sync
+from .utils.stock_store import StockSnapshotStore
+from .models.sync import SyncPlan
 
 class PTTClient:
     """
@@ -17,26 +33,171 @@ class PTTClient:
     Tüm servisleri tek bir noktadan yönetir.
     """
     
-    def __init__(self, username: str, password: str):
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout: float = 30,
+        compress_responses: bool = True,
+        compress_requests: bool = False,
+        compress_min_size: int = 1024,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        rate_limit: Optional[float] = None,
+        rate_limit_burst: Optional[float] = None,
+        operation_rate_limits: Optional[Dict[str, float]] = None,
+        barcode_cache: Optional[BarcodeCache] = None,
+        fingerprints: Optional[PayloadFingerprints] = None,
+        product_index: Optional[ProductIdIndex] = None,
+        outbox: Optional[str] = None
+    ):
         """
         Args:
             username: PTT AVM kullanıcı adı
             password: PTT AVM şifresi
+            pool_connections: Önbelleğe alınacak host bağlantı havuzu sayısı
+            pool_maxsize: Host başına açık tutulacak maksimum bağlantı sayısı
+            pool_block: Havuz dolduğunda yeni bağlantı açmak yerine bekle
+            keep_alive: Bağlantıları istekler arasında açık tut
+            timeout: İstek zaman aşımı (saniye)
+            compress_responses: False ise sıkıştırılmamış yanıt iste (Accept-Encoding: identity);
+                                HTTP kütüphanesi varsayılan olarak gzip/deflate ister ve çözer
+            compress_requests: compress_min_size baytı aşan istek gövdelerini gzip ile sıkıştır
+                               (sunucunun Content-Encoding: gzip kabul etmesi gerekir)
+            compress_min_size: Sıkıştırılacak en küçük istek gövdesi (bayt)
+            retry_policy: Yeniden deneme politikası. Verilmezse okuma işlemleri
+                          3 kez denenir, yazma işlemleri denenmez.
+                          RetryPolicy(max_attempts=1) yeniden denemeyi kapatır.
+            circuit_breaker: Tüm servislerin paylaştığı devre kesici
+            rate_limit: Tüm operasyonlar için saniyedeki maksimum çağrı sayısı
+            rate_limit_burst: Anlık izin verilen maksimum çağrı sayısı
+            operation_rate_limits: Operasyon bazında saniyedeki maksimum çağrı sayısı
+                                   Örnek: {'StokFiyatGuncelle3': 5, 'BarkodKontrol': 20}
+            barcode_cache: Barkod kontrol sonuçları için TTL'li LRU önbellek (varsayılan kapalı).
+                           İstemci üzerinden güncellenen barkodlar önbellekten düşürülür.
+            fingerprints: Barkod başına son başarılı gönderimin yük özeti (varsayılan kapalı).
+                          Aynı StockPriceUpdate/ProductUpdateV2 yükü tekrar gönderilmez.
+                          Dosya yolu verilmişse close() sırasında kaydedilir.
+            product_index: Barkod -> UrunId/ürün kodu indeksi (varsayılan kapalı). Stok sayfaları
+                           ayrıştırıldıkça dolar ve SKU başına bir kayıt tutar; as_table
+                           taramalarında da doldurulduğu için bellek kullanımını artırır.
+                           Kapalıyken barkod ile aktivasyon get_single_stock ile çözülür.
+                           Dosya yolu verilmişse close() sırasında kaydedilir.
+            outbox: Kalıcı güncelleme kuyruğunun SQLite dosyası (varsayılan kapalı).
+                    Verilirse update_stock_price(_bulk), update_product_v2 ve
+                    update_products_v2_bulk yazmaları önce kuyruğa kaydedilip oradan gönderilir;
+                    tekrar denenecek kayıtları arka plandaki işçi gönderir.
         """
         self.username = username
         self.password = password
         
+        # Tüm servisler tek bir bağlantı havuzunu paylaşır
+        self._transport = HttpTransport(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            timeout=timeout,
+            compress_responses=compress_responses,
+            compress_requests=compress_requests,
+            compress_min_size=compress_min_size
+        )
+        
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        self._metrics = RetryMetrics()
+        self._barcode_cache = barcode_cache
+        self._fingerprints = fingerprints
+        self._product_index = product_index
+        self._category_tree: Optional[CategoryTree] = None
+        self._category_index: Optional[CategoryIndex] = None
+        self._rate_limiter = None
+        if rate_limit or operation_rate_limits:
+            self._rate_limiter = RateLimiter(
+                rate=rate_limit,
+                burst=rate_limit_burst,
+                operation_rates=operation_rate_limits
+            )
+        
         # Initialize services
-        self._category_service = CategoryService(username, password)
-        self._stock_service = StockService(username, password)
-        self._product_service = ProductService(username, password)
-        self._version_service = VersionService(username, password)
+        service_options = {
+            'username': username,
+            'password': password,
+            'transport': self._transport,
+            'retry_policy': self._retry_policy,
+            'circuit_breaker': self._circuit_breaker,
+            'metrics': self._metrics,
+            'rate_limiter': self._rate_limiter,
+            'barcode_cache': self._barcode_cache,
+            'fingerprints': self._fingerprints,
+            'product_index': self._product_index
+        }
+        self._category_service = CategoryService(**service_options)
+        self._stock_service = StockService(**service_options)
+        self._product_service = ProductService(**service_options)
+        self._version_service = VersionService(**service_options)
+
+        self._outbox = None
+        if outbox is not None:
+            self._outbox = self.create_outbox(outbox)
+            self._outbox.start()
 
     # Category Operations
     def get_category(self, category_id: int) -> Optional[Category]:
         """Kategori bilgilerini getirir."""
         return self._category_service.get_categories(category_id)
 
+    def get_category_tree(
+        self,
+        cache_path: Optional[str] = None,
+        max_age: float = 86400,
+        max_workers: int = 8,
+        refresh: bool = False
+    ) -> CategoryTree:
+        """
+        Tüm kategori ağacını döndürür.
+        Ağaç önce bellekten, sonra cache_path dosyasından okunur; max_age saniyeden
+        eskiyse (updated_at) ya da refresh=True ise GetCategory ile eşzamanlı
+        olarak yeniden çekilir ve dosyaya kaydedilir.
+        
+        Örnek:
+            tree = client.get_category_tree("categories.json")
+            tree.path(category_id)  # 'Elektronik > Telefon > Cep Telefonu'
+        """
+        tree = self._category_tree
+        if tree is None and cache_path and not refresh and os.path.exists(cache_path):
+            try:
+                tree = CategoryTree.load(cache_path)
+            except (OSError, ValueError, KeyError, TypeError):
+                tree = None  # Bozuk önbellek dosyası yeniden oluşturulur
+
+        if refresh or tree is None or not tree.is_fresh(max_age):
+            tree = self._category_service.get_category_tree(max_workers=max_workers)
+            if cache_path:
+                tree.save(cache_path)
+
+        self._category_tree = tree
+        return tree
+
+    def get_category_index(self, cache_path: Optional[str] = None, max_age: float = 86400) -> CategoryIndex:
+        """
+        Kategori adları ve tam yolları üzerinde arama indeksi döndürür (Türkçe İ/ı duyarlı).
+        İndeks kategori ağacı değişene kadar bir kez oluşturulur.
+        
+        Örnek:
+            index = client.get_category_index("categories.json")
+            match = index.resolve("Elektronik/Cep Telefonlari")
+            product.category_id = int(match.category.id)
+        """
+        tree = self.get_category_tree(cache_path=cache_path, max_age=max_age)
+        if self._category_index is None or self._category_index.tree is not tree:
+            self._category_index = CategoryIndex(tree)
+        return self._category_index
+
     # Stock Operations
     def get_stock(self, barcode: str) -> Optional[Stock]:
         """Tek bir ürünün stok bilgisini getirir."""
@@ -46,9 +207,44 @@ class PTTClient:
         """Stok listesini sayfa sayfa getirir."""
         return self._stock_service.get_stock_list(page)
     
-    def get_all_stocks(self, progress_callback=None) -> List[Stock]:
-        """Tüm stok listesini getirir."""
-        return self._stock_service.get_all_stocks(batch_callback=progress_callback)
+    def get_all_stocks(
+        self,
+        progress_callback=None,
+        max_workers: int = 1,
+        as_table: bool = False,
+        snapshot_path: Optional[str] = None
+    ) -> Union[List[Stock], StockTable]:
+        """
+        Tüm stok listesini getirir. max_workers > 1 ise sayfalar paralel çekilir,
+        as_table=True ise sonuç kolon bazlı StockTable olarak döner.
+        snapshot_path verilirse sonuç ayrıca mmap ile paylaşılabilen ikili dosyaya yazılır;
+        worker süreçleri dosyayı open_stock_snapshot(path) ile kopyalamadan okur.
+        """
+        return self._stock_service.get_all_stocks(
+            batch_callback=progress_callback,
+            max_workers=max_workers,
+            as_table=as_table,
+            snapshot_path=snapshot_path
+        )
+    
+    def iter_stocks(self, pages: bool = False, max_workers: int = 1) -> Iterator[Union[Stock, List[Stock]]]:
+        """Stokları sayfalar geldikçe döndürür; pages=True ise sayfa sayfa döndürür."""
+        return self._stock_service.iter_stocks(pages=pages, max_workers=max_workers)
+    
+    def refresh_stock_snapshot(self, path: str, max_workers: int = 1) -> Dict[str, int]:
+        """
+        Tüm stokları çekip yerel SQLite anlık görüntüsüne yazar (StockSnapshotStore).
+        Sayfalar geldikçe yazılır; kaybolan barkodlar silinmez, kaldırıldı olarak işaretlenir.
+        Her sayfa grubu kısa bir işlemle yazılır, okuyucular tarama boyunca beklemez.
+        Tarama tamamlanmazsa yazılan satırlar kalır ama hiçbir barkod kaldırılmaz.
+        
+        Örnek:
+            client.refresh_stock_snapshot("stocks.db", max_workers=4)
+            with StockSnapshotStore("stocks.db") as store:
+                store.query(category_id=1234, quantity=(1, None))
+        """
+        with StockSnapshotStore(path) as store:
+            return store.refresh(self._stock_service.iter_stocks(max_workers=max_workers))
     
     def get_stock_count(self) -> int:
         """Toplam stok sayısını getirir."""
@@ -59,9 +255,12 @@ class PTTClient:
         """Tekil barkod kontrolü yapar."""
         return self._product_service.check_barcode(barcode)
 
-    def check_barcodes_bulk(self, barcodes: List[str]) -> List[BarcodeCheckResult]:
-        """Toplu barkod kontrolü yapar."""
-        return self._product_service.check_barcodes_bulk(barcodes)
+    def check_barcodes_bulk(self, barcodes: Iterable[str], max_workers: int = 4) -> List[BarcodeCheckResult]:
+        """
+        Toplu barkod kontrolü yapar. Barkod sayısı sınırsızdır; tekrarsız barkodlar
+        100'lük istekler halinde eşzamanlı sorgulanır, sonuçlar giriş sırasıyla döner.
+        """
+        return self._product_service.check_barcodes_bulk(barcodes, max_workers=max_workers)
 
     def activate_product(self, product_id: int, is_active: bool = True) -> bool:
         """Ürünü aktif/pasif yapar."""
@@ -71,21 +270,267 @@ class PTTClient:
         )
         return self._product_service.activate_product(activation)
 
+    def get_product_id(self, barcode: str) -> Optional[int]:
+        """
+        Barkodun UrunId'sini döndürür. Barkod indeksi açıksa önce ona bakılır; bulunamazsa
+        get_single_stock ile sorgulanır (sonuç indekse eklenir). Ürün yoksa None.
+        """
+        if self._product_index is not None:
+            product_id = self._product_index.product_id(barcode)
+            if product_id is not None:
+                return product_id
+        return self._lookup_product_id(barcode)
+
+    def _lookup_product_id(self, barcode: str) -> Optional[int]:
+        """UrunId'yi get_single_stock ile sorgular."""
+        stock = self._stock_service.get_single_stock(barcode)
+        if stock is None or stock.product is None:
+            return None
+        return stock.product.product_id or None
+
+    def activate_by_barcode(self, barcode: str, is_active: bool = True) -> bool:
+        """
+        Ürünü barkodu ile aktif/pasif yapar; UrunId barkod indeksinden çözülür.
+        
+        Raises:
+            ProductUpdateError: Barkoda ait ürün bulunamazsa
+        """
+        product_id = self.get_product_id(barcode)
+        if product_id is None:
+            raise ProductUpdateError(f"Product not found for barcode: {barcode}")
+        return self._activate_barcode(barcode, product_id, is_active)
+
+    def _activate_barcode(self, barcode: str, product_id: int, is_active: bool) -> bool:
+        try:
+            return self.activate_product(product_id, is_active)
+        finally:
+            # Aktiflik değiştiği için son gönderilen stok yükü artık geçerli değil
+            if self._fingerprints is not None:
+                self._fingerprints.forget([barcode])
+
+    def activate_by_barcodes(
+        self,
+        barcodes: Iterable[str],
+        is_active: bool = True,
+        max_workers: int = 4
+    ) -> List[ActivationResult]:
+        """
+        Birden fazla ürünü barkodlarıyla aktif/pasif yapar. İndekste (ya da indeks kapalıysa) olmayan barkodlar
+        önce eşzamanlı olarak get_single_stock ile çözülür, ardından aktivasyonlar
+        max_workers ile eşzamanlı gönderilir. Bir barkodun hatası diğerlerini durdurmaz.
+        
+        Returns:
+            List[ActivationResult]: Giriş sırasına göre barkod bazında sonuçlar
+        """
+        barcodes = list(dict.fromkeys(barcodes))
+        index = self._product_index
+        product_ids = {
+            barcode: index.product_id(barcode) if index is not None else None
+            for barcode in barcodes
+        }
+
+        errors = {}
+        missing = [barcode for barcode, product_id in product_ids.items() if product_id is None]
+        for barcode, product_id, error in map_bounded(self._lookup_product_id, missing, max_workers):
+            if error is not None:
+                errors[barcode] = str(error)
+            else:
+                product_ids[barcode] = product_id
+
+        def activate(barcode: str) -> bool:
+            return self._activate_barcode(barcode, product_ids[barcode], is_active)
+
+        resolved = [b for b in barcodes if product_ids[b] is not None]
+        for barcode, success, error in map_bounded(activate, resolved, max_workers):
+            if error is not None:
+                errors[barcode] = str(error)
+            elif not success:
+                errors[barcode] = "Activation rejected"
+
+        results = []
+        for barcode in barcodes:
+            product_id = product_ids[barcode]
+            error = errors.get(barcode)
+            if product_id is None and error is None:
+                error = "Product not found"
+            results.append(ActivationResult(
+                barcode=barcode,
+                success=error is None,
+                product_id=product_id,
+                error=error
+            ))
+        return results
+
+    def get_product_index(self) -> Optional[ProductIdIndex]:
+        """Barkod -> UrunId/ürün kodu indeksini döndürür (save() ile kaydedilebilir); kapalıysa None."""
+        return self._product_index
+
+    def _send_through_outbox(self, items: list) -> List[StockPriceUpdateResult]:
+        """Güncellemeleri kalıcı kuyruk üzerinden gönderir; barkod bazında sonuç döndürür."""
+        return [
+            StockPriceUpdateResult(barcode=item.barcode, success=True)
+            if status in (DONE, SUPERSEDED)
+            else StockPriceUpdateResult(
+                barcode=item.barcode, success=False,
+                error=f"{error} (kuyrukta: {status})" if error else status
+            )
+            for item, (status, error) in zip(items, self._outbox.send(items))
+        ]
+
     def update_product_v2(self, product: ProductUpdateV2) -> bool:
         """Ürün bilgilerini günceller (V2)."""
+        if self._outbox is not None:
+            result = self._send_through_outbox([product])[0]
+            if not result.success:
+                raise ProductUpdateError(f"Failed to update product: {result.error}")
+            return True
         return self._product_service.update_product_v2(product)
 
     def update_products_v2_bulk(self, products: List[ProductUpdateV2]) -> bool:
         """Birden fazla ürünü toplu olarak günceller (V2)."""
+        if self._outbox is not None:
+            try:
+                self._product_service._products_v2_bulk_params(products)
+            except ValidationError as e:
+                raise ValidationError(f"Invalid products data: {str(e)}")
+            failed = [result for result in self._send_through_outbox(products) if not result.success]
+            if failed:
+                raise ProductUpdateError(f"Failed to update products in bulk: {failed[0].error}")
+            return True
         return self._product_service.update_products_v2_bulk(products)
 
+    def update_products_v2_chunked(
+        self,
+        products: Iterable[ProductUpdateV2],
+        chunk_size: int = 100,
+        max_workers: int = 4
+    ) -> BulkUpdateReport:
+        """Sınırsız sayıda ürünü 100'lük parçalar halinde eşzamanlı günceller (V2)."""
+        return self._product_service.update_products_v2_chunked(
+            products,
+            chunk_size=chunk_size,
+            max_workers=max_workers
+        )
+
     def update_stock_price(self, update_data: StockPriceUpdate) -> bool:
         """Stok ve fiyat bilgilerini günceller."""
+        if self._outbox is not None:
+            result = self._send_through_outbox([update_data])[0]
+            if not result.success:
+                raise StockUpdateError(f"Failed to update stock price: {result.error}")
+            return True
         return self._stock_service.update_stock_price(update_data)
 
-    def update_stock_price_bulk(self, update_data_list: List[StockPriceUpdate]) -> bool:
-        """Stok ve fiyat bilgilerini toplu olarak günceller."""
-        return self._stock_service.update_stock_price_bulk(update_data_list)
+    def update_stock_price_bulk(
+        self,
+        update_data_list: Iterable[StockPriceUpdate],
+        max_workers: int = 4
+    ) -> List[StockPriceUpdateResult]:
+        """Stok ve fiyat bilgilerini toplu olarak, eşzamanlı günceller; barkod bazında sonuç döndürür."""
+        if self._outbox is not None:
+            return self._send_through_outbox(list(update_data_list))
+        return self._stock_service.update_stock_price_bulk(
+            update_data_list,
+            max_workers=max_workers
+        )
+
+    def create_stock_update_buffer(
+        self,
+        window: float = 1.0,
+        max_size: int = 100,
+        merge=None,
+        max_workers: int = 4,
+        on_result=None
+    ) -> StockUpdateBuffer:
+        """
+        Aynı barkoda gelen stok/fiyat güncellemelerini birleştiren tampon oluşturur.
+        Tampon window saniyede ya da max_size barkoda ulaşınca arka planda gönderilir.
+        
+        Örnek:
+            with client.create_stock_update_buffer(window=2.0) as buffer:
+                buffer.add(update)
+        """
+        return StockUpdateBuffer(
+            self._stock_service,
+            window=window,
+            max_size=max_size,
+            merge=merge,
+            max_workers=max_workers,
+            on_result=on_result
+        )
+
+    def create_outbox(
+        self,
+        path: str,
+        batch_size: int = 100,
+        max_workers: int = 4,
+        retry_policy: Optional[RetryPolicy] = None,
+        poll_interval: float = 1.0
+    ) -> UpdateOutbox:
+        """
+        Stok/fiyat ve ürün güncellemelerini önce SQLite dosyasına yazan kalıcı kuyruk oluşturur.
+        Kuyruk partiler halinde gönderilir, hatalı kayıtlar tekrar denenir; çökme sonrası
+        yalnızca tamamlanmamış kayıtlar yeniden gönderilir. İstemcinin kendi yazmalarının
+        kuyruktan geçmesi için PTTClient(outbox=...) kullanılır.
+        
+        Örnek:
+            with client.create_outbox("outbox.db") as outbox:
+                outbox.enqueue(update)
+                outbox.drain()
+        """
+        return UpdateOutbox(
+            path,
+            self._stock_service,
+            self._product_service,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            retry_policy=retry_policy,
+            poll_interval=poll_interval
+        )
+
+    # Catalog Sync Operations
+    def plan_catalog_sync(
+        self,
+        desired: Iterable[CatalogItem],
+        snapshot: Optional[Union[List[Stock], StockTable]] = None,
+        include_missing: bool = True,
+        max_workers: int = 1
+    ) -> SyncPlan:
+        """
+        İstenen katalogu mevcut stoklarla barkod bazında karşılaştırır ve yalnızca
+        fiyat, miktar, aktiflik veya kategorisi değişen ürünlerin güncellemelerini döndürür.
+        snapshot verilmezse get_all_stocks ile çekilir.
+        """
+        if snapshot is None:
+            snapshot = self.get_all_stocks(max_workers=max_workers, as_table=True)
+        return plan_sync(desired, snapshot, include_missing=include_missing)
+
+    def sync_catalog(
+        self,
+        desired: Iterable[CatalogItem],
+        snapshot: Optional[Union[List[Stock], StockTable]] = None,
+        include_missing: bool = True,
+        max_workers: int = 4
+    ) -> SyncPlan:
+        """
+        Katalogu farka göre senkronize eder: yalnızca değişen ürünler gönderilir.
+        Sonuçlar dönen planın stock_results ve product_report alanlarındadır.
+        
+        Örnek:
+            plan = client.sync_catalog(updates)
+            print(plan.summary())
+        """
+        plan = self.plan_catalog_sync(
+            desired,
+            snapshot=snapshot,
+            include_missing=include_missing,
+            max_workers=max_workers
+        )
+        if plan.stock_updates:
+            plan.stock_results = self.update_stock_price_bulk(plan.stock_updates, max_workers=max_workers)
+        if plan.product_updates:
+            plan.product_report = self.update_products_v2_chunked(plan.product_updates, max_workers=max_workers)
+        return plan
 
     # Version Operations
     def get_version(self) -> Dict[str, str]:
@@ -102,3 +547,39 @@ class PTTClient:
             'version': self._version_service
         }
         return services.get(service_type.lower())
+
+    def get_call_metrics(self) -> Dict[str, Dict[str, int]]:
+        """Operasyon bazında çağrı, deneme, yeniden deneme ve hata sayılarını döndürür."""
+        return self._metrics.snapshot()
+
+    def get_compression_stats(self) -> Dict[str, Dict[str, int]]:
+        """Operasyon bazında sıkıştırma öncesi/sonrası bayt sayılarını ve kazancı (bytes_saved) döndürür."""
+        return self._transport.compression_stats.snapshot()
+
+    def get_barcode_cache_stats(self) -> Optional[Dict[str, int]]:
+        """Barkod önbelleğinin isabet, ıskalama ve geçersizleştirme sayılarını döndürür."""
+        if self._barcode_cache is None:
+            return None
+        return self._barcode_cache.stats()
+
+    def get_fingerprint_stats(self) -> Optional[Dict[str, int]]:
+        """Kontrol edilen, aynı olduğu için atlanan ve kaydedilen yük sayılarını döndürür."""
+        if self._fingerprints is None:
+            return None
+        return self._fingerprints.stats()
+
+    def close(self):
+        """Paylaşılan bağlantı havuzunu kapatır; dosyaya bağlı parmak izlerini ve barkod indeksini kaydeder."""
+        if self._outbox is not None:
+            self._outbox.close()
+        if self._fingerprints is not None and self._fingerprints.path is not None:
+            self._fingerprints.save()
+        if self._product_index is not None and self._product_index.path is not None:
+            self._product_index.save()
+        self._transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,145 @@
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+from .category import Category
+
+@dataclass
+class CategoryMatch:
+    """Kategori aramasında bulunan kategori ve eşleşme puanı"""
+    category: Category
+    score: float
+    path: str = ""
+
+@dataclass
+class CategoryTree:
+    """
+    Tüm kategori ağacı.
+    Kategorilere id ile O(1) erişilir; her düğümün children listesi alt
+    kategorilerini içerir, böylece kökten tüm ağaç gezilebilir.
+    """
+    root_id: str
+    updated_at: Optional[float] = None  # Ağacın çekildiği zaman (epoch saniye)
+    categories: Dict[str, Category] = field(default_factory=dict)
+
+    @property
+    def root(self) -> Optional[Category]:
+        """Kök kategori"""
+        return self.categories.get(self.root_id)
+
+    @property
+    def age(self) -> Optional[float]:
+        """Ağacın çekilmesinden bu yana geçen saniye"""
+        if self.updated_at is None:
+            return None
+        return time.time() - self.updated_at
+
+    def is_fresh(self, max_age: float) -> bool:
+        """Ağaç max_age saniyeden yeni ise True"""
+        age = self.age
+        return age is not None and age < max_age
+
+    def add(self, category: Category, parent_id: Optional[str] = None) -> Optional[Category]:
+        """
+        Kategoriyi (alt kategorileri olmadan) ağaca ekler.
+
+        Args:
+            category: Eklenecek kategori
+            parent_id: Üst kategori id'si; verilmezse category.parent_id kullanılır
+
+        Returns:
+            Optional[Category]: Eklenen düğüm; kategori zaten varsa None
+        """
+        category_id = str(category.id)
+        if category_id in self.categories:
+            return None
+        if parent_id is None and category.parent_id is not None:
+            parent_id = str(category.parent_id)
+        node = Category(
+            id=category_id,
+            name=category.name,
+            parent_id=parent_id,
+            updated_at=category.updated_at,
+            children=[],
+            success=category.success
+        )
+        self.categories[category_id] = node
+        parent = self.categories.get(parent_id) if parent_id is not None else None
+        if parent is not None and category_id != self.root_id:
+            parent.children.append(node)
+        return node
+
+    def get(self, category_id) -> Optional[Category]:
+        """Kategoriyi id ile döndürür"""
+        return self.categories.get(str(category_id))
+
+    def children(self, category_id) -> List[Category]:
+        """Kategorinin doğrudan alt kategorileri"""
+        category = self.get(category_id)
+        return list(category.children) if category is not None else []
+
+    def parent_chain(self, category_id) -> List[Category]:
+        """
+        Kökten kategorinin kendisine kadar olan zincir.
+
+        Returns:
+            List[Category]: [kök, ..., üst kategori, kategori]; bilinmeyen id için boş liste
+        """
+        chain = []
+        category = self.get(category_id)
+        while category is not None and len(chain) <= len(self.categories):
+            chain.append(category)
+            if category.id == self.root_id or category.parent_id is None:
+                break
+            category = self.categories.get(category.parent_id)
+        chain.reverse()
+        return chain
+
+    def path(self, category_id, separator: str = " > ", include_root: bool = False) -> str:
+        """Kategorinin tam yolu, örn. 'Elektronik > Telefon > Cep Telefonu'"""
+        chain = self.parent_chain(category_id)
+        if not include_root and chain and chain[0].id == self.root_id:
+            chain = chain[1:]
+        return separator.join(category.name for category in chain)
+
+    def to_dict(self) -> dict:
+        """Önbellek dosyası için sade gösterim (üst kategoriler alt kategorilerden önce)"""
+        return {
+            "root_id": self.root_id,
+            "updated_at": self.updated_at,
+            "categories": [
+                [c.id, c.name, c.parent_id, c.updated_at]
+                for c in self.categories.values()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CategoryTree':
+        """to_dict çıktısından ağacı yeniden kurar"""
+        tree = cls(root_id=data["root_id"], updated_at=data.get("updated_at"))
+        for category_id, name, parent_id, updated_at in data["categories"]:
+            tree.add(Category(id=category_id, name=name, parent_id=parent_id, updated_at=updated_at))
+        return tree
+
+    def save(self, path: str):
+        """Ağacı JSON dosyasına yazar (dosya atomik olarak değiştirilir)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'CategoryTree':
+        """save ile yazılmış ağacı okur"""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def __contains__(self, category_id) -> bool:
+        return str(category_id) in self.categories
+
+    def __iter__(self) -> Iterator[Category]:
+        return iter(self.categories.values())
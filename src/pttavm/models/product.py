@@ -117,3 +117,11 @@ class ProductActivation:
             raise ValidationError("Product ID must be an integer")
         if self.product_id <= 0:
             raise RequiredFieldError("Valid product ID is required")
+
+@dataclass
+class ActivationResult:
+    """Barkodla aktivasyonda tek bir barkodun sonucu"""
+    barcode: str
+    success: bool
+    product_id: Optional[int] = None
+    error: Optional[str] = None
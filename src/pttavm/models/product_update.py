@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 from datetime import datetime
 from .variant import Variant
 
@@ -111,4 +111,45 @@ class ProductUpdateV2:
         if self.product_images is None:
             self.product_images = []
         if self.variants is None:
-            self.variants = [] 
\ No newline at end of file
+            self.variants = []
+
+@dataclass
+class ChunkResult:
+    """Toplu güncellemedeki tek bir isteğin (parçanın) sonucu"""
+    index: int
+    barcodes: List[str]
+    success: bool
+    error: Optional[str] = None
+
+@dataclass
+class BulkUpdateReport:
+    """Parçalara bölünmüş toplu güncellemenin sonuç raporu"""
+    chunks: List[ChunkResult]
+    skipped: List[str] = field(default_factory=list)  # Son gönderilenle aynı olduğu için atlanan barkodlar
+
+    @property
+    def success(self) -> bool:
+        """Tüm parçalar başarılı ise True"""
+        return all(chunk.success for chunk in self.chunks)
+
+    @property
+    def barcode_results(self) -> Dict[str, bool]:
+        """Barkod bazında sonuç (barkod -> başarılı mı); atlananlar başarılı sayılır"""
+        results = dict.fromkeys(self.skipped, True)
+        results.update(
+            (barcode, chunk.success)
+            for chunk in self.chunks
+            for barcode in chunk.barcodes
+        )
+        return results
+
+    @property
+    def succeeded(self) -> List[str]:
+        """Başarıyla gönderilen barkodlar"""
+        return [b for chunk in self.chunks if chunk.success for b in chunk.barcodes]
+
+    @property
+    def failed(self) -> List[str]:
+        """Gönderilemeyen barkodlar"""
+        return [b for chunk in self.chunks if not chunk.success for b in chunk.barcodes]
+
@@ -45,4 +45,14 @@ class Stock:
     shop_id: int
     is_single_box: bool
     product: StockProduct
-    category_id: int 
\ No newline at end of file
+    category_id: int
+
+@dataclass
+class StockFieldError:
+    """Stok verisindeki tek bir alanın dönüştürülememesi"""
+    row: int
+    barcode: Optional[str]
+    field: str
+    tag: str
+    value: str
+    error: str
@@ -0,0 +1,198 @@
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from .stock import (
+    Stock, StockWarranty, StockDimensions,
+    StockPrice, StockProduct
+)
+
+# Kolon adı -> Stock nesnesindeki erişim yolu
+FLOAT_COLUMNS = {
+    'weight': ('weight',),
+    'dimension_x': ('dimensions', 'x'),
+    'dimension_y': ('dimensions', 'y'),
+    'dimension_z': ('dimensions', 'z'),
+    'desi': ('desi',),
+    'price_discount': ('price', 'price_discount'),
+    'price_vat_rate': ('price', 'price_vat_rate'),
+    'price_with_vat': ('price', 'price_with_vat'),
+    'price_without_vat': ('price', 'price_without_vat'),
+}
+
+INT_COLUMNS = {
+    'warranty_period': ('warranty', 'warranty_period'),
+    'cargo_profile_id': ('cargo_profile_id',),
+    'quantity': ('quantity',),
+    'shop_id': ('shop_id',),
+    'product_id': ('product', 'product_id'),
+    'category_id': ('category_id',),
+}
+
+BOOL_COLUMNS = {
+    'is_active': ('is_active',),
+    'is_available': ('is_available',),
+    'is_single_box': ('is_single_box',),
+}
+
+STRING_COLUMNS = {
+    'barcode': ('barcode',),
+    'description': ('description',),
+    'status': ('status',),
+    'warranty_company': ('warranty', 'warranty_company'),
+    'gtin': ('gtin',),
+    'product_name': ('product', 'product_name'),
+    'product_code': ('product', 'product_code'),
+    'product_url': ('product', 'product_url'),
+    'product_long_description': ('product', 'product_long_description'),
+}
+
+# Az sayıda farklı değer alan kolonlar; aynı string nesnesi paylaşılır
+INTERNED_COLUMNS = frozenset({'status', 'warranty_company'})
+
+def _resolve(stock: Stock, path: tuple):
+    value = stock
+    for attr in path:
+        value = getattr(value, attr)
+    return value
+
+class StockRow:
+    """StockTable içindeki tek bir satırın kopyasız görünümü"""
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'StockTable', index: int):
+        self._table = table
+        self._index = index
+
+    def to_stock(self) -> Stock:
+        """Satırı tam bir Stock nesnesine dönüştürür."""
+        return self._table.to_stock(self._index)
+
+    def __repr__(self) -> str:
+        return f"StockRow(barcode={self.barcode!r}, quantity={self.quantity})"
+
+def _make_getter(name: str, as_bool: bool = False):
+    if as_bool:
+        def getter(row):
+            return bool(row._table.columns[name][row._index])
+    else:
+        def getter(row):
+            return row._table.columns[name][row._index]
+    return property(getter)
+
+for _name in list(FLOAT_COLUMNS) + list(INT_COLUMNS) + list(STRING_COLUMNS):
+    setattr(StockRow, _name, _make_getter(_name))
+for _name in BOOL_COLUMNS:
+    setattr(StockRow, _name, _make_getter(_name, as_bool=True))
+
+class StockTable:
+    """
+    Stok verisi için kolon bazlı, bellek dostu sonuç tipi.
+
+    Sayısal alanlar ``array`` kolonlarında, metin alanları liste kolonlarında
+    tutulur; satır başına nesne oluşturulmaz. Satırlara ``StockRow``
+    görünümleri ile erişilir.
+    """
+
+    def __init__(self, keep_long_description: bool = True):
+        """
+        Args:
+            keep_long_description: False ise UzunAciklama (HTML) saklanmaz
+        """
+        self.keep_long_description = keep_long_description
+        self.columns: Dict[str, Union[array, List[Optional[str]]]] = {}
+        for name in FLOAT_COLUMNS:
+            self.columns[name] = array('d')
+        for name in INT_COLUMNS:
+            self.columns[name] = array('q')
+        for name in BOOL_COLUMNS:
+            self.columns[name] = array('b')
+        for name in STRING_COLUMNS:
+            self.columns[name] = []
+
+    @classmethod
+    def from_stocks(cls, stocks: Iterable[Stock], keep_long_description: bool = True) -> 'StockTable':
+        """Stock nesnelerinden tablo oluşturur."""
+        table = cls(keep_long_description=keep_long_description)
+        table.extend(stocks)
+        return table
+
+    def append(self, stock: Stock):
+        """Tabloya bir Stock satırı ekler."""
+        columns = self.columns
+        for name, path in FLOAT_COLUMNS.items():
+            columns[name].append(_resolve(stock, path))
+        for name, path in INT_COLUMNS.items():
+            columns[name].append(_resolve(stock, path))
+        for name, path in BOOL_COLUMNS.items():
+            columns[name].append(1 if _resolve(stock, path) else 0)
+        for name, path in STRING_COLUMNS.items():
+            value = _resolve(stock, path)
+            if name == 'product_long_description' and not self.keep_long_description:
+                value = None
+            elif value is not None and name in INTERNED_COLUMNS:
+                value = sys.intern(value)
+            columns[name].append(value)
+
+    def extend(self, stocks: Iterable[Stock]):
+        """Tabloya birden fazla Stock satırı ekler."""
+        for stock in stocks:
+            self.append(stock)
+
+    def column(self, name: str) -> Union[array, List[Optional[str]]]:
+        """Bir kolonun tamamını döndürür (kopyalamadan)."""
+        return self.columns[name]
+
+    def to_stock(self, index: int) -> Stock:
+        """Belirtilen satırı Stock nesnesine dönüştürür."""
+        c = self.columns
+        return Stock(
+            description=c['description'][index],
+            weight=c['weight'][index],
+            is_active=bool(c['is_active'][index]),
+            barcode=c['barcode'][index],
+            dimensions=StockDimensions(
+                x=c['dimension_x'][index],
+                y=c['dimension_y'][index],
+                z=c['dimension_z'][index]
+            ),
+            desi=c['desi'][index],
+            status=c['status'][index],
+            warranty=StockWarranty(
+                warranty_period=c['warranty_period'][index],
+                warranty_company=c['warranty_company'][index]
+            ),
+            gtin=c['gtin'][index],
+            price=StockPrice(
+                price_discount=c['price_discount'][index],
+                price_vat_rate=c['price_vat_rate'][index],
+                price_with_vat=c['price_with_vat'][index],
+                price_without_vat=c['price_without_vat'][index]
+            ),
+            cargo_profile_id=c['cargo_profile_id'][index],
+            is_available=bool(c['is_available'][index]),
+            quantity=c['quantity'][index],
+            shop_id=c['shop_id'][index],
+            is_single_box=bool(c['is_single_box'][index]),
+            product=StockProduct(
+                product_name=c['product_name'][index],
+                product_id=c['product_id'][index],
+                product_code=c['product_code'][index],
+                product_url=c['product_url'][index],
+                product_long_description=c['product_long_description'][index]
+            ),
+            category_id=c['category_id'][index]
+        )
+
+    def __len__(self) -> int:
+        return len(self.columns['barcode'])
+
+    def __getitem__(self, index: int) -> StockRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StockTable index out of range")
+        return StockRow(self, index)
+
+    def __iter__(self) -> Iterator[StockRow]:
+        for index in range(len(self)):
+            yield StockRow(self, index)
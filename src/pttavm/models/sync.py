@@ -0,0 +1,47 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from .variant import StockPriceUpdate, StockPriceUpdateResult
+from .product_update import ProductUpdateV2, BulkUpdateReport
+
+@dataclass
+class FieldChange:
+    """Katalog senkronizasyonunda tek bir alanın farkı"""
+    barcode: str
+    field: str
+    current: Any
+    desired: Any
+
+@dataclass
+class SyncPlan:
+    """İstenen katalog ile mevcut stok anlık görüntüsü arasındaki fark"""
+    stock_updates: List[StockPriceUpdate] = field(default_factory=list)
+    product_updates: List[ProductUpdateV2] = field(default_factory=list)
+    changes: List[FieldChange] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    stock_results: List[StockPriceUpdateResult] = field(default_factory=list)
+    product_report: Optional[BulkUpdateReport] = None
+
+    @property
+    def update_count(self) -> int:
+        """Gönderilecek güncelleme sayısı"""
+        return len(self.stock_updates) + len(self.product_updates)
+
+    @property
+    def changed_barcodes(self) -> List[str]:
+        """Gönderilecek barkodlar"""
+        return [item.barcode for item in self.stock_updates + self.product_updates]
+
+    def summary(self) -> Dict[str, Any]:
+        """Değişikliklerin özeti (alan bazında değişen barkod sayısı dahil)"""
+        fields: Dict[str, int] = {}
+        for change in self.changes:
+            fields[change.field] = fields.get(change.field, 0) + 1
+        return {
+            "changed": self.update_count,
+            "unchanged": len(self.unchanged),
+            "missing": len(self.missing),
+            "stock_updates": len(self.stock_updates),
+            "product_updates": len(self.product_updates),
+            "fields": fields,
+        }
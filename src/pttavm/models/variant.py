@@ -50,6 +50,13 @@ class Variant:
         if not self.attributes:
             raise RequiredFieldError("At least one variant attribute is required")
 
+@dataclass
+class StockPriceUpdateResult:
+    """Toplu stok/fiyat güncellemesinde tek bir barkodun sonucu"""
+    barcode: str
+    success: bool
+    error: Optional[str] = None
+
 @dataclass
 class StockPriceUpdate:
     """Stok ve fiyat güncelleme modeli"""
@@ -1,6 +1,35 @@
 import requests
+import time
 import xmltodict
-from typing import Dict, Any, Optional
+from xml.sax.saxutils import escape
+from typing import Dict, Any, Iterable, Optional, Tuple
+from ..utils.transport import HttpTransport
+from ..utils.retry import RetryPolicy, CircuitBreaker, RetryMetrics
+from ..utils.rate_limiter import RateLimiter
+from ..utils.barcode_cache import BarcodeCache
+from ..utils.fingerprint import PayloadFingerprints
+from ..utils.product_index import ProductIdIndex
+from ..utils.xml_writer import XmlWriter, serialize_params, write_params
+
+ENVELOPE_PREFIX = """<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" xmlns:tem="http://tempuri.org/" xmlns:ept="http://schemas.datacontract.org/2004/07/ePttAVMService" xmlns:arr="http://schemas.microsoft.com/2003/10/Serialization/Arrays">
+<soap:Header>
+<wsse:Security xmlns:wsse="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd">
+<wsse:UsernameToken>
+<wsse:Username>{username}</wsse:Username>
+<wsse:Password>{password}</wsse:Password>
+</wsse:UsernameToken>
+</wsse:Security>
+</soap:Header>
+<soap:Body>
+<tem:{operation}>"""
+
+ENVELOPE_SUFFIX = """</tem:{operation}>
+</soap:Body>
+</soap:Envelope>"""
+
+# Tek denemelik varsayılan politika; hata sayımı için durum kodlarını yine de kullanır
+NO_RETRY = RetryPolicy(max_attempts=1)
 
 class BaseService:
     """Base service for SOAP API calls"""
@@ -8,11 +37,94 @@ class BaseService:
     API_URL = "https://ws.pttavm.com:93/service.svc"
     SOAP_ACTION_BASE = "http://tempuri.org/IService/"
     
-    def __init__(self, api_key: Optional[str] = None, username: Optional[str] = None, password: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        transport: Optional[HttpTransport] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        metrics: Optional[RetryMetrics] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        barcode_cache: Optional[BarcodeCache] = None,
+        fingerprints: Optional[PayloadFingerprints] = None,
+        product_index: Optional[ProductIdIndex] = None
+    ):
         self.api_key = api_key
         self.username = username
         self.password = password
         self.base_url = "https://ws.pttavm.com:93"
+        # Aynı istemcideki servisler tek bir bağlantı havuzunu paylaşır
+        self.transport = transport if transport is not None else HttpTransport()
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.metrics = metrics if metrics is not None else RetryMetrics()
+        self.rate_limiter = rate_limiter
+        # Barkod kontrol önbelleği; yazma işlemleri ilgili barkodları düşürür
+        self.barcode_cache = barcode_cache
+        # Barkod başına son gönderilen yükün özeti; aynı yük tekrar gönderilmez
+        self.fingerprints = fingerprints
+        # Ayrıştırılan stok sayfalarından doldurulan barkod -> UrunId indeksi
+        self.product_index = product_index
+        self._envelope_cache = {}
+
+    def _invalidate_barcodes(self, barcodes: Iterable[str]):
+        """Drop cached barcode checks for barcodes that were just written"""
+        if self.barcode_cache is not None:
+            self.barcode_cache.invalidate(barcodes)
+
+    def _remember_payload(self, barcode: str, kind: str, digest: Optional[str], success: bool):
+        """Record an accepted payload; forget the barcode when the write failed"""
+        if self.fingerprints is None or digest is None:
+            return
+        if success:
+            self.fingerprints.record(barcode, kind, digest)
+        else:
+            self.fingerprints.forget([barcode])
+
+    def _serialize_params(self, params: Dict = None) -> bytes:
+        """
+        Serialize operation parameters into the SOAP body
+        
+        Values are XML-escaped, None values are left out, lists repeat
+        their element and RawXml fragments are inserted as they are.
+        
+        Args:
+            params: Parameters for the operation
+        """
+        return serialize_params(params)
+
+    def _envelope_parts(self, operation: str) -> Tuple[bytes, bytes, Dict[str, str]]:
+        """
+        Return cached, pre-encoded envelope segments for an operation
+        
+        The envelope prefix (XML declaration, WS-Security header and the
+        opening operation tag), the suffix and the HTTP headers only depend
+        on the operation and the credentials, so they are built once.
+        
+        Args:
+            operation: Operation name
+            
+        Returns:
+            Tuple of encoded prefix, encoded suffix and HTTP headers
+        """
+        key = (operation, self.username, self.password)
+        parts = self._envelope_cache.get(key)
+        if parts is None:
+            prefix = ENVELOPE_PREFIX.format(
+                username=escape(str(self.username)),
+                password=escape(str(self.password)),
+                operation=operation
+            ).encode('utf-8')
+            suffix = ENVELOPE_SUFFIX.format(operation=operation).encode('utf-8')
+            headers = {
+                'Content-Type': 'text/xml; charset=utf-8',
+                'SOAPAction': f'{self.SOAP_ACTION_BASE}{operation}'
+            }
+            parts = (prefix, suffix, headers)
+            self._envelope_cache[key] = parts
+        return parts
 
     def _create_soap_envelope(self, operation: str, params: Dict = None) -> str:
         """
@@ -22,35 +134,136 @@ class BaseService:
             operation: Operation name
             params: Parameters for the operation
         """
-        if params is None:
-            params = {}
+        prefix, suffix, _ = self._envelope_parts(operation)
+        return (prefix + self._serialize_params(params) + suffix).decode('utf-8')
+
+    def _build_request(self, operation: str, params: Dict = None) -> Tuple[Dict[str, str], bytes]:
+        """
+        Build HTTP headers and encoded SOAP body for an operation
+        
+        Only the parameters are serialized per call, straight into the body
+        buffer; the rest of the envelope comes from the per-operation cache.
+        
+        Args:
+            operation: Operation name
+            params: Parameters for the operation
             
-        param_xml = ""
-        for key, value in params.items():
-            if isinstance(value, dict):
-                param_xml += f"<tem:{key}>"
-                for sub_key, sub_value in value.items():
-                    param_xml += f"<{sub_key}>{sub_value}</{sub_key}>"
-                param_xml += f"</tem:{key}>"
-            else:
-                param_xml += f"<tem:{key}>{value}</tem:{key}>"
+        Returns:
+            Tuple of headers and encoded request body
+        """
+        prefix, suffix, headers = self._envelope_parts(operation)
+        writer = XmlWriter()
+        writer.raw(prefix)
+        write_params(writer, params)
+        writer.raw(suffix)
+        return dict(headers), bytes(writer.buffer)
+
+    def _check_response(self, status_code: int, content: bytes, text: str = None) -> bytes:
+        """
+        Validate HTTP status and return the raw response body
+        
+        Args:
+            status_code: HTTP status code
+            content: Raw response body
+            text: Decoded response body, used in error messages
+        """
+        if status_code != 200:
+            raise Exception(f"API call failed with status code: {status_code}, Response: {text}")
+        return content
+
+    def _parse_response(self, operation: str, status_code: int, content: bytes, text: str = None) -> Any:
+        """
+        Extract operation result from a SOAP response
+        
+        Args:
+            operation: Operation name
+            status_code: HTTP status code
+            content: Raw response body
+            text: Decoded response body, used in error messages
+            
+        Returns:
+            Result of the operation
+        """
+        # Parse XML response
+        response_dict = xmltodict.parse(self._check_response(status_code, content, text))
+        
+        # Extract response from SOAP envelope
+        soap_body = response_dict['soap:Envelope']['soap:Body']
+        response_key = f'{operation}Response'
+        result_key = f'{operation}Result'
+        
+        if response_key in soap_body and result_key in soap_body[response_key]:
+            return soap_body[response_key][result_key]
             
-        return f"""<?xml version="1.0" encoding="utf-8"?>
-        <soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/" 
-                      xmlns:tem="http://tempuri.org/" 
-                      xmlns:ept="http://schemas.datacontract.org/2004/07/ePttAVMService">
-            <soap:Header>
-                <wsse:Security xmlns:wsse="http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd">
-                    <wsse:UsernameToken>
-                        <wsse:Username>{self.username}</wsse:Username>
-                        <wsse:Password>{self.password}</wsse:Password>
-                    </wsse:UsernameToken>
-                </wsse:Security>
-            </soap:Header>
-            <soap:Body>
-                <tem:{operation}>{param_xml}</tem:{operation}>
-            </soap:Body>
-        </soap:Envelope>"""
+        return None
+
+    def _send(self, operation: str, params: Dict = None) -> requests.Response:
+        """
+        Send a SOAP request, applying the retry policy and circuit breaker
+        
+        Connection errors, timeouts and retryable HTTP statuses are retried
+        with backoff as long as the policy allows it for the operation.
+        SOAP faults are answers of the service, so they are neither retried
+        nor counted as failures by the circuit breaker.
+        Every attempt waits for the rate limiter, if one is configured.
+        
+        Args:
+            operation: Operation name
+            params: Parameters for the operation
+            
+        Returns:
+            requests.Response: Last HTTP response
+        """
+        headers, body = self._build_request(operation, params)
+        policy = self.retry_policy or NO_RETRY
+        max_attempts = policy.attempts_for(operation)
+        self.metrics.increment(operation, "calls")
+        
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.circuit_breaker:
+                try:
+                    self.circuit_breaker.before_call()
+                except Exception:
+                    self.metrics.increment(operation, "rejected")
+                    raise
+                    
+            if self.rate_limiter:
+                self.rate_limiter.acquire(operation)
+                
+            self.metrics.increment(operation, "attempts")
+            try:
+                response = self.transport.post(
+                    self.API_URL,
+                    data=body,
+                    headers=headers
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                self._record_failure(operation)
+                if attempt >= max_attempts:
+                    raise
+            except Exception:
+                # Not retried, but still settles a half-open trial call
+                self._record_failure(operation)
+                raise
+            else:
+                if not policy.is_retryable_response(response.status_code, response.content):
+                    if self.circuit_breaker:
+                        self.circuit_breaker.record_success()
+                    return response
+                self._record_failure(operation)
+                if attempt >= max_attempts:
+                    return response
+                    
+            self.metrics.increment(operation, "retries")
+            time.sleep(policy.backoff(attempt))
+
+    def _record_failure(self, operation: str):
+        """Record a failed attempt in metrics and the circuit breaker"""
+        self.metrics.increment(operation, "failures")
+        if self.circuit_breaker:
+            self.circuit_breaker.record_failure()
 
     def call_service(self, operation: str, params: Dict = None) -> Any:
         """
@@ -63,37 +276,34 @@ class BaseService:
         Returns:
             Response from the API
         """
-        headers = {
-            'Content-Type': 'text/xml; charset=utf-8',
-            'SOAPAction': f'{self.SOAP_ACTION_BASE}{operation}'
-        }
-        
-        body = self._create_soap_envelope(operation, params)
-        
         try:
-            response = requests.post(
-                self.API_URL,
-                data=body.encode('utf-8'),
-                headers=headers,
-                verify=False,  # SSL sertifika doğrulamasını devre dışı bırak
-                timeout=30
+            response = self._send(operation, params)
+            
+            return self._parse_response(
+                operation, response.status_code, response.content, response.text
             )
             
-            if response.status_code != 200:
-                raise Exception(f"API call failed with status code: {response.status_code}, Response: {response.text}")
-                
-            # Parse XML response
-            response_dict = xmltodict.parse(response.content)
+        except Exception as e:
+            raise Exception(f"API call failed: {str(e)}")
+
+    def call_service_raw(self, operation: str, params: Dict = None) -> bytes:
+        """
+        Make SOAP API call and return the raw response body
+        
+        Used by operations that stream-parse large responses instead of
+        building a dict of the whole envelope.
+        
+        Args:
+            operation: Operation name
+            params: Parameters for the operation
             
-            # Extract response from SOAP envelope
-            soap_body = response_dict['soap:Envelope']['soap:Body']
-            response_key = f'{operation}Response'
-            result_key = f'{operation}Result'
+        Returns:
+            Raw SOAP response body
+        """
+        try:
+            response = self._send(operation, params)
             
-            if response_key in soap_body and result_key in soap_body[response_key]:
-                return soap_body[response_key][result_key]
-                
-            return None
+            return self._check_response(response.status_code, response.content, response.text)
             
         except Exception as e:
             raise Exception(f"API call failed: {str(e)}")
@@ -1,8 +1,12 @@
 import requests
+import time
 import xmltodict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from typing import List, Optional, Dict
 from .base_service import BaseService
 from ..models.category import Category
+from ..models.category_tree import CategoryTree
 
 class CategoryService(BaseService):
     """Service for category related operations"""
@@ -31,3 +35,57 @@ class CategoryService(BaseService):
             
         except Exception as e:
             raise Exception(f"Failed to get categories: {str(e)}")
+
+    def get_category_tree(self, root_id: str = "1", max_workers: int = 8) -> CategoryTree:
+        """
+        Walk the whole category tree breadth-first.
+        GetCategory only returns direct children, so every category is
+        fetched once; up to max_workers requests are kept in flight.
+        
+        Args:
+            root_id: Category to start from. Defaults to "1" for root category.
+            max_workers: Maximum number of concurrent GetCategory calls
+            
+        Returns:
+            CategoryTree with every category reachable from root_id
+            
+        Raises:
+            Exception: If any GetCategory call fails
+        """
+        root = self.get_categories(root_id)
+        if root is None:
+            raise Exception(f"Failed to get category tree: category {root_id} not found")
+
+        tree = CategoryTree(root_id=str(root.id))
+        tree.add(root)
+        queue = deque(self._add_children(tree, root))
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            running = set()
+            while queue or running:
+                while queue and len(running) < max_workers:
+                    running.add(executor.submit(self.get_categories, queue.popleft()))
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        category = future.result()
+                    except Exception as e:
+                        for pending in running:
+                            pending.cancel()
+                        raise Exception(f"Failed to get category tree: {str(e)}")
+                    if category is not None:
+                        queue.extend(self._add_children(tree, category))
+
+        tree.updated_at = time.time()
+        return tree
+
+    def _add_children(self, tree: CategoryTree, category: Category) -> List[str]:
+        """Add the children of a fetched category; returns the ids still to fetch"""
+        parent = tree.get(category.id)
+        if parent is not None and category.updated_at:
+            parent.updated_at = category.updated_at
+        added = []
+        for child in category.children or []:
+            if tree.add(child, parent_id=str(category.id)) is not None:
+                added.append(str(child.id))
+        return added
@@ -1,17 +1,22 @@
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Iterable
 from .base_service import BaseService
 from ..models.product import Product, ProductActivation, ProductUpdateError
 from ..models.barcode import BarcodeCheckResult, BulkBarcodeCheck, BarcodeError
-from ..models.product_update import ProductUpdateV2
+from ..models.product_update import ProductUpdateV2, ChunkResult, BulkUpdateReport
+from ..utils.concurrency import chunked, map_bounded
+from ..utils.xml_writer import RawXml, XmlRecords, product_fields, serialize_list, write_products
+from ..utils.fingerprint import payload_digest
 from ..models.variant import ValidationError
 import xmltodict
 
 class ProductService(BaseService):
     """Service for product related operations"""
+
+    BULK_BARCODE_LIMIT = 100  # BarkodKontrolBulk istek başına en fazla barkod
     
     def check_barcode(self, barcode: str) -> BarcodeCheckResult:
         """
-        Tekil barkod kontrolü yapar.
+        Tekil barkod kontrolü yapar. Önbellek varsa geçerli sonuç önbellekten döner.
         
         Args:
             barcode (str): Kontrol edilecek barkod
@@ -24,92 +29,154 @@ class ProductService(BaseService):
             BarcodeError: Barkod kontrolü sırasında hata oluşursa
         """
         try:
-            # Barkod validasyonu
-            if not barcode:
-                raise ValidationError("Barcode cannot be empty")
-            if not isinstance(barcode, str):
-                raise ValidationError("Barcode must be a string")
-            if len(barcode.strip()) == 0:
-                raise ValidationError("Barcode cannot be whitespace")
+            self._validate_barcode(barcode)
+
+            if self.barcode_cache is not None:
+                cached = self.barcode_cache.get(barcode)
+                if cached is not None:
+                    return cached
 
             response = self.call_service(
                 operation="BarkodKontrol",
                 params={"Barkod": barcode.strip()}
             )
             
-            # API yanıtını işle
-            exists = bool(response.get("Success", False))
-            message = response.get("Message")
-            
-            return BarcodeCheckResult(
-                barcode=barcode,
-                exists=exists,
-                message=message
-            )
+            result = self._barcode_check_result(barcode, response)
+            if self.barcode_cache is not None:
+                self.barcode_cache.put(result)
+            return result
             
         except ValidationError as e:
             raise ValidationError(f"Invalid barcode: {str(e)}")
         except Exception as e:
             raise BarcodeError(f"Barcode check failed: {str(e)}")
 
-    def check_barcodes_bulk(self, barcodes: List[str]) -> List[BarcodeCheckResult]:
+    def _validate_barcode(self, barcode: str):
+        """Tekil barkod kontrolü için barkodu doğrular."""
+        if not barcode:
+            raise ValidationError("Barcode cannot be empty")
+        if not isinstance(barcode, str):
+            raise ValidationError("Barcode must be a string")
+        if len(barcode.strip()) == 0:
+            raise ValidationError("Barcode cannot be whitespace")
+
+    def _barcode_check_result(self, barcode: str, response) -> BarcodeCheckResult:
+        """BarkodKontrol yanıtını BarcodeCheckResult nesnesine dönüştürür."""
+        exists = bool(response.get("Success", False))
+        message = response.get("Message")
+        
+        return BarcodeCheckResult(
+            barcode=barcode,
+            exists=exists,
+            message=message
+        )
+
+    def check_barcodes_bulk(self, barcodes: Iterable[str], max_workers: int = 4) -> List[BarcodeCheckResult]:
         """
-        Toplu barkod kontrolü yapar.
+        Toplu barkod kontrolü yapar. Barkod sayısı sınırsızdır: barkodlar
+        boşluklardan arındırılır, tekrarlar bir kez sorgulanır ve liste
+        100'lük isteklere bölünerek eşzamanlı gönderilir. Önbellek varsa
+        yalnızca önbellekte bulunmayan barkodlar sorgulanır.
         
         Args:
-            barcodes (List[str]): Kontrol edilecek barkod listesi
+            barcodes (Iterable[str]): Kontrol edilecek barkodlar
+            max_workers (int): Aynı anda gönderilecek en fazla istek sayısı
             
         Returns:
-            List[BarcodeCheckResult]: Barkod kontrol sonuçları
+            List[BarcodeCheckResult]: Giriş sırasına göre, her barkod için bir sonuç
             
         Raises:
             ValidationError: Barkod listesi geçersiz ise
             BarcodeError: Barkod kontrolü sırasında hata oluşursa
         """
         try:
-            # Liste validasyonu
-            if not isinstance(barcodes, list):
-                raise ValidationError("Barcodes must be a list")
-            if not barcodes:
-                raise ValidationError("Barcodes list cannot be empty")
-            if not all(isinstance(b, str) for b in barcodes):
-                raise ValidationError("All barcodes must be strings")
-            if not all(b.strip() for b in barcodes):
-                raise ValidationError("Empty or whitespace-only barcodes are not allowed")
-            
-            # Giriş verilerini doğrula
-            bulk_check = BulkBarcodeCheck(barcodes=barcodes)
-            
-            response = self.call_service(
-                operation="BarkodKontrolBulk",
-                params={
-                    "Barkod": {
-                        "arr:string": bulk_check.barcodes
-                    }
-                }
-            )
-            
-            # API yanıtını işle
-            results = []
-            bulk_results = response.get("BarkodKontrolBulkResult", {})
-            
-            for barcode in bulk_check.barcodes:
-                result = bulk_results.get(barcode, {})
-                results.append(
-                    BarcodeCheckResult(
-                        barcode=barcode,
-                        exists=bool(result.get("Success", False)),
-                        message=result.get("Message")
-                    )
-                )
-            
-            return results
+            normalized = self._normalize_bulk_barcodes(barcodes)
+
+            checked = {}
+            missing = normalized
+            if self.barcode_cache is not None:
+                missing = []
+                for barcode in dict.fromkeys(normalized):
+                    cached = self.barcode_cache.get(barcode)
+                    if cached is not None:
+                        checked[barcode] = cached
+                    else:
+                        missing.append(barcode)
+
+            for _, results, error in map_bounded(
+                self._check_barcode_chunk, self._bulk_barcode_chunks(missing), max_workers
+            ):
+                if error is not None:
+                    raise error
+                for result in results:
+                    checked[result.barcode] = result
+                    if self.barcode_cache is not None:
+                        self.barcode_cache.put(result)
+
+            return [checked[barcode] for barcode in normalized]
             
         except ValidationError as e:
             raise ValidationError(f"Invalid barcodes: {str(e)}")
         except Exception as e:
             raise BarcodeError(f"Bulk barcode check failed: {str(e)}")
 
+    def _check_barcode_chunk(self, bulk_check: BulkBarcodeCheck) -> List[BarcodeCheckResult]:
+        """En fazla 100 barkodluk tek bir BarkodKontrolBulk isteği gönderir."""
+        response = self.call_service(
+            operation="BarkodKontrolBulk",
+            params=self._bulk_barcode_params(bulk_check)
+        )
+        return self._bulk_barcode_results(bulk_check, response)
+
+    def _normalize_bulk_barcodes(self, barcodes: Iterable[str]) -> List[str]:
+        """Toplu barkod listesini doğrular ve boşluklardan arındırır."""
+        # Liste validasyonu
+        if isinstance(barcodes, str):
+            raise ValidationError("Barcodes must be a list")
+        barcodes = list(barcodes)
+        if not barcodes:
+            raise ValidationError("Barcodes list cannot be empty")
+        if not all(isinstance(b, str) for b in barcodes):
+            raise ValidationError("All barcodes must be strings")
+        normalized = [b.strip() for b in barcodes]
+        if not all(normalized):
+            raise ValidationError("Empty or whitespace-only barcodes are not allowed")
+        
+        return normalized
+
+    def _bulk_barcode_chunks(self, normalized: List[str]) -> List[BulkBarcodeCheck]:
+        """Tekrarsız barkodları API limitine göre BarkodKontrolBulk isteklerine böler."""
+        unique = list(dict.fromkeys(normalized))
+        return [
+            BulkBarcodeCheck(barcodes=chunk)
+            for chunk in chunked(unique, self.BULK_BARCODE_LIMIT)
+        ]
+
+    def _bulk_barcode_params(self, bulk_check: BulkBarcodeCheck) -> dict:
+        """BarkodKontrolBulk isteğinin parametrelerini hazırlar."""
+        return {
+            "Barkod": {
+                "arr:string": bulk_check.barcodes
+            }
+        }
+
+    def _bulk_barcode_results(self, bulk_check: BulkBarcodeCheck, response) -> List[BarcodeCheckResult]:
+        """BarkodKontrolBulk yanıtını barkod sırasına göre sonuç listesine dönüştürür."""
+        results = []
+        bulk_results = response.get("BarkodKontrolBulkResult", {})
+        
+        for barcode in bulk_check.barcodes:
+            result = bulk_results.get(barcode, {})
+            results.append(
+                BarcodeCheckResult(
+                    barcode=barcode,
+                    exists=bool(result.get("Success", False)),
+                    message=result.get("Message")
+                )
+            )
+        
+        return results
+
     def get_stock_list(self) -> dict:
         """
         Get stock list from PTT AVM system.
@@ -153,12 +220,7 @@ class ProductService(BaseService):
         try:
             response = self.call_service(
                 operation="AktifYap",
-                params={
-                    "req": {
-                        "Aktif": "1" if activation.is_active else "0",
-                        "UrunId": activation.product_id
-                    }
-                }
+                params=self._activation_params(activation)
             )
             
             return True if response else False
@@ -166,6 +228,15 @@ class ProductService(BaseService):
         except Exception as e:
             raise ProductUpdateError(f"Failed to activate product: {str(e)}")
 
+    def _activation_params(self, activation: ProductActivation) -> dict:
+        """AktifYap isteğinin parametrelerini hazırlar."""
+        return {
+            "req": {
+                "Aktif": "1" if activation.is_active else "0",
+                "UrunId": activation.product_id
+            }
+        }
+
     def update_product_v2(self, product: ProductUpdateV2) -> bool:
         """
         Ürün bilgilerini günceller (V2).
@@ -179,105 +250,31 @@ class ProductService(BaseService):
         Raises:
             ProductUpdateError: Güncelleme işlemi başarısız olursa
         """
-        try:
-            # Parça listesini hazırla
-            parts_xml = ""
-            if product.parts:
-                for part in product.parts:
-                    parts_xml += f"""
-                    <ept:PartRequest>
-                        <ept:Desi>{part.desi}</ept:Desi>
-                        <ept:PartComment>{part.comment or ''}</ept:PartComment>
-                        <ept:PartNo>{part.part_no}</ept:PartNo>
-                    </ept:PartRequest>"""
-
-            # Resim listesini hazırla
-            images_xml = ""
-            if product.product_images:
-                for image in product.product_images:
-                    images_xml += f"""
-                    <ept:UrunResim>
-                        <ept:Sira>{image.order}</ept:Sira>
-                        <ept:Url>{image.url}</ept:Url>
-                    </ept:UrunResim>"""
-
-            # Varyant listesini hazırla
-            variants_xml = ""
-            if product.variants:
-                for variant in product.variants:
-                    attrs_xml = ""
-                    for attr in variant.attributes:
-                        attrs_xml += f"""
-                        <ept:VariantAttr>
-                            <ept:Deger>{attr.value}</ept:Deger>
-                            <ept:Fiyat>{attr.price}</ept:Fiyat>
-                            <ept:FiyatFarkiMi>{str(attr.is_price_difference).lower()}</ept:FiyatFarkiMi>
-                            <ept:Tanim>{attr.name}</ept:Tanim>
-                        </ept:VariantAttr>"""
-
-                    variants_xml += f"""
-                    <ept:Variant>
-                        <ept:AnaUrunKodu>{variant.main_barcode}</ept:AnaUrunKodu>
-                        <ept:Attributes>{attrs_xml}</ept:Attributes>
-                        <ept:Miktar>{variant.quantity}</ept:Miktar>
-                        <ept:VariantBarkod>{variant.variant_barcode}</ept:VariantBarkod>
-                    </ept:Variant>"""
+        digest = None
+        if self.fingerprints is not None:
+            digest = payload_digest(self._product_record(product))
+            if self.fingerprints.is_unchanged(product.barcode, "product", digest):
+                return True
 
+        success = False
+        try:
             response = self.call_service(
                 operation="StokGuncelleV2",
-                params={
-                    "item": {
-                        "Aciklama": product.description,
-                        "AdminCode": product.admin_code,
-                        "Agirlik": product.weight,
-                        "Aktif": str(product.is_active).lower(),
-                        "AltKategoriAdi": product.subcategory_name,
-                        "AltKategoriId": product.subcategory_id,
-                        "AnaKategoriId": product.main_category_id,
-                        "Barkod": product.barcode,
-                        "BoyX": product.dimensions[0],
-                        "BoyY": product.dimensions[1],
-                        "BoyZ": product.dimensions[2],
-                        "Desi": product.desi,
-                        "Durum": product.status,
-                        "GarantiSuresi": product.warranty_period,
-                        "GarantiVerenFirma": product.warranty_company,
-                        "Gtin": product.gtin,
-                        "IsAdmin": str(product.is_admin).lower(),
-                        "Iskonto": product.discount,
-                        "KDVOran": product.vat_rate,
-                        "KDVli": product.price_with_vat,
-                        "KDVsiz": product.price_without_vat,
-                        "KargoProfilId": product.cargo_profile_id,
-                        "KategoriBilgisiGuncelle": str(product.update_category_info).lower(),
-                        "Mevcut": str(product.is_available).lower(),
-                        "Miktar": product.quantity,
-                        "Parts": parts_xml if parts_xml else None,
-                        "SatisBaslangicTarihi": product.sale_start_date.isoformat() if product.sale_start_date else None,
-                        "SatisBitisTarihi": product.sale_end_date.isoformat() if product.sale_end_date else None,
-                        "ShopId": product.shop_id,
-                        "SingleBox": str(product.is_single_box).lower(),
-                        "Tag": product.tag,
-                        "TahminiKargoSuresi": product.estimated_shipping_time,
-                        "TedarikciAltKategoriAdi": product.supplier_subcategory_name,
-                        "TedarikciAltKategoriId": product.supplier_subcategory_id,
-                        "TedarikciSanalKategoriId": product.supplier_virtual_category_id,
-                        "UrunAdi": product.product_name,
-                        "UrunId": product.product_id,
-                        "UrunKodu": product.product_code,
-                        "UrunResimleri": images_xml if images_xml else None,
-                        "UrunUrl": product.product_url,
-                        "UzunAciklama": product.long_description,
-                        "VariantListesi": variants_xml if variants_xml else None,
-                        "YeniKategoriId": product.category_id
-                    }
-                }
+                params=self._product_v2_params(product)
             )
             
-            return True if response else False
+            success = True if response else False
+            return success
             
         except Exception as e:
             raise ProductUpdateError(f"Failed to update product: {str(e)}")
+        finally:
+            self._invalidate_barcodes(self._written_barcodes([product]))
+            self._remember_payload(product.barcode, "product", digest, success)
+
+    def _product_v2_params(self, product: ProductUpdateV2) -> dict:
+        """StokGuncelleV2 isteğinin parametrelerini hazırlar."""
+        return {"item": product_fields(product)}
 
     def update_products_v2_bulk(self, products: List[ProductUpdateV2]) -> bool:
         """
@@ -293,114 +290,18 @@ class ProductService(BaseService):
             ValidationError: Ürün listesi geçersiz ise
             ProductUpdateError: Güncelleme işlemi başarısız olursa
         """
-        try:
-            # Liste validasyonu
-            if not isinstance(products, list):
-                raise ValidationError("Products must be a list")
-            if not products:
-                raise ValidationError("Products list cannot be empty")
-            if len(products) > 100:  # API limiti
-                raise ValidationError("Maximum 100 products allowed per request")
-
-            # Tüm ürünler için XML oluştur
-            products_xml = ""
-            for product in products:
-                # Parça listesini hazırla
-                parts_xml = ""
-                if product.parts:
-                    for part in product.parts:
-                        parts_xml += f"""
-                        <ept:PartRequest>
-                            <ept:Desi>{part.desi}</ept:Desi>
-                            <ept:PartComment>{part.comment or ''}</ept:PartComment>
-                            <ept:PartNo>{part.part_no}</ept:PartNo>
-                        </ept:PartRequest>"""
-
-                # Resim listesini hazırla
-                images_xml = ""
-                if product.product_images:
-                    for image in product.product_images:
-                        images_xml += f"""
-                        <ept:UrunResim>
-                            <ept:Sira>{image.order}</ept:Sira>
-                            <ept:Url>{image.url}</ept:Url>
-                        </ept:UrunResim>"""
-
-                # Varyant listesini hazırla
-                variants_xml = ""
-                if product.variants:
-                    for variant in product.variants:
-                        attrs_xml = ""
-                        for attr in variant.attributes:
-                            attrs_xml += f"""
-                            <ept:VariantAttr>
-                                <ept:Deger>{attr.value}</ept:Deger>
-                                <ept:Fiyat>{attr.price}</ept:Fiyat>
-                                <ept:FiyatFarkiMi>{str(attr.is_price_difference).lower()}</ept:FiyatFarkiMi>
-                                <ept:Tanim>{attr.name}</ept:Tanim>
-                            </ept:VariantAttr>"""
-
-                        variants_xml += f"""
-                        <ept:Variant>
-                            <ept:AnaUrunKodu>{variant.main_barcode}</ept:AnaUrunKodu>
-                            <ept:Attributes>{attrs_xml}</ept:Attributes>
-                            <ept:Miktar>{variant.quantity}</ept:Miktar>
-                            <ept:VariantBarkod>{variant.variant_barcode}</ept:VariantBarkod>
-                        </ept:Variant>"""
-
-                # Her ürün için XML oluştur
-                products_xml += f"""
-                <ept:StokUrun>
-                    <ept:Aciklama>{product.description}</ept:Aciklama>
-                    <ept:AdminCode>{product.admin_code}</ept:AdminCode>
-                    <ept:Agirlik>{product.weight}</ept:Agirlik>
-                    <ept:Aktif>{str(product.is_active).lower()}</ept:Aktif>
-                    <ept:AltKategoriAdi>{product.subcategory_name}</ept:AltKategoriAdi>
-                    <ept:AltKategoriId>{product.subcategory_id}</ept:AltKategoriId>
-                    <ept:AnaKategoriId>{product.main_category_id}</ept:AnaKategoriId>
-                    <ept:Barkod>{product.barcode}</ept:Barkod>
-                    <ept:BoyX>{product.dimensions[0]}</ept:BoyX>
-                    <ept:BoyY>{product.dimensions[1]}</ept:BoyY>
-                    <ept:BoyZ>{product.dimensions[2]}</ept:BoyZ>
-                    <ept:Desi>{product.desi}</ept:Desi>
-                    <ept:Durum>{product.status}</ept:Durum>
-                    <ept:GarantiSuresi>{product.warranty_period}</ept:GarantiSuresi>
-                    <ept:GarantiVerenFirma>{product.warranty_company}</ept:GarantiVerenFirma>
-                    <ept:Gtin>{product.gtin}</ept:Gtin>
-                    <ept:IsAdmin>{str(product.is_admin).lower()}</ept:IsAdmin>
-                    <ept:Iskonto>{product.discount}</ept:Iskonto>
-                    <ept:KDVOran>{product.vat_rate}</ept:KDVOran>
-                    <ept:KDVli>{product.price_with_vat}</ept:KDVli>
-                    <ept:KDVsiz>{product.price_without_vat}</ept:KDVsiz>
-                    <ept:KargoProfilId>{product.cargo_profile_id}</ept:KargoProfilId>
-                    <ept:KategoriBilgisiGuncelle>{str(product.update_category_info).lower()}</ept:KategoriBilgisiGuncelle>
-                    <ept:Mevcut>{str(product.is_available).lower()}</ept:Mevcut>
-                    <ept:Miktar>{product.quantity}</ept:Miktar>
-                    <ept:Parts>{parts_xml if parts_xml else None}</ept:Parts>
-                    <ept:SatisBaslangicTarihi>{product.sale_start_date.isoformat() if product.sale_start_date else None}</ept:SatisBaslangicTarihi>
-                    <ept:SatisBitisTarihi>{product.sale_end_date.isoformat() if product.sale_end_date else None}</ept:SatisBitisTarihi>
-                    <ept:ShopId>{product.shop_id}</ept:ShopId>
-                    <ept:SingleBox>{str(product.is_single_box).lower()}</ept:SingleBox>
-                    <ept:Tag>{product.tag}</ept:Tag>
-                    <ept:TahminiKargoSuresi>{product.estimated_shipping_time}</ept:TahminiKargoSuresi>
-                    <ept:TedarikciAltKategoriAdi>{product.supplier_subcategory_name}</ept:TedarikciAltKategoriAdi>
-                    <ept:TedarikciAltKategoriId>{product.supplier_subcategory_id}</ept:TedarikciAltKategoriId>
-                    <ept:TedarikciSanalKategoriId>{product.supplier_virtual_category_id}</ept:TedarikciSanalKategoriId>
-                    <ept:UrunAdi>{product.product_name}</ept:UrunAdi>
-                    <ept:UrunId>{product.product_id}</ept:UrunId>
-                    <ept:UrunKodu>{product.product_code}</ept:UrunKodu>
-                    <ept:UrunResimleri>{images_xml if images_xml else None}</ept:UrunResimleri>
-                    <ept:UrunUrl>{product.product_url}</ept:UrunUrl>
-                    <ept:UzunAciklama>{product.long_description}</ept:UzunAciklama>
-                    <ept:VariantListesi>{variants_xml if variants_xml else None}</ept:VariantListesi>
-                    <ept:YeniKategoriId>{product.category_id}</ept:YeniKategoriId>
-                </ept:StokUrun>"""
+        if self.fingerprints is not None:
+            try:
+                self._products_v2_bulk_params(products)
+            except ValidationError as e:
+                raise ValidationError(f"Invalid products data: {str(e)}")
+            records, _ = self._changed_product_records(products)
+            return self._send_product_records(records) if records else True
 
+        try:
             response = self.call_service(
                 operation="StokGuncelleV2Bulk",
-                params={
-                    "items": products_xml
-                }
+                params=self._products_v2_bulk_params(products)
             )
             
             return True if response else False
@@ -409,3 +310,114 @@ class ProductService(BaseService):
             raise ValidationError(f"Invalid products data: {str(e)}")
         except Exception as e:
             raise ProductUpdateError(f"Failed to update products in bulk: {str(e)}")
+        finally:
+            if isinstance(products, list):
+                self._invalidate_barcodes(self._written_barcodes(products))
+
+    def _product_record(self, product: ProductUpdateV2) -> RawXml:
+        """Ürünün StokUrun kaydı; parmak izi ve toplu gövde için kullanılır."""
+        return serialize_list(write_products, [product])
+
+    def _changed_product_records(self, products: Iterable[ProductUpdateV2]):
+        """
+        Son gönderilen yükten farklı ürünleri kayıtları ve özetleriyle döndürür.
+        
+        Returns:
+            Tuple: ([(ürün, kayıt, özet)], atlanan barkodlar)
+        """
+        records, skipped = [], []
+        for product in products:
+            record = self._product_record(product)
+            digest = payload_digest(record)
+            if self.fingerprints.is_unchanged(product.barcode, "product", digest):
+                skipped.append(product.barcode)
+            else:
+                records.append((product, record, digest))
+        return records, skipped
+
+    def _send_product_records(self, records: List[tuple]) -> bool:
+        """Önceden serileştirilmiş ürün kayıtlarını tek StokGuncelleV2Bulk isteğiyle gönderir."""
+        products = [product for product, _, _ in records]
+        success = False
+        try:
+            response = self.call_service(
+                operation="StokGuncelleV2Bulk",
+                params={"items": RawXml(b"".join(record for _, record, _ in records))}
+            )
+            
+            success = True if response else False
+            return success
+            
+        except Exception as e:
+            raise ProductUpdateError(f"Failed to update products in bulk: {str(e)}")
+        finally:
+            self._invalidate_barcodes(self._written_barcodes(products))
+            for product, _, digest in records:
+                self._remember_payload(product.barcode, "product", digest, success)
+
+    def _written_barcodes(self, products: List[ProductUpdateV2]) -> List[str]:
+        """Güncellenen ürünlerin ana ve varyant barkodları."""
+        barcodes = []
+        for product in products:
+            barcodes.append(product.barcode)
+            barcodes.extend(variant.variant_barcode for variant in product.variants or [])
+        return barcodes
+
+    def update_products_v2_chunked(
+        self,
+        products: Iterable[ProductUpdateV2],
+        chunk_size: int = 100,
+        max_workers: int = 4
+    ) -> BulkUpdateReport:
+        """
+        Sınırsız sayıda ürünü API limitine göre parçalara bölerek günceller (V2).
+        Parçalar sınırlı sayıda worker ile eşzamanlı gönderilir; bir parçanın
+        hatası diğerlerini durdurmaz.
+        
+        Args:
+            products: Güncellenecek ürünler (herhangi bir iterable)
+            chunk_size: İstek başına ürün sayısı (en fazla 100)
+            max_workers: Aynı anda gönderilecek en fazla istek sayısı
+            
+        Returns:
+            BulkUpdateReport: Parça ve barkod bazında sonuç raporu
+            
+        Raises:
+            ValidationError: Parça boyutu geçersiz ise
+        """
+        if not 1 <= chunk_size <= 100:  # API limiti
+            raise ValidationError("Chunk size must be between 1 and 100")
+
+        if self.fingerprints is not None:
+            # Değişmeyen ürünler parçalamadan önce ayıklanır, parçalar dolu kalır
+            records, skipped = self._changed_product_records(products)
+            send, batches = self._send_product_records, chunked(records, chunk_size)
+            barcodes_of = lambda chunk: [product.barcode for product, _, _ in chunk]
+        else:
+            skipped = []
+            send, batches = self.update_products_v2_bulk, chunked(products, chunk_size)
+            barcodes_of = lambda chunk: [product.barcode for product in chunk]
+
+        chunks = []
+        for index, (chunk, result, error) in enumerate(map_bounded(send, batches, max_workers)):
+            chunks.append(ChunkResult(
+                index=index,
+                barcodes=barcodes_of(chunk),
+                success=bool(result) and error is None,
+                error=str(error) if error else None
+            ))
+            
+        return BulkUpdateReport(chunks=chunks, skipped=skipped)
+
+    def _products_v2_bulk_params(self, products: List[ProductUpdateV2]) -> dict:
+        """StokGuncelleV2Bulk isteğinin parametrelerini doğrular ve hazırlar."""
+        # Liste validasyonu
+        if not isinstance(products, list):
+            raise ValidationError("Products must be a list")
+        if not products:
+            raise ValidationError("Products list cannot be empty")
+        if len(products) > 100:  # API limiti
+            raise ValidationError("Maximum 100 products allowed per request")
+
+        # Ürünler istek gövdesi oluşturulurken doğrudan gövde tamponuna yazılır
+        return {"items": XmlRecords(write_products, products)}
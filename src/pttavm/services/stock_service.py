@@ -1,17 +1,26 @@
-from typing import List, Tuple, Optional, Union
+from typing import List, Tuple, Optional, Union, Iterator, Iterable
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import io
 import math
-from ..models.stock import (
-    Stock, StockWarranty, StockDimensions, 
-    StockPrice, StockProduct
-)
-from ..models.variant import StockPriceUpdate, Variant, VariantAttribute
+from ..models.stock import Stock
+from ..models.stock_table import StockTable
+from ..models.variant import StockPriceUpdate, StockPriceUpdateResult, Variant, VariantAttribute
+from ..utils.concurrency import map_bounded
+from ..utils.stock_parser import parse_stock_page, convert_stock_record
+from ..utils.xml_writer import serialize_fields, serialize_list, write_variants
+from ..utils.fingerprint import payload_digest
+from ..utils.stock_snapshot import write_stock_snapshot
 from .base_service import BaseService
 
 class StockService(BaseService):
     ITEMS_PER_PAGE = 1000  # PTT AVM API'nin sayfa başına döndüğü maksimum ürün sayısı
+    PARSE_ERROR_LIMIT = 1000  # Saklanacak en fazla alan dönüştürme hatası
     
-    def __init__(self, username: str, password: str):
-        super().__init__(username=username, password=password)
+    def __init__(self, username: str, password: str, **kwargs):
+        super().__init__(username=username, password=password, **kwargs)
+        # Son dönüştürme hataları (StockFieldError), eski kayıtlar otomatik düşer
+        self.parse_errors = deque(maxlen=self.PARSE_ERROR_LIMIT)
 
     def get_single_stock(self, barcode: str) -> Optional[Stock]:
         """
@@ -24,20 +33,36 @@ class StockService(BaseService):
             Optional[Stock]: Stok bilgisi, ürün bulunamazsa None
         """
         try:
-            response = self.call_service(
+            content = self.call_service_raw(
                 operation="StokKontrolListesi",
                 params={"Barkod": barcode}
             )
             
-            if not response or 'a:StokKontrolDetay' not in response:
-                return None
-
-            stock_data = response['a:StokKontrolDetay']
-            return self._parse_stock_data(stock_data)
+            return self._parse_single_stock_response(content)
             
         except Exception as e:
             raise Exception(f"Failed to get stock info: {str(e)}")
 
+    def _parse_single_stock_response(self, content: bytes) -> Optional[Stock]:
+        """
+        Tekil barkod sorgusunun ham yanıtını Stock nesnesine dönüştürür.
+        
+        Args:
+            content: StokKontrolListesi ham SOAP yanıtı
+            
+        Returns:
+            Optional[Stock]: Stok bilgisi, ürün bulunamazsa None
+        """
+        stocks = self._parse_stocks(content)
+        return stocks[0] if stocks else None
+
+    def _parse_stocks(self, content: bytes) -> List[Stock]:
+        """Stok sayfasını ayrıştırır, ürün id'lerini barkod indeksine ekler."""
+        stocks = parse_stock_page(io.BytesIO(content), self.parse_errors)
+        if self.product_index is not None:
+            self.product_index.add_stocks(stocks)
+        return stocks
+
     def get_total_stock_count(self) -> int:
         """
         Toplam stok sayısını hesaplar.
@@ -70,42 +95,126 @@ class StockService(BaseService):
         except Exception as e:
             raise Exception(f"Failed to get total stock count: {str(e)}")
 
-    def get_all_stocks(self, batch_callback=None) -> List[Stock]:
+    def get_all_stocks(
+        self,
+        batch_callback=None,
+        max_workers: int = 1,
+        as_table: bool = False,
+        snapshot_path: Optional[str] = None
+    ) -> Union[List[Stock], StockTable]:
         """
         Tüm stok listesini pagination ile getirir.
         
         Args:
             batch_callback: Her sayfa çekildiğinde çağrılacak callback fonksiyonu
                           Örnek: lambda stocks, page, total_items: print(f"Sayfa {page} - Toplam {total_items} ürün")
+            max_workers: Aynı anda istenecek en fazla sayfa sayısı. 1'den büyükse
+                         sayfalar önceden paralel olarak çekilir, callback yine
+                         sayfa sırasıyla çağrılır.
+            as_table: True ise sonuç kolon bazlı StockTable olarak döner;
+                      sayfalar tabloya eklendikten sonra Stock nesneleri bırakılır.
+            snapshot_path: Verilirse sonuç ayrıca mmap ile okunabilen ikili anlık
+                           görüntü dosyasına yazılır (open_stock_snapshot ile açılır).
         
         Returns:
-            List[Stock]: Tüm stokların listesi
+            Union[List[Stock], StockTable]: Tüm stoklar
         """
         try:
-            all_stocks = []
-            page = 0
+            all_stocks = StockTable() if as_table else []
             
+            for page, stocks in enumerate(self._iter_stock_pages(max_workers)):
+                all_stocks.extend(stocks)
+                
+                if batch_callback:
+                    batch_callback(stocks, page + 1, len(all_stocks))
+            
+            if snapshot_path:
+                write_stock_snapshot(all_stocks, snapshot_path)
+                    
+            return all_stocks
+            
+        except Exception as e:
+            raise Exception(f"Failed to get all stocks: {str(e)}")
+
+    def iter_stocks(self, pages: bool = False, max_workers: int = 1) -> Iterator[Union[Stock, List[Stock]]]:
+        """
+        Stokları sayfalar geldikçe tek tek (ya da sayfa sayfa) döndürür.
+        Tüm katalog bellekte tutulmaz; döngüden erken çıkıldığında kalan
+        sayfalar istenmez.
+        
+        Args:
+            pages: True ise her adımda bir sayfanın stok listesi döner
+            max_workers: Aynı anda istenecek en fazla sayfa sayısı
+            
+        Yields:
+            Stock ya da List[Stock]
+        """
+        try:
+            for stocks in self._iter_stock_pages(max_workers):
+                if pages:
+                    yield stocks
+                else:
+                    yield from stocks
+                    
+        except Exception as e:
+            raise Exception(f"Failed to iterate stocks: {str(e)}")
+
+    def _iter_stock_pages(self, max_workers: int = 1) -> Iterator[List[Stock]]:
+        """
+        Stok sayfalarını sırasıyla döndürür.
+        İlk boş ya da ITEMS_PER_PAGE'den kısa sayfada durur.
+        
+        Args:
+            max_workers: Aynı anda uçuşta olabilecek en fazla sayfa isteği
+            
+        Yields:
+            List[Stock]: Bir sayfadaki stoklar
+        """
+        if max_workers <= 1:
+            page = 0
             while True:
                 stocks = self.get_stock_list(page)
                 
                 if not stocks:  # Boş liste gelirse bitir
-                    break
+                    return
                     
-                all_stocks.extend(stocks)
+                yield stocks
                 
-                if batch_callback:
-                    batch_callback(stocks, page + 1, len(all_stocks))
-                    
                 # Son sayfaya ulaştıysak bitir
                 if len(stocks) < self.ITEMS_PER_PAGE:
-                    break
+                    return
                     
                 page += 1
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = deque()
+        next_page = 0
+        try:
+            # Pencereyi doldur
+            for _ in range(max_workers):
+                pending.append(executor.submit(self.get_stock_list, next_page))
+                next_page += 1
+                
+            while pending:
+                stocks = pending.popleft().result()
+                
+                if not stocks:
+                    return
                     
-            return all_stocks
-            
-        except Exception as e:
-            raise Exception(f"Failed to get all stocks: {str(e)}")
+                # Sayfa doluysa sıradaki sayfayı hemen kuyruğa ekle
+                if len(stocks) >= self.ITEMS_PER_PAGE:
+                    pending.append(executor.submit(self.get_stock_list, next_page))
+                    next_page += 1
+                    
+                yield stocks
+                
+                if len(stocks) < self.ITEMS_PER_PAGE:
+                    return
+        finally:
+            # Son sayfadan sonrası için açılmış istekleri iptal et
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
 
     def get_stock_list(self, page: int = 0) -> List[Stock]:
         """
@@ -118,38 +227,34 @@ class StockService(BaseService):
             List[Stock]: Stok listesi
         """
         try:
-            response = self.call_service(
+            content = self.call_service_raw(
                 operation="StokKontrolListesi",
                 params={"SearchPage": page}
             )
             
-            if not response:
-                return []
-
-            stock_data_list = response.get('a:StokKontrolDetay', [])
-            
-            # Tek bir sonuç varsa liste haline getir
-            if isinstance(stock_data_list, dict):
-                stock_data_list = [stock_data_list]
-                
-            stocks = []
-            for data in stock_data_list:
-                try:
-                    stock = self._parse_stock_data(data)
-                    if stock:
-                        stocks.append(stock)
-                except (ValueError, TypeError) as e:
-                    print(f"Error parsing stock data: {e}")
-                    continue
-                    
-            return stocks
+            return self._parse_stock_list_response(content)
             
         except Exception as e:
             raise Exception(f"Failed to get stock list: {str(e)}")
 
+    def _parse_stock_list_response(self, content: bytes) -> List[Stock]:
+        """
+        Sayfalı stok listesinin ham yanıtını akış halinde Stock listesine dönüştürür.
+        Her StokKontrolDetay okunduğu anda dönüştürülür; ara sözlük ağacı kurulmaz.
+        Dönüştürülemeyen alanlar parse_errors'a kaydedilir.
+        
+        Args:
+            content: StokKontrolListesi ham SOAP yanıtı
+            
+        Returns:
+            List[Stock]: Stok listesi
+        """
+        return self._parse_stocks(content)
+
     def _parse_stock_data(self, data: dict) -> Optional[Stock]:
         """
         API'den gelen stok verisini Stock nesnesine dönüştürür.
+        Dönüştürülemeyen alanlar varsayılan değerde kalır ve parse_errors'a kaydedilir.
         
         Args:
             data (dict): API'den gelen ham veri
@@ -157,47 +262,7 @@ class StockService(BaseService):
         Returns:
             Optional[Stock]: Dönüştürülmüş Stock nesnesi
         """
-        try:
-            return Stock(
-                description=data.get('a:Aciklama'),
-                weight=float(data.get('a:Agirlik', 0)),
-                is_active=data.get('a:Aktif') == 'true',
-                barcode=data.get('a:Barkod'),
-                dimensions=StockDimensions(
-                    x=float(data.get('a:BoyX', 0)),
-                    y=float(data.get('a:BoyY', 0)),
-                    z=float(data.get('a:BoyZ', 0))
-                ),
-                desi=float(data.get('a:Desi', 0)),
-                status=data.get('a:Durum'),
-                warranty=StockWarranty(
-                    warranty_period=int(data.get('a:GarantiSuresi', 0)),
-                    warranty_company=data.get('a:GarantiVerenFirma')
-                ),
-                gtin=data.get('a:Gtin'),
-                price=StockPrice(
-                    price_discount=float(data.get('a:Iskonto', 0)),
-                    price_vat_rate=float(data.get('a:KDVOran', 0)),
-                    price_with_vat=float(data.get('a:KDVli', 0)),
-                    price_without_vat=float(data.get('a:KDVsiz', 0))
-                ),
-                cargo_profile_id=int(data.get('a:KargoProfilId', 0)),
-                is_available=data.get('a:Mevcut') == 'true',
-                quantity=int(data.get('a:Miktar', 0)),
-                shop_id=int(data.get('a:ShopId', 0)),
-                is_single_box=data.get('a:SingleBox') == 'true',
-                product=StockProduct(
-                    product_name=data.get('a:UrunAdi'),
-                    product_id=int(data.get('a:UrunId', 0)),
-                    product_code=data.get('a:UrunKodu'),
-                    product_url=data.get('a:UrunUrl'),
-                    product_long_description=data.get('a:UzunAciklama')
-                ),
-                category_id=int(data.get('a:YeniKategoriId', 0))
-            )
-        except (ValueError, TypeError) as e:
-            print(f"Error parsing stock data: {e}")
-            return None
+        return convert_stock_record(data, self.parse_errors)
 
     def update_stock_price(self, update_data: StockPriceUpdate) -> bool:
         """
@@ -207,50 +272,86 @@ class StockService(BaseService):
             update_data: Güncellenecek stok ve fiyat bilgileri
             
         Returns:
-            bool: Güncelleme başarılı ise True
+            bool: Güncelleme başarılı ise True (son gönderilenle aynı yük atlanırsa da True)
         """
-        try:
-            # Varyant listesini hazırla
-            variants_xml = ""
-            if update_data.variants:
-                for variant in update_data.variants:
-                    attrs_xml = ""
-                    for attr in variant.attributes:
-                        attrs_xml += f"""
-                        <ept:VariantAttr>
-                            <ept:Deger>{attr.value}</ept:Deger>
-                            <ept:Fiyat>{attr.price}</ept:Fiyat>
-                            <ept:FiyatFarkiMi>{str(attr.is_price_difference).lower()}</ept:FiyatFarkiMi>
-                            <ept:Tanim>{attr.name}</ept:Tanim>
-                        </ept:VariantAttr>"""
+        # İstek gövdesini oluştur
+        params = self._stock_price_params(update_data)
+        digest = None
+        if self.fingerprints is not None:
+            item = serialize_fields(params["item"])
+            digest = payload_digest(item)
+            if self.fingerprints.is_unchanged(update_data.barcode, "stock", digest):
+                return True
+            params = {"item": item}
 
-                    variants_xml += f"""
-                    <ept:Variant>
-                        <ept:AnaUrunKodu>{variant.main_barcode}</ept:AnaUrunKodu>
-                        <ept:Attributes>{attrs_xml}</ept:Attributes>
-                        <ept:Miktar>{variant.quantity}</ept:Miktar>
-                        <ept:VariantBarkod>{variant.variant_barcode}</ept:VariantBarkod>
-                    </ept:Variant>"""
-
-            # İstek gövdesini oluştur
+        success = False
+        try:
             response = self.call_service(
                 operation="StokFiyatGuncelle3",
-                params={
-                    "item": {
-                        "Aktif": str(update_data.is_active).lower(),
-                        "Barkod": update_data.barcode,
-                        "Iskonto": update_data.discount,
-                        "KDVOran": update_data.vat_rate,
-                        "KDVli": update_data.price_with_vat,
-                        "KDVsiz": update_data.price_without_vat,
-                        "Miktar": update_data.quantity,
-                        "YeniKategoriId": update_data.category_id,
-                        "VariantListesi": variants_xml if update_data.variants else None
-                    }
-                }
+                params=params
             )
             
-            return True if response else False
+            success = True if response else False
+            return success
             
         except Exception as e:
-            raise Exception(f"Failed to update stock price: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to update stock price: {str(e)}")
+        finally:
+            self._invalidate_barcodes(
+                [update_data.barcode] + [v.variant_barcode for v in update_data.variants or []]
+            )
+            self._remember_payload(update_data.barcode, "stock", digest, success)
+
+    def update_stock_price_bulk(
+        self,
+        update_data_list: Iterable[StockPriceUpdate],
+        max_workers: int = 4
+    ) -> List[StockPriceUpdateResult]:
+        """
+        Birden fazla ürünün stok ve fiyat bilgilerini günceller.
+        StokFiyatGuncelle3 tek ürün kabul ettiğinden her ürün ayrı bir istekle,
+        sınırlı sayıda worker ile eşzamanlı gönderilir. Bir ürünün hatası
+        diğerlerini durdurmaz.
+        
+        Args:
+            update_data_list: Güncellenecek stok ve fiyat bilgileri
+            max_workers: Aynı anda gönderilecek en fazla istek sayısı
+            
+        Returns:
+            List[StockPriceUpdateResult]: Giriş sırasına göre barkod bazında sonuçlar
+        """
+        results = []
+        for update_data, success, error in map_bounded(
+            self.update_stock_price, update_data_list, max_workers
+        ):
+            results.append(StockPriceUpdateResult(
+                barcode=update_data.barcode,
+                success=bool(success) and error is None,
+                error=str(error) if error else None
+            ))
+            
+        return results
+
+    def _stock_price_params(self, update_data: StockPriceUpdate) -> dict:
+        """
+        StokFiyatGuncelle3 isteğinin parametrelerini hazırlar.
+        
+        Args:
+            update_data: Güncellenecek stok ve fiyat bilgileri
+            
+        Returns:
+            dict: SOAP parametreleri
+        """
+        return {
+            "item": {
+                "Aktif": update_data.is_active,
+                "Barkod": update_data.barcode,
+                "Iskonto": update_data.discount,
+                "KDVOran": update_data.vat_rate,
+                "KDVli": update_data.price_with_vat,
+                "KDVsiz": update_data.price_without_vat,
+                "Miktar": update_data.quantity,
+                "YeniKategoriId": update_data.category_id,
+                "VariantListesi": serialize_list(write_variants, update_data.variants)
+            }
+        }
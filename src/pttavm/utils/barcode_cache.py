@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+from ..models.barcode import BarcodeCheckResult
+
+class BarcodeCache:
+    """
+    Thread-safe LRU cache of barcode check results with expiry.
+
+    Positive results ("barcode exists") live for ``ttl`` seconds; negative
+    results are kept for the shorter ``negative_ttl`` since a missing
+    barcode can appear as soon as the product is created. Entries are
+    keyed by the stripped barcode.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 600.0, negative_ttl: float = 60.0):
+        """
+        Args:
+            max_size: Maximum number of cached barcodes
+            ttl: Seconds a positive result stays valid
+            negative_ttl: Seconds a negative result stays valid
+        """
+        if max_size < 1:
+            raise ValueError("Cache size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, barcode: str) -> Optional[BarcodeCheckResult]:
+        """Cached result for a barcode, or None if missing or expired"""
+        key = barcode.strip()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires_at = entry
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, result: BarcodeCheckResult):
+        """Store a check result, evicting the least recently used entry when full"""
+        key = result.barcode.strip()
+        ttl = self.ttl if result.exists else self.negative_ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (result, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, barcodes: Iterable[str]):
+        """Drop cached results, e.g. after the barcodes were written"""
+        with self._lock:
+            for barcode in barcodes:
+                if barcode and self._entries.pop(barcode.strip(), None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and invalidation counters and the current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,117 @@
+from operator import attrgetter
+from typing import Dict, Iterable, List, Tuple, Union
+from ..models.stock import Stock
+from ..models.stock_table import StockTable
+from ..models.variant import StockPriceUpdate
+from ..models.product_update import ProductUpdateV2
+from ..models.sync import FieldChange, SyncPlan
+
+CatalogItem = Union[StockPriceUpdate, ProductUpdateV2]
+
+# Compared field -> (Stock attribute path, StockTable column, update attribute)
+SYNC_FIELDS = (
+    ('price_without_vat', 'price.price_without_vat', 'price_without_vat', 'price_without_vat'),
+    ('price_with_vat', 'price.price_with_vat', 'price_with_vat', 'price_with_vat'),
+    ('vat_rate', 'price.price_vat_rate', 'price_vat_rate', 'vat_rate'),
+    ('discount', 'price.price_discount', 'price_discount', 'discount'),
+    ('quantity', 'quantity', 'quantity', 'quantity'),
+    ('is_active', 'is_active', 'is_active', 'is_active'),
+    ('category_id', 'category_id', 'category_id', 'category_id'),
+)
+
+FLOAT_FIELDS = frozenset({'price_without_vat', 'price_with_vat', 'vat_rate', 'discount'})
+
+# A zero on these update fields means "not given": KDVli is calculated by
+# the API and YeniKategoriId keeps the current category
+UNSET_WHEN_ZERO = frozenset({'price_with_vat', 'category_id'})
+
+_STOCK_GETTER = attrgetter(*(path for _, path, _, _ in SYNC_FIELDS))
+_UPDATE_GETTER = attrgetter(*(attr for _, _, _, attr in SYNC_FIELDS))
+
+def snapshot_index(snapshot: Union[Iterable[Stock], StockTable]) -> Dict[str, Tuple]:
+    """
+    Index the compared fields of a stock snapshot by barcode
+
+    Args:
+        snapshot: Result of ``get_all_stocks`` (list of Stock or StockTable)
+
+    Returns:
+        Dict[str, Tuple]: Barcode -> values in SYNC_FIELDS order
+    """
+    if isinstance(snapshot, StockTable):
+        columns = [snapshot.column(column) for _, _, column, _ in SYNC_FIELDS]
+        rows = zip(snapshot.column('barcode'), zip(*columns))
+        return {barcode: values for barcode, values in rows if barcode}
+    return {stock.barcode: _STOCK_GETTER(stock) for stock in snapshot if stock.barcode}
+
+def diff_item(item: CatalogItem, current: Tuple, price_tolerance: float = 0.005) -> List[FieldChange]:
+    """
+    Compare a desired item against the snapshot values of its barcode
+
+    Returns:
+        List[FieldChange]: Fields whose desired value differs
+    """
+    changes = []
+    for (name, _, _, _), current_value, desired in zip(SYNC_FIELDS, current, _UPDATE_GETTER(item)):
+        if name in UNSET_WHEN_ZERO and not desired:
+            continue
+        if name in FLOAT_FIELDS:
+            differs = abs(float(current_value) - float(desired)) > price_tolerance
+        elif name == 'is_active':
+            differs = bool(current_value) != bool(desired)
+        else:
+            differs = current_value != desired
+        if differs:
+            changes.append(FieldChange(
+                barcode=item.barcode, field=name,
+                current=current_value, desired=desired
+            ))
+    return changes
+
+def plan_sync(
+    desired: Iterable[CatalogItem],
+    snapshot: Union[Iterable[Stock], StockTable],
+    include_missing: bool = True,
+    price_tolerance: float = 0.005
+) -> SyncPlan:
+    """
+    Work out the minimal set of writes that brings the catalog to ``desired``.
+
+    Items are matched to the snapshot by barcode and only sent when one of
+    the SYNC_FIELDS differs; later items win over earlier ones for the same
+    barcode.
+
+    Args:
+        desired: StockPriceUpdate / ProductUpdateV2 items describing the target state
+        snapshot: Current stock list as returned by ``get_all_stocks``
+        include_missing: Send items whose barcode is not in the snapshot
+        price_tolerance: Largest price difference treated as equal
+
+    Returns:
+        SyncPlan: Updates to send and the per-field changes behind them
+    """
+    current = snapshot_index(snapshot)
+    items: Dict[str, CatalogItem] = {}
+    for item in desired:
+        items[item.barcode] = item
+
+    plan = SyncPlan()
+    for barcode, item in items.items():
+        values = current.get(barcode)
+        if values is None:
+            plan.missing.append(barcode)
+            if not include_missing:
+                continue
+        else:
+            changes = diff_item(item, values, price_tolerance)
+            if not changes:
+                plan.unchanged.append(barcode)
+                continue
+            plan.changes.extend(changes)
+
+        if isinstance(item, ProductUpdateV2):
+            plan.product_updates.append(item)
+        else:
+            plan.stock_updates.append(item)
+
+    return plan
@@ -0,0 +1,246 @@
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Set, Tuple
+from ..models.category import Category
+from ..models.category_tree import CategoryMatch, CategoryTree
+
+# Turkish dotted/dotless i must be mapped before lower(): 'I'.lower() is
+# 'i' and 'İ'.lower() is 'i' followed by a combining dot
+_TURKISH_UPPER = str.maketrans({'İ': 'i', 'I': 'ı'})
+
+# Supplier feeds often drop Turkish letters ('Ayakkabi', 'Canta'), so
+# folded text is compared without them
+_ASCII_FOLD = str.maketrans('ıöüşğçâîû', 'iousgcaiu')
+
+_TOKEN = re.compile(r'\w+')
+
+# Weight of a token found in an ancestor's name, relative to the category's own name
+PATH_WEIGHT = 0.5
+
+# Match quality of a query token found exactly, as a prefix or fuzzily
+PREFIX_QUALITY = 0.8
+FUZZY_QUALITY = 0.7
+
+# Memoized resolve() results are dropped once this many are stored
+RESOLVE_CACHE_SIZE = 100000
+
+def fold(text: str) -> str:
+    """Turkish-aware case fold: 'İSTANBUL', 'istanbul' and 'Istanbul' fold alike"""
+    return text.translate(_TURKISH_UPPER).lower().translate(_ASCII_FOLD)
+
+def tokenize(text: str) -> List[str]:
+    """Folded word tokens of a text"""
+    return _TOKEN.findall(fold(text))
+
+def _trigrams(token: str) -> Set[str]:
+    padded = f" {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class CategoryIndex:
+    """
+    In-memory search index over category names and full paths.
+
+    Built once from a CategoryTree. Names and paths are Turkish case
+    folded and tokenized into an inverted index (name token -> category
+    ids) with IDF scoring; ancestor tokens are kept per category. Tokens
+    are kept sorted for prefix lookup, and a trigram index over the
+    vocabulary drives fuzzy lookup, so no query scans all categories.
+    """
+
+    def __init__(self, tree: CategoryTree, include_root: bool = False):
+        """
+        Args:
+            tree: Category tree to index
+            include_root: Index the root category and keep it in paths
+        """
+        self.tree = tree
+        self.paths: Dict[str, str] = {}
+        self._names: Dict[str, List[str]] = defaultdict(list)
+        self._full_paths: Dict[str, str] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._ancestor_tokens: Dict[str, frozenset] = {}
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._resolved: Dict[tuple, Optional[CategoryMatch]] = {}
+
+        for category in tree:
+            if category.id == tree.root_id and not include_root:
+                continue
+            chain = tree.parent_chain(category.id)
+            if not include_root and chain and chain[0].id == tree.root_id:
+                chain = chain[1:]
+            path = " > ".join(c.name for c in chain)
+            self.paths[category.id] = path
+            self._names[' '.join(tokenize(category.name))].append(category.id)
+            self._full_paths[' '.join(tokenize(path))] = category.id
+
+            self._ancestor_tokens[category.id] = frozenset(
+                token for ancestor in chain[:-1] for token in tokenize(ancestor.name)
+            )
+            for token in tokenize(category.name):
+                self._postings[token].add(category.id)
+
+        count = max(1, len(self.paths))
+        self._idf = {
+            token: math.log(1 + count / len(ids)) for token, ids in self._postings.items()
+        }
+        self._vocabulary = sorted(self._postings)
+        for token in self._vocabulary:
+            for trigram in _trigrams(token):
+                self._trigrams[trigram].add(token)
+
+        # Folded names sorted for name prefix lookup
+        self._sorted_names: List[Tuple[str, str]] = sorted(
+            (name, category_id) for name, ids in self._names.items() for category_id in ids
+        )
+
+    def _match(self, category_id: str, score: float) -> CategoryMatch:
+        return CategoryMatch(
+            category=self.tree.get(category_id),
+            score=round(score, 4),
+            path=self.paths[category_id]
+        )
+
+    def lookup(self, text: str) -> List[Category]:
+        """Categories whose name or full path equals the text (after folding)"""
+        key = ' '.join(tokenize(text))
+        category_id = self._full_paths.get(key)
+        if category_id is not None:
+            return [self.tree.get(category_id)]
+        return [self.tree.get(i) for i in self._names.get(key, [])]
+
+    def prefix(self, text: str, limit: int = 10) -> List[Category]:
+        """Categories whose name starts with the text, in name order"""
+        key = ' '.join(tokenize(text))
+        if not key:
+            return []
+        results = []
+        names = self._sorted_names
+        for index in range(bisect_left(names, (key, '')), len(names)):
+            name, category_id = names[index]
+            if not name.startswith(key) or len(results) >= limit:
+                break
+            results.append(self.tree.get(category_id))
+        return results
+
+    def _prefix_tokens(self, token: str, limit: int = 50) -> List[str]:
+        vocabulary = self._vocabulary
+        tokens = []
+        for index in range(bisect_left(vocabulary, token), len(vocabulary)):
+            candidate = vocabulary[index]
+            if not candidate.startswith(token) or len(tokens) >= limit:
+                break
+            tokens.append(candidate)
+        return tokens
+
+    def _fuzzy_tokens(self, token: str, cutoff: float, limit: int = 5) -> List[Tuple[str, float]]:
+        trigrams = _trigrams(token)
+        shared: Dict[str, int] = defaultdict(int)
+        for trigram in trigrams:
+            for candidate in self._trigrams.get(trigram, ()):
+                shared[candidate] += 1
+
+        # Only tokens sharing enough trigrams are compared character by character
+        minimum = max(1, len(trigrams) // 2)
+        matches = []
+        for candidate, count in shared.items():
+            if count < minimum:
+                continue
+            matcher = SequenceMatcher(None, token, candidate)
+            if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= cutoff:
+                matches.append((candidate, ratio))
+        matches.sort(key=lambda match: -match[1])
+        return matches[:limit]
+
+    def _token_matches(self, token: str, fuzzy: bool, cutoff: float) -> List[Tuple[str, float]]:
+        """Index tokens a query token stands for, with their match quality"""
+        if token in self._postings:
+            return [(token, 1.0)]
+        matches = [(candidate, PREFIX_QUALITY) for candidate in self._prefix_tokens(token)]
+        if not matches and fuzzy:
+            matches = [(candidate, FUZZY_QUALITY * ratio) for candidate, ratio in self._fuzzy_tokens(token, cutoff)]
+        return matches
+
+    def search(self, text: str, limit: int = 10, fuzzy: bool = True, cutoff: float = 0.75) -> List[CategoryMatch]:
+        """
+        Rank categories for a free-text or path query
+
+        Each query token is matched exactly, else as a prefix of an index
+        token, else fuzzily. Tokens in the category's own name weigh more
+        than tokens of its ancestors.
+
+        Args:
+            text: Query, e.g. a supplier category 'Elektronik/Cep Telefonları'
+            limit: Maximum number of matches
+            fuzzy: Allow misspelled tokens
+            cutoff: Minimum similarity (0-1) of a fuzzy token match
+
+        Returns:
+            List[CategoryMatch]: Best matches first; score is 0-1 relative to the query
+        """
+        tokens = list(dict.fromkeys(tokenize(text)))
+        if not tokens:
+            return []
+
+        # Candidates come from name postings only; ancestor tokens are then
+        # checked per candidate, so broad parents do not flood the scoring
+        total = 0.0
+        token_matches = []
+        candidates: Dict[str, List[float]] = {}
+        for position, token in enumerate(tokens):
+            matches = [(candidate, self._idf[candidate] * quality) for candidate, quality in self._token_matches(token, fuzzy, cutoff)]
+            total += max((self._idf[candidate] for candidate, _ in matches), default=1.0)
+            token_matches.append(matches)
+            for candidate, value in matches:
+                for category_id in self._postings.get(candidate, ()):
+                    values = candidates.get(category_id)
+                    if values is None:
+                        values = candidates[category_id] = [0.0] * len(tokens)
+                    if value > values[position]:
+                        values[position] = value
+
+        scores = []
+        for category_id, values in candidates.items():
+            ancestors = self._ancestor_tokens[category_id]
+            if ancestors:
+                for position, matches in enumerate(token_matches):
+                    for candidate, value in matches:
+                        value *= PATH_WEIGHT
+                        if value > values[position] and candidate in ancestors:
+                            values[position] = value
+            scores.append((sum(values), category_id))
+
+        ranked = heapq.nlargest(limit, scores, key=lambda item: (item[0], -len(self.paths[item[1]])))
+        return [self._match(category_id, score / total) for score, category_id in ranked]
+
+    def resolve(self, text: str, min_score: float = 0.5) -> Optional[CategoryMatch]:
+        """
+        Best category for a supplier category string, or None
+
+        Exact name/path matches win; otherwise the top search result is
+        used when it scores at least ``min_score``. Results are memoized
+        per input string since feeds repeat the same categories.
+        """
+        key = (text, min_score)
+        if key in self._resolved:
+            return self._resolved[key]
+
+        exact = self.lookup(text)
+        if len(exact) == 1:
+            match = self._match(exact[0].id, 1.0)
+        else:
+            matches = self.search(text, limit=1)
+            match = matches[0] if matches and matches[0].score >= min_score else None
+        if len(self._resolved) >= RESOLVE_CACHE_SIZE:
+            self._resolved.clear()
+        self._resolved[key] = match
+        return match
+
+    def __len__(self) -> int:
+        return len(self.paths)
@@ -0,0 +1,92 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Awaitable, Callable, Iterable, Iterator, List, Optional, Tuple
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most ``size`` items, lazily"""
+    if size < 1:
+        raise ValueError("Chunk size must be positive")
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _outcome(func: Callable, item) -> Tuple[Any, Optional[Exception]]:
+    try:
+        return func(item), None
+    except Exception as e:
+        return None, e
+
+def map_bounded(
+    func: Callable,
+    items: Iterable,
+    max_workers: int = 4
+) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+    """
+    Apply ``func`` to items on a bounded thread pool, in input order.
+
+    The input is consumed lazily: at most ``max_workers`` calls are in
+    flight at a time. Exceptions do not stop the other calls; they are
+    returned next to their item.
+
+    Args:
+        func: Function called with each item
+        items: Items to process
+        max_workers: Maximum number of concurrent calls
+
+    Yields:
+        Tuple of (item, result, exception); result is None on failure
+    """
+    if max_workers <= 1:
+        for item in items:
+            result, error = _outcome(func, item)
+            yield item, result, error
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(_outcome, func, item)))
+            if len(pending) >= max_workers:
+                done_item, future = pending.popleft()
+                yield (done_item,) + future.result()
+        while pending:
+            done_item, future = pending.popleft()
+            yield (done_item,) + future.result()
+
+async def map_bounded_async(
+    func: Callable[[Any], Awaitable],
+    items: Iterable,
+    max_concurrency: int = 10
+) -> List[Tuple[Any, Any, Optional[Exception]]]:
+    """
+    Await ``func`` for items with a fixed number of workers, in input order.
+
+    Async counterpart of ``map_bounded``: ``max_concurrency`` workers pull
+    items from the shared iterator, so the input is consumed lazily and
+    no coroutine is created before a worker is free to run it.
+
+    Args:
+        func: Coroutine function called with each item
+        items: Items to process
+        max_concurrency: Maximum number of concurrent calls
+
+    Returns:
+        List of (item, result, exception); result is None on failure
+    """
+    iterator = enumerate(items)
+    outcomes = {}
+
+    async def worker():
+        for index, item in iterator:
+            try:
+                outcomes[index] = (item, await func(item), None)
+            except Exception as e:
+                outcomes[index] = (item, None, e)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, max_concurrency))))
+    return [outcomes[index] for index in range(len(outcomes))]
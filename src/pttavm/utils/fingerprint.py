@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+import time
+from hashlib import blake2b
+from typing import Dict, Iterable, Optional
+
+def payload_digest(payload: bytes) -> str:
+    """Short hash of a serialized request payload"""
+    return blake2b(payload, digest_size=16).hexdigest()
+
+class PayloadFingerprints:
+    """
+    Thread-safe record of the last payload successfully sent per barcode.
+
+    Each barcode keeps a single ``(kind, digest)`` entry, so a product
+    update also replaces the fingerprint of an earlier stock update and
+    vice versa. A write whose payload matches the entry can be skipped.
+
+    Only writes made through this client are seen; changes made elsewhere
+    (panel, other integrations, activation by product id) are not. Use
+    ``ttl`` to bound how long a fingerprint is trusted, or ``forget``.
+
+    With a ``path`` the fingerprints are loaded from and saved to a JSON
+    file, so skipping survives restarts.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            path: JSON file to load from and ``save`` to
+            ttl: Seconds a fingerprint stays valid (None: no expiry)
+        """
+        self.path = path
+        self.ttl = ttl
+        self.checked = 0
+        self.skipped = 0
+        self.recorded = 0
+        self._entries: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def is_unchanged(self, barcode: str, kind: str, digest: str) -> bool:
+        """Whether ``digest`` matches the last payload sent for the barcode"""
+        with self._lock:
+            self.checked += 1
+            entry = self._entries.get(barcode)
+            if entry is None or entry[0] != kind or entry[1] != digest:
+                return False
+            if self.ttl is not None and time.time() - entry[2] >= self.ttl:
+                del self._entries[barcode]
+                return False
+            self.skipped += 1
+            return True
+
+    def record(self, barcode: str, kind: str, digest: str):
+        """Remember a payload the API accepted"""
+        with self._lock:
+            self._entries[barcode] = [kind, digest, time.time()]
+            self.recorded += 1
+
+    def forget(self, barcodes: Iterable[str]):
+        """Drop fingerprints, e.g. after a failed or unknown write"""
+        with self._lock:
+            for barcode in barcodes:
+                self._entries.pop(barcode, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def load(self, path: str):
+        """Replace the fingerprints with the contents of a JSON file"""
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+        with self._lock:
+            self._entries = entries
+
+    def save(self, path: Optional[str] = None):
+        """Write the fingerprints to a JSON file (atomically replaced)"""
+        path = path or self.path
+        if path is None:
+            raise ValueError("No fingerprint file given")
+        with self._lock:
+            data = json.dumps(self._entries, separators=(",", ":"))
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def stats(self) -> Dict[str, int]:
+        """Checked, skipped and recorded payload counters and the current size"""
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "skipped": self.skipped,
+                "recorded": self.recorded,
+                "size": len(self._entries),
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,437 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import MISSING, asdict, fields
+from datetime import datetime
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple, Union
+from ..models.variant import StockPriceUpdate, StockUpdateError, Variant, VariantAttribute
+from ..models.product_update import ProductUpdateV2, ProductImage, ProductPart
+from .retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+OutboxItem = Union[StockPriceUpdate, ProductUpdateV2]
+
+STOCK = "stock"
+PRODUCT = "product"
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+SUPERSEDED = "superseded"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    barcode TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (status, next_attempt_at, id);
+CREATE INDEX IF NOT EXISTS outbox_barcode ON outbox (kind, barcode, status);
+"""
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot store {type(value).__name__} in the outbox")
+
+def encode_item(item: OutboxItem) -> str:
+    """JSON payload of an update"""
+    return json.dumps(asdict(item), default=_json_default, ensure_ascii=False, separators=(",", ":"))
+
+def _restore(cls, data: dict):
+    """
+    Rebuild an update that was validated when it was enqueued
+
+    ``__post_init__`` is not run again since it is not idempotent (the
+    discount is applied to the price). Unknown keys are dropped and fields
+    added since the item was stored get their defaults.
+    """
+    item = cls.__new__(cls)
+    for f in fields(cls):
+        if f.name in data:
+            value = data[f.name]
+        elif f.default is not MISSING:
+            value = f.default
+        elif f.default_factory is not MISSING:
+            value = f.default_factory()
+        else:
+            raise StockUpdateError(f"Outbox payload has no {f.name}")
+        setattr(item, f.name, value)
+    return item
+
+def _variants(data: Optional[List[dict]]) -> Optional[List[Variant]]:
+    if data is None:
+        return None
+    return [
+        Variant(**{**variant, "attributes": [VariantAttribute(**a) for a in variant["attributes"]]})
+        for variant in data
+    ]
+
+def _datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+def decode_item(kind: str, payload: str) -> OutboxItem:
+    """
+    Update stored by ``encode_item``
+
+    Raises:
+        StockUpdateError: If the payload cannot be rebuilt
+    """
+    data = json.loads(payload)
+    data["variants"] = _variants(data.get("variants"))
+    if kind == STOCK:
+        return _restore(StockPriceUpdate, data)
+    if kind == PRODUCT:
+        if "dimensions" in data:
+            data["dimensions"] = tuple(data["dimensions"])
+        data["parts"] = [ProductPart(**part) for part in data.get("parts") or []]
+        data["product_images"] = [ProductImage(**image) for image in data.get("product_images") or []]
+        data["sale_start_date"] = _datetime(data.get("sale_start_date"))
+        data["sale_end_date"] = _datetime(data.get("sale_end_date"))
+        return _restore(ProductUpdateV2, data)
+    raise StockUpdateError(f"Unsupported outbox item kind: {kind}")
+
+class UpdateOutbox:
+    """
+    Durable outbox for stock/price and product writes, backed by SQLite.
+
+    Every enqueued update is committed to disk before it is sent. ``drain``
+    sends due items in id order and marks them ``done`` once the API has
+    accepted them; failed items are retried with backoff until the retry
+    policy gives up. After a crash, only items that were never marked done
+    are sent again.
+
+    Within a batch only the newest update per barcode is sent; older ones
+    are marked ``superseded``. A successful write also supersedes older
+    pending items of the same barcode so a late retry never overwrites
+    newer data.
+
+    Payloads are stored as JSON. An item whose payload can no longer be
+    rebuilt is marked ``failed`` instead of blocking the queue. Errors of
+    the background worker are logged to the ``pttavm.utils.outbox`` logger.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        stock_service,
+        product_service,
+        batch_size: int = 100,
+        max_workers: int = 4,
+        retry_policy: Optional[RetryPolicy] = None,
+        poll_interval: float = 1.0
+    ):
+        """
+        Args:
+            path: SQLite database file
+            stock_service: StockService used for StockPriceUpdate items
+            product_service: ProductService used for ProductUpdateV2 items
+            batch_size: Items read and sent per drain round
+            max_workers: Concurrent requests per batch
+            retry_policy: Attempts and backoff per item (default 5 attempts)
+            poll_interval: Seconds the background worker sleeps when idle
+        """
+        self.path = path
+        self.stock_service = stock_service
+        self.product_service = product_service
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=5, backoff_base=1.0, backoff_max=300.0)
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._connection.commit()
+
+    def enqueue(self, item: OutboxItem) -> int:
+        """
+        Persist an update for sending
+
+        Returns:
+            int: Outbox item id
+
+        Raises:
+            StockUpdateError: If the item type is not supported
+        """
+        return self.enqueue_many([item])[0]
+
+    def enqueue_many(self, items: List[OutboxItem]) -> List[int]:
+        """Persist several updates in a single transaction"""
+        now = time.time()
+        rows = [(self._kind(item), item.barcode, encode_item(item), now, now) for item in items]
+        with self._lock:
+            with self._connection:
+                ids = []
+                for row in rows:
+                    cursor = self._connection.execute(
+                        "INSERT INTO outbox (kind, barcode, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                        row
+                    )
+                    ids.append(cursor.lastrowid)
+        return ids
+
+    def send(self, items: List[OutboxItem]) -> List[Tuple[str, Optional[str]]]:
+        """
+        Persist updates, drain the queue and report on them
+
+        Items that failed but have attempts left stay ``pending`` and are
+        sent again by a later ``drain`` or the background worker.
+
+        Returns:
+            List[Tuple[str, Optional[str]]]: (status, last error) per item, in input order
+        """
+        ids = self.enqueue_many(items)
+        self.drain()
+        return self.statuses(ids)
+
+    def statuses(self, ids: List[int]) -> List[Tuple[str, Optional[str]]]:
+        """(status, last error) of items, in the order of ``ids``"""
+        found: Dict[int, Tuple[str, Optional[str]]] = {}
+        # SQLite limits the number of bound parameters per statement
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            with self._lock:
+                rows = self._connection.execute(
+                    f"SELECT id, status, last_error FROM outbox WHERE id IN ({', '.join('?' * len(chunk))})",
+                    tuple(chunk)
+                ).fetchall()
+            found.update((row[0], (row[1], row[2])) for row in rows)
+        return [found.get(item_id, (DONE, None)) for item_id in ids]
+
+    @staticmethod
+    def _kind(item: OutboxItem) -> str:
+        if isinstance(item, StockPriceUpdate):
+            return STOCK
+        if isinstance(item, ProductUpdateV2):
+            return PRODUCT
+        raise StockUpdateError(f"Unsupported outbox item: {type(item).__name__}")
+
+    def drain(self, max_batches: Optional[int] = None) -> Dict[str, int]:
+        """
+        Send due pending items in batches until none are left
+
+        Args:
+            max_batches: Stop after this many batches
+
+        Returns:
+            Dict[str, int]: Number of items sent, superseded, retried and failed
+        """
+        totals = dict.fromkeys((DONE, SUPERSEDED, "retried", FAILED), 0)
+        batches = 0
+        with self._drain_lock:
+            while max_batches is None or batches < max_batches:
+                rows = self._due_rows()
+                if not rows:
+                    break
+                for key, count in self._send_batch(rows).items():
+                    totals[key] += count
+                batches += 1
+        return totals
+
+    def _due_rows(self) -> List[Tuple[int, str, str, str, int]]:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT id, kind, barcode, payload, attempts FROM outbox "
+                "WHERE status = ? AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (PENDING, time.time(), self.batch_size)
+            ).fetchall()
+
+    def _send_batch(self, rows) -> Dict[str, int]:
+        counts = dict.fromkeys((DONE, SUPERSEDED, "retried", FAILED), 0)
+        # Runs of the same kind are sent in id order, so a product update
+        # queued before a stock update is applied first
+        for kind, run in groupby(rows, key=lambda row: row[1]):
+            latest: Dict[str, tuple] = {}
+            superseded = []
+            for row in run:
+                previous = latest.get(row[2])
+                if previous is not None:
+                    superseded.append(previous[0])
+                latest[row[2]] = row
+            if superseded:
+                self._mark(superseded, SUPERSEDED)
+                counts[SUPERSEDED] += len(superseded)
+
+            selected, items = [], []
+            for row in latest.values():
+                try:
+                    items.append(decode_item(kind, row[3]))
+                except Exception as e:
+                    self._fail(row, f"Unreadable payload: {e}")
+                    counts[FAILED] += 1
+                    continue
+                selected.append(row)
+            if not selected:
+                continue
+
+            outcomes = self._send(kind, items)
+            for row, error in zip(selected, outcomes):
+                if error is None:
+                    self._complete(row)
+                    counts[DONE] += 1
+                elif self._retry_later(row, error):
+                    counts["retried"] += 1
+                else:
+                    counts[FAILED] += 1
+        return counts
+
+    def _send(self, kind: str, items: List[OutboxItem]) -> List[Optional[str]]:
+        """Send items of one kind; returns an error message or None per item"""
+        if kind == STOCK:
+            results = self.stock_service.update_stock_price_bulk(items, max_workers=self.max_workers)
+            return [None if result.success else (result.error or "Update rejected") for result in results]
+
+        # Barcodes are unique within a run; skipped products count as sent
+        report = self.product_service.update_products_v2_chunked(items, max_workers=self.max_workers)
+        errors = {
+            barcode: chunk.error or "Update rejected"
+            for chunk in report.chunks if not chunk.success
+            for barcode in chunk.barcodes
+        }
+        return [errors.get(item.barcode) for item in items]
+
+    def _complete(self, row):
+        item_id, kind, barcode = row[0], row[1], row[2]
+        now = time.time()
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = NULL, updated_at = ? WHERE id = ?",
+                    (DONE, now, item_id)
+                )
+                self._connection.execute(
+                    "UPDATE outbox SET status = ?, updated_at = ? "
+                    "WHERE kind = ? AND barcode = ? AND status = ? AND id < ?",
+                    (SUPERSEDED, now, kind, barcode, PENDING, item_id)
+                )
+
+    def _retry_later(self, row, error: str) -> bool:
+        """Schedule another attempt; returns False once the item has failed for good"""
+        item_id, attempts = row[0], row[4] + 1
+        now = time.time()
+        if attempts >= self.retry_policy.max_attempts:
+            status, next_attempt_at = FAILED, now
+        else:
+            status, next_attempt_at = PENDING, now + self.retry_policy.backoff(attempts)
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    (status, attempts, next_attempt_at, error, now, item_id)
+                )
+        return status == PENDING
+
+    def _fail(self, row, error: str):
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE outbox SET status = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                    (FAILED, error, time.time(), row[0])
+                )
+
+    def _mark(self, ids: List[int], status: str):
+        now = time.time()
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    "UPDATE outbox SET status = ?, updated_at = ? WHERE id = ?",
+                    [(status, now, item_id) for item_id in ids]
+                )
+
+    def retry_failed(self) -> int:
+        """Put failed items back in the queue; returns how many were reset"""
+        with self._lock:
+            with self._connection:
+                cursor = self._connection.execute(
+                    "UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = 0, updated_at = ? WHERE status = ?",
+                    (PENDING, time.time(), FAILED)
+                )
+        return cursor.rowcount
+
+    def failed_items(self) -> List[Dict[str, object]]:
+        """Items that ran out of attempts, with their last error"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, kind, barcode, attempts, last_error FROM outbox WHERE status = ? ORDER BY id",
+                (FAILED,)
+            ).fetchall()
+        return [
+            {"id": row[0], "kind": row[1], "barcode": row[2], "attempts": row[3], "error": row[4]}
+            for row in rows
+        ]
+
+    def purge(self, older_than: float = 0.0) -> int:
+        """Delete done and superseded items last updated more than ``older_than`` seconds ago"""
+        with self._lock:
+            with self._connection:
+                cursor = self._connection.execute(
+                    "DELETE FROM outbox WHERE status IN (?, ?) AND updated_at <= ?",
+                    (DONE, SUPERSEDED, time.time() - older_than)
+                )
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """Number of items per status"""
+        counts = dict.fromkeys((PENDING, DONE, FAILED, SUPERSEDED), 0)
+        with self._lock:
+            for status, count in self._connection.execute(
+                "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+            ):
+                counts[status] = count
+        return counts
+
+    def start(self):
+        """Start the background drain worker"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._run, name="UpdateOutbox", daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        """Stop the background worker after its current batch"""
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                totals = self.drain(max_batches=1)
+            except Exception:
+                logger.exception("Error draining outbox")
+                totals = {}
+            if not any(totals.values()):
+                self._stop.wait(self.poll_interval)
+
+    def close(self):
+        """Stop the worker and close the database"""
+        self.stop()
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
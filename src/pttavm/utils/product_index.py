@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+from ..models.stock import Stock
+
+class ProductIdIndex:
+    """
+    Thread-safe barcode -> (product_id, product_code) index.
+
+    Filled from every parsed stock page and single stock lookup, so
+    operations that need an ``UrunId`` (e.g. activation) can start from a
+    barcode without an extra ``StokKontrolListesi`` call. With a ``path``
+    the index is loaded from and saved to a JSON file.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: JSON file to load from and ``save`` to
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[int, Optional[str]]] = {}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def add_stocks(self, stocks: Iterable[Stock]):
+        """Index the product ids of parsed stocks"""
+        entries = [
+            (stock.barcode, (stock.product.product_id, stock.product.product_code))
+            for stock in stocks
+            if stock.barcode and stock.product is not None and stock.product.product_id
+        ]
+        if entries:
+            with self._lock:
+                self._entries.update(entries)
+
+    def put(self, barcode: str, product_id: int, product_code: Optional[str] = None):
+        with self._lock:
+            self._entries[barcode] = (product_id, product_code)
+
+    def get(self, barcode: str) -> Optional[Tuple[int, Optional[str]]]:
+        """(product_id, product_code) of a barcode, or None"""
+        with self._lock:
+            entry = self._entries.get(barcode)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def product_id(self, barcode: str) -> Optional[int]:
+        """Product id of a barcode, or None"""
+        entry = self.get(barcode)
+        return entry[0] if entry is not None else None
+
+    def forget(self, barcodes: Iterable[str]):
+        with self._lock:
+            for barcode in barcodes:
+                self._entries.pop(barcode, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def load(self, path: str):
+        """Merge the entries of a JSON file into the index"""
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+        with self._lock:
+            self._entries.update((barcode, tuple(entry)) for barcode, entry in entries.items())
+
+    def save(self, path: Optional[str] = None):
+        """Write the index to a JSON file (atomically replaced)"""
+        path = path or self.path
+        if path is None:
+            raise ValueError("No product index file given")
+        with self._lock:
+            data = json.dumps(self._entries, ensure_ascii=False, separators=(",", ":"))
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters and the current size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def __contains__(self, barcode: str) -> bool:
+        return barcode in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
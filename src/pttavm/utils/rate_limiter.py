@@ -0,0 +1,100 @@
+import threading
+import time
+from typing import Dict, Optional
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens are refilled continuously at ``rate`` per second up to ``burst``;
+    ``acquire`` blocks until enough tokens are available.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity, defaults to one second worth of tokens
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens, returning how long the caller has to wait for them"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Wait until ``tokens`` can be taken from the bucket
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+class RateLimiter:
+    """
+    Client-wide rate limiter shared by all services and threads.
+
+    A global bucket paces every call; optional per-operation buckets
+    (e.g. ``StokFiyatGuncelle3``, ``BarkodKontrol``) pace single operations
+    on top of it.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        operation_rates: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            rate: Maximum calls per second across all operations
+            burst: Capacity of the global bucket
+            operation_rates: Maximum calls per second per operation name
+        """
+        self._global = TokenBucket(rate, burst) if rate else None
+        self._operations = {
+            operation: TokenBucket(operation_rate)
+            for operation, operation_rate in (operation_rates or {}).items()
+        }
+        self._waited = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, operation: str) -> float:
+        """
+        Wait for a slot to call ``operation``
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        if self._global is not None:
+            waited += self._global.acquire()
+        bucket = self._operations.get(operation)
+        if bucket is not None:
+            waited += bucket.acquire()
+        if waited:
+            with self._lock:
+                self._waited += waited
+        return waited
+
+    @property
+    def total_wait(self) -> float:
+        """Total seconds callers have been throttled"""
+        return self._waited
@@ -0,0 +1,143 @@
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Tuple
+
+# Operations that only read data and are always safe to repeat
+READ_OPERATIONS = frozenset({
+    "StokKontrolListesi",
+    "BarkodKontrol",
+    "BarkodKontrolBulk",
+    "GetCategory",
+    "GetVersion",
+})
+
+# WCF answers every SOAP fault with HTTP 500
+_SOAP_FAULT = re.compile(rb'<(?:[\w.-]+:)?Fault[\s>]')
+
+def is_soap_fault(content: bytes) -> bool:
+    """Whether a response body is a SOAP fault, i.e. an answer of the service itself"""
+    return bool(content) and _SOAP_FAULT.search(content) is not None
+
+class CircuitOpenError(Exception):
+    """Raised without calling the API while the circuit breaker is open"""
+    pass
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry policy for SOAP calls.
+
+    Read operations are retried by default; write operations are only
+    retried when ``retry_writes`` is enabled, since a timed out write may
+    already have been applied on the server. A response with one of
+    ``retry_statuses`` is not retried when its body is a SOAP fault (e.g.
+    invalid data), since the same request would fail again.
+    """
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    jitter: bool = True
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    retry_writes: bool = False
+    read_operations: FrozenSet[str] = field(default=READ_OPERATIONS)
+
+    def attempts_for(self, operation: str) -> int:
+        """Number of attempts allowed for an operation"""
+        if operation in self.read_operations or self.retry_writes:
+            return max(1, self.max_attempts)
+        return 1
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """Whether an HTTP status is worth another attempt"""
+        return status_code in self.retry_statuses
+
+    def is_retryable_response(self, status_code: int, content: bytes) -> bool:
+        """Whether a response is worth another attempt; SOAP faults never are"""
+        return self.is_retryable_status(status_code) and not is_soap_fault(content)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Delay before the next attempt (exponential backoff, full jitter)
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1
+        """
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker shared by the services of a client.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast with ``CircuitOpenError``. Once ``reset_timeout``
+    seconds have passed a single trial call is let through; its outcome
+    closes the circuit again or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpenError if the call must not be made"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return
+            raise CircuitOpenError(
+                f"Circuit breaker is open after {self._failures} consecutive failures"
+            )
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+class RetryMetrics:
+    """Thread-safe per-operation counters of call attempts"""
+
+    FIELDS = ("calls", "attempts", "retries", "failures", "rejected")
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, operation: str, name: str, amount: int = 1):
+        with self._lock:
+            counters = self._counters.get(operation)
+            if counters is None:
+                counters = dict.fromkeys(self.FIELDS, 0)
+                self._counters[operation] = counters
+            counters[name] += amount
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Copy of the counters, keyed by operation"""
+        with self._lock:
+            return {operation: dict(counters) for operation, counters in self._counters.items()}
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
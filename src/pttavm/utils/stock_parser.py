@@ -0,0 +1,168 @@
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, BinaryIO, List, Optional
+from ..models.stock import (
+    Stock, StockWarranty, StockDimensions,
+    StockPrice, StockProduct, StockFieldError
+)
+
+STOCK_ELEMENT = "StokKontrolDetay"
+
+def _local_name(tag: str) -> str:
+    """Strip the ``{namespace}`` part of an element tag"""
+    return tag.rpartition('}')[2]
+
+def _text(value):
+    return value if isinstance(value, str) else None
+
+def _bool(value) -> bool:
+    return value == 'true'
+
+# SOAP tag -> (Stock field, converter, default), in Stock constructor order
+STOCK_FIELDS = (
+    ('Aciklama', 'description', _text, None),
+    ('Agirlik', 'weight', float, 0.0),
+    ('Aktif', 'is_active', _bool, False),
+    ('Barkod', 'barcode', _text, None),
+    ('BoyX', 'dimensions.x', float, 0.0),
+    ('BoyY', 'dimensions.y', float, 0.0),
+    ('BoyZ', 'dimensions.z', float, 0.0),
+    ('Desi', 'desi', float, 0.0),
+    ('Durum', 'status', _text, None),
+    ('GarantiSuresi', 'warranty.warranty_period', int, 0),
+    ('GarantiVerenFirma', 'warranty.warranty_company', _text, None),
+    ('Gtin', 'gtin', _text, None),
+    ('Iskonto', 'price.price_discount', float, 0.0),
+    ('KDVOran', 'price.price_vat_rate', float, 0.0),
+    ('KDVli', 'price.price_with_vat', float, 0.0),
+    ('KDVsiz', 'price.price_without_vat', float, 0.0),
+    ('KargoProfilId', 'cargo_profile_id', int, 0),
+    ('Mevcut', 'is_available', _bool, False),
+    ('Miktar', 'quantity', int, 0),
+    ('ShopId', 'shop_id', int, 0),
+    ('SingleBox', 'is_single_box', _bool, False),
+    ('UrunAdi', 'product.product_name', _text, None),
+    ('UrunId', 'product.product_id', int, 0),
+    ('UrunKodu', 'product.product_code', _text, None),
+    ('UrunUrl', 'product.product_url', _text, None),
+    ('UzunAciklama', 'product.product_long_description', _text, None),
+    ('YeniKategoriId', 'category_id', int, 0),
+)
+
+# Precompiled lookups: tag -> (position, field, converter)
+_FIELD_INDEX = {
+    tag: (position, field, converter)
+    for position, (tag, field, converter, _) in enumerate(STOCK_FIELDS)
+}
+_DEFAULTS = [default for _, _, _, default in STOCK_FIELDS]
+_BARCODE_POSITION = _FIELD_INDEX['Barkod'][0]
+
+def _build_stock(v: list) -> Stock:
+    """Build a Stock from converted values in STOCK_FIELDS order"""
+    return Stock(
+        v[0], v[1], v[2], v[3],
+        StockDimensions(v[4], v[5], v[6]),
+        v[7], v[8],
+        StockWarranty(v[9], v[10]),
+        v[11],
+        StockPrice(v[12], v[13], v[14], v[15]),
+        v[16], v[17], v[18], v[19], v[20],
+        StockProduct(v[21], v[22], v[23], v[24], v[25]),
+        v[26]
+    )
+
+def _finish_row(values: list, row: int, row_errors: list, errors: Optional[list]) -> Stock:
+    if row_errors and errors is not None:
+        barcode = values[_BARCODE_POSITION]
+        for field, tag, value, message in row_errors:
+            errors.append(StockFieldError(
+                row=row, barcode=barcode, field=field,
+                tag=tag, value=value, error=message
+            ))
+    return _build_stock(values)
+
+def convert_stock_record(data: Dict[str, str], errors: Optional[List[StockFieldError]] = None, row: int = 0) -> Stock:
+    """
+    Convert a single ``'a:Tag' -> value`` record into a Stock.
+
+    Fields that fail to convert keep their default value and are reported
+    in ``errors`` instead of dropping the whole row.
+
+    Args:
+        data: Stock record as produced by xmltodict
+        errors: List that receives per-field conversion failures
+        row: Row number used in error reports
+    """
+    values = list(_DEFAULTS)
+    row_errors = []
+    for key, value in data.items():
+        tag = key[2:] if key.startswith('a:') else key
+        entry = _FIELD_INDEX.get(tag)
+        # xmltodict returns nil fields as dicts; those keep their default
+        if entry is None or value is None or isinstance(value, dict):
+            continue
+        position, field, converter = entry
+        try:
+            values[position] = converter(value)
+        except (ValueError, TypeError) as e:
+            row_errors.append((field, tag, value, str(e)))
+    return _finish_row(values, row, row_errors, errors)
+
+def _iter_stock_elements(source: BinaryIO) -> Iterator[ET.Element]:
+    """
+    Yield ``StokKontrolDetay`` elements as soon as they are complete.
+    Each element is cleared once the caller moves on, so only an empty
+    shell per entry stays in the partially built tree.
+    """
+    suffix = '}' + STOCK_ELEMENT
+    is_stock = {}
+
+    for _, elem in ET.iterparse(source):
+        tag = elem.tag
+        match = is_stock.get(tag)
+        if match is None:
+            match = tag == STOCK_ELEMENT or tag.endswith(suffix)
+            is_stock[tag] = match
+        if not match:
+            continue
+
+        yield elem
+
+        elem.clear()
+
+def parse_stock_page(source: BinaryIO, errors: Optional[List[StockFieldError]] = None) -> List[Stock]:
+    """
+    Parse a whole StokKontrolListesi response into Stock objects in one pass.
+
+    Child elements are dispatched straight through the precompiled
+    STOCK_FIELDS table without building intermediate dicts.
+
+    Args:
+        source: File-like object with the raw SOAP response
+        errors: List that receives per-field conversion failures
+
+    Returns:
+        List[Stock]: Stocks in response order
+    """
+    stocks = []
+    tag_cache = {}
+
+    for row, elem in enumerate(_iter_stock_elements(source)):
+        values = list(_DEFAULTS)
+        row_errors = []
+        for child in elem:
+            tag = child.tag
+            entry = tag_cache.get(tag, False)
+            if entry is False:
+                entry = _FIELD_INDEX.get(_local_name(tag))
+                tag_cache[tag] = entry
+            text = child.text
+            if entry is None or text is None:
+                continue
+            position, field, converter = entry
+            try:
+                values[position] = converter(text)
+            except (ValueError, TypeError) as e:
+                row_errors.append((field, _local_name(tag), text, str(e)))
+        stocks.append(_finish_row(values, row, row_errors, errors))
+
+    return stocks
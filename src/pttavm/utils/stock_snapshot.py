@@ -0,0 +1,260 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from hashlib import blake2b
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from ..models.stock import Stock
+from ..models.stock_table import (
+    StockRow, StockTable, FLOAT_COLUMNS, INT_COLUMNS, BOOL_COLUMNS, STRING_COLUMNS
+)
+
+# File layout (all sections 8-byte aligned):
+#   header | column directory | numeric columns | string offsets/lengths
+#   | barcode hash index (hashes, rows) | string heap
+MAGIC = b'PTTSNAP1'
+VERSION = 1
+HEADER = struct.Struct('<8sHHIQQQQQ')  # magic, version, little endian, columns, rows, heap offset/size, index offset/slots
+COLUMN = struct.Struct('<32s1s7xQQ')  # name, array typecode ('s' for strings), data offset, lengths offset
+EMPTY_SLOT = -1
+
+_NUMERIC_TYPES = {
+    **{name: 'd' for name in FLOAT_COLUMNS},
+    **{name: 'q' for name in INT_COLUMNS},
+    **{name: 'b' for name in BOOL_COLUMNS},
+}
+
+def barcode_hash(barcode: str) -> int:
+    """64-bit blake2b hash used by the barcode index"""
+    return int.from_bytes(blake2b(barcode.encode('utf-8'), digest_size=8).digest(), 'little') & 0x7FFFFFFFFFFFFFFF
+
+def _index_slots(rows: int) -> int:
+    slots = 8
+    while slots < rows * 2:
+        slots *= 2
+    return slots
+
+def _padding(size: int) -> bytes:
+    return b'\0' * (-size % 8)
+
+def write_stock_snapshot(stocks: Union[StockTable, Iterable[Stock]], path: str) -> int:
+    """
+    Write stocks to a memory-mappable snapshot file
+
+    The file is written next to ``path`` and renamed over it, so readers
+    that already mapped the old file keep a consistent view.
+
+    Args:
+        stocks: StockTable (written without copying rows) or Stock objects
+        path: Snapshot file
+
+    Returns:
+        int: Number of rows written
+    """
+    table = stocks if isinstance(stocks, StockTable) else StockTable.from_stocks(stocks)
+    rows = len(table)
+
+    sections: List[bytes] = []
+    offset = HEADER.size + COLUMN.size * (len(_NUMERIC_TYPES) + len(STRING_COLUMNS))
+    directory = []
+
+    def add(data: bytes) -> int:
+        nonlocal offset
+        start = offset
+        sections.append(data)
+        sections.append(_padding(len(data)))
+        offset += len(data) + len(sections[-1])
+        return start
+
+    for name, typecode in _NUMERIC_TYPES.items():
+        column = table.column(name)
+        if not isinstance(column, array) or column.typecode != typecode:
+            column = array(typecode, column)
+        directory.append(COLUMN.pack(name.encode(), typecode.encode(), add(column.tobytes()), 0))
+
+    # Equal strings share one heap entry
+    heap = bytearray()
+    positions: Dict[str, int] = {}
+    for name in STRING_COLUMNS:
+        starts, lengths = array('q'), array('i')
+        for value in table.column(name):
+            if value is None:
+                starts.append(0)
+                lengths.append(-1)
+                continue
+            encoded = value.encode('utf-8')
+            start = positions.get(value)
+            if start is None:
+                start = positions[value] = len(heap)
+                heap += encoded
+            starts.append(start)
+            lengths.append(len(encoded))
+        directory.append(COLUMN.pack(name.encode(), b's', add(starts.tobytes()), add(lengths.tobytes())))
+
+    # Open addressing with linear probing; a later duplicate barcode wins
+    slots = _index_slots(rows)
+    hashes, slot_rows = array('q', [0]) * slots, array('q', [EMPTY_SLOT]) * slots
+    barcodes = table.column('barcode')
+    mask = slots - 1
+    for row, barcode in enumerate(barcodes):
+        if not barcode:
+            continue
+        code = barcode_hash(barcode)
+        slot = code & mask
+        while slot_rows[slot] != EMPTY_SLOT and not (
+            hashes[slot] == code and barcodes[slot_rows[slot]] == barcode
+        ):
+            slot = (slot + 1) & mask
+        hashes[slot], slot_rows[slot] = code, row
+    index_offset = add(hashes.tobytes())
+    add(slot_rows.tobytes())
+    heap_offset = add(bytes(heap))
+
+    header = HEADER.pack(
+        MAGIC, VERSION, 1 if sys.byteorder == 'little' else 0, len(directory), rows,
+        heap_offset, len(heap), index_offset, slots
+    )
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        for entry in directory:
+            f.write(entry)
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, path)
+    return rows
+
+class _StringColumn:
+    """Read-only string column decoded from the heap on access"""
+
+    __slots__ = ('_heap', '_starts', '_lengths')
+
+    def __init__(self, heap: memoryview, starts: memoryview, lengths: memoryview):
+        self._heap = heap
+        self._starts = starts
+        self._lengths = lengths
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        length = self._lengths[index]
+        if length < 0:
+            return None
+        start = self._starts[index]
+        return str(self._heap[start:start + length], 'utf-8')
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        for index in range(len(self._lengths)):
+            yield self[index]
+
+class MappedStockTable(StockTable):
+    """
+    Read-only StockTable backed by a memory-mapped snapshot file.
+
+    Numeric columns are ``memoryview`` casts over the mapping and strings
+    are decoded from the heap only when read, so opening is O(1) and
+    processes mapping the same file share its pages through the OS page
+    cache. Rows are found by barcode through the on-disk hash index.
+    Works wherever a StockTable is accepted (e.g. ``plan_catalog_sync``).
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: File written by ``write_stock_snapshot``
+
+        Raises:
+            ValueError: If the file is not a compatible snapshot
+        """
+        self.path = path
+        self.keep_long_description = True
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        self._views: List[memoryview] = [self._buffer]
+
+        (magic, version, little_endian, column_count, rows,
+         heap_offset, heap_size, index_offset, slots) = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Not a stock snapshot file: {path}")
+        if bool(little_endian) != (sys.byteorder == 'little'):
+            self.close()
+            raise ValueError("Stock snapshot was written with a different byte order")
+
+        heap = self._view(heap_offset, heap_size, 'B')
+        self.columns: Dict[str, Union[memoryview, _StringColumn]] = {}
+        for position in range(column_count):
+            raw_name, typecode, data_offset, lengths_offset = COLUMN.unpack_from(
+                self._buffer, HEADER.size + position * COLUMN.size
+            )
+            name, typecode = raw_name.rstrip(b'\0').decode(), typecode.decode()
+            if typecode == 's':
+                self.columns[name] = _StringColumn(
+                    heap,
+                    self._view(data_offset, rows * 8, 'q'),
+                    self._view(lengths_offset, rows * 4, 'i')
+                )
+            else:
+                self.columns[name] = self._view(data_offset, rows * struct.calcsize(typecode), typecode)
+
+        self._rows = rows
+        self._mask = slots - 1
+        self._hashes = self._view(index_offset, slots * 8, 'q')
+        self._slot_rows = self._view(index_offset + slots * 8, slots * 8, 'q')
+
+    def _view(self, offset: int, size: int, typecode: str) -> memoryview:
+        view = self._buffer[offset:offset + size].cast(typecode)
+        self._views.append(view)
+        return view
+
+    def find(self, barcode: str) -> Optional[int]:
+        """Row index of a barcode, or None"""
+        code = barcode_hash(barcode)
+        slot = code & self._mask
+        barcodes = self.columns['barcode']
+        while True:
+            row = self._slot_rows[slot]
+            if row == EMPTY_SLOT:
+                return None
+            if self._hashes[slot] == code and barcodes[row] == barcode:
+                return row
+            slot = (slot + 1) & self._mask
+
+    def get(self, barcode: str) -> Optional[StockRow]:
+        """Row view of a barcode, or None"""
+        index = self.find(barcode)
+        return StockRow(self, index) if index is not None else None
+
+    def get_stock(self, barcode: str) -> Optional[Stock]:
+        """Stock of a barcode, or None"""
+        index = self.find(barcode)
+        return self.to_stock(index) if index is not None else None
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def append(self, stock: Stock):
+        raise TypeError("MappedStockTable is read-only")
+
+    def extend(self, stocks: Iterable[Stock]):
+        raise TypeError("MappedStockTable is read-only")
+
+    def close(self):
+        """Release the mapping; rows and columns cannot be used afterwards"""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def open_stock_snapshot(path: str) -> MappedStockTable:
+    """Map a snapshot file written by ``write_stock_snapshot``"""
+    return MappedStockTable(path)
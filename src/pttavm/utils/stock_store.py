@@ -0,0 +1,280 @@
+import sqlite3
+import threading
+import time
+from itertools import islice
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from ..models.stock import Stock
+from ..models.stock_table import (
+    StockTable, FLOAT_COLUMNS, INT_COLUMNS, BOOL_COLUMNS, STRING_COLUMNS
+)
+
+# Stored columns in a fixed order, with their SQLite types
+COLUMNS: Tuple[str, ...] = tuple(STRING_COLUMNS) + tuple(FLOAT_COLUMNS) + tuple(INT_COLUMNS) + tuple(BOOL_COLUMNS)
+_TYPES = {
+    **{name: "TEXT" for name in STRING_COLUMNS},
+    **{name: "REAL" for name in FLOAT_COLUMNS},
+    **{name: "INTEGER" for name in INT_COLUMNS},
+    **{name: "INTEGER" for name in BOOL_COLUMNS},
+}
+_STOCK_GETTER = attrgetter(*(
+    '.'.join(paths[name]) for paths in (STRING_COLUMNS, FLOAT_COLUMNS, INT_COLUMNS, BOOL_COLUMNS) for name in paths
+))
+_BOOL_POSITIONS = tuple(COLUMNS.index(name) for name in BOOL_COLUMNS)
+_BARCODE_POSITION = COLUMNS.index('barcode')
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS stocks (
+    {', '.join(f'{name} {_TYPES[name]}' + (' NOT NULL PRIMARY KEY' if name == 'barcode' else '') for name in COLUMNS)},
+    crawl_id INTEGER NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    removed_at REAL
+);
+CREATE INDEX IF NOT EXISTS stocks_product_id ON stocks (product_id);
+CREATE INDEX IF NOT EXISTS stocks_category_id ON stocks (category_id);
+CREATE INDEX IF NOT EXISTS stocks_crawl_id ON stocks (crawl_id);
+CREATE TABLE IF NOT EXISTS crawls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    rows INTEGER,
+    removed INTEGER
+);
+"""
+
+_UPSERT = (
+    f"INSERT INTO stocks ({', '.join(COLUMNS)}, crawl_id, first_seen, last_seen) "
+    f"VALUES ({', '.join('?' * len(COLUMNS))}, ?, ?, ?) "
+    f"ON CONFLICT (barcode) DO UPDATE SET "
+    f"{', '.join(f'{name} = excluded.{name}' for name in COLUMNS if name != 'barcode')}, "
+    f"crawl_id = excluded.crawl_id, last_seen = excluded.last_seen, removed_at = NULL"
+)
+
+_SELECT = f"SELECT {', '.join(COLUMNS)} FROM stocks"
+
+BATCH_SIZE = 1000
+
+StockSource = Union[Iterable[Stock], StockTable]
+
+# Rows without a barcode cannot be keyed and are skipped
+def _table_rows(table: StockTable) -> Iterable[tuple]:
+    return (row for row in zip(*(table.column(name) for name in COLUMNS)) if row[_BARCODE_POSITION])
+
+def _stock_rows(stocks: Iterable[Stock]) -> Iterable[tuple]:
+    for stock in stocks:
+        if not stock.barcode:
+            continue
+        row = _STOCK_GETTER(stock)
+        if _BOOL_POSITIONS:
+            row = list(row)
+            for position in _BOOL_POSITIONS:
+                row[position] = 1 if row[position] else 0
+            row = tuple(row)
+        yield row
+
+class StockSnapshotStore:
+    """
+    Local SQLite copy of the stock catalog.
+
+    Rows are keyed by barcode and indexed by product_id and category_id.
+    ``refresh`` upserts each batch of a crawl in its own short transaction,
+    so readers are only blocked while a batch is written, never while the
+    next page is fetched. Rows that were not seen are marked removed once
+    the crawl completes; a failed crawl keeps the rows it already wrote
+    but removes nothing. Removed rows are kept (with ``removed_at``) but
+    left out of queries by default.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._connection.commit()
+
+    def refresh(self, stocks: StockSource) -> Dict[str, int]:
+        """
+        Replace the snapshot with a new crawl
+
+        Stocks without a barcode are skipped.
+
+        Args:
+            stocks: Stock objects (e.g. ``iter_stocks()``) or a StockTable
+
+        Returns:
+            Dict[str, int]: Crawl id, rows written and rows marked removed
+        """
+        with self._refresh_lock:
+            return self._refresh(stocks)
+
+    def _refresh(self, stocks: StockSource) -> Dict[str, int]:
+        rows = _table_rows(stocks) if isinstance(stocks, StockTable) else _stock_rows(stocks)
+        now = time.time()
+        with self._lock:
+            with self._connection:
+                crawl_id = self._connection.execute(
+                    "INSERT INTO crawls (started_at) VALUES (?)", (now,)
+                ).lastrowid
+
+        written = 0
+        while True:
+            # The batch is pulled (and its pages fetched) before the lock is taken
+            batch = [row + (crawl_id, now, now) for row in islice(rows, BATCH_SIZE)]
+            if not batch:
+                break
+            with self._lock:
+                with self._connection:
+                    self._connection.executemany(_UPSERT, batch)
+            written += len(batch)
+
+        finished = time.time()
+        with self._lock:
+            with self._connection:
+                removed = self._connection.execute(
+                    "UPDATE stocks SET removed_at = ? WHERE crawl_id != ? AND removed_at IS NULL",
+                    (finished, crawl_id)
+                ).rowcount
+                self._connection.execute(
+                    "UPDATE crawls SET finished_at = ?, rows = ?, removed = ? WHERE id = ?",
+                    (finished, written, removed, crawl_id)
+                )
+        return {"crawl_id": crawl_id, "rows": written, "removed": removed}
+
+    def _fetch(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _to_stocks(rows: List[tuple]) -> List[Stock]:
+        table = StockSnapshotStore._to_table(rows)
+        return [table.to_stock(index) for index in range(len(table))]
+
+    @staticmethod
+    def _to_table(rows: List[tuple]) -> StockTable:
+        table = StockTable()
+        columns = [table.column(name) for name in COLUMNS]
+        for row in rows:
+            for column, value in zip(columns, row):
+                column.append(value)
+        return table
+
+    def get(self, barcode: str, include_removed: bool = False) -> Optional[Stock]:
+        """Stock of a barcode, or None"""
+        rows = self._fetch(
+            f"{_SELECT} WHERE barcode = ?" + ("" if include_removed else " AND removed_at IS NULL"),
+            (barcode,)
+        )
+        return self._to_stocks(rows)[0] if rows else None
+
+    def get_many(self, barcodes: Iterable[str], include_removed: bool = False) -> Dict[str, Stock]:
+        """Stocks of several barcodes, keyed by barcode; unknown barcodes are left out"""
+        found: Dict[str, Stock] = {}
+        barcodes = list(dict.fromkeys(barcodes))
+        # SQLite limits the number of bound parameters per statement
+        for start in range(0, len(barcodes), 500):
+            chunk = barcodes[start:start + 500]
+            rows = self._fetch(
+                f"{_SELECT} WHERE barcode IN ({', '.join('?' * len(chunk))})"
+                + ("" if include_removed else " AND removed_at IS NULL"),
+                tuple(chunk)
+            )
+            for stock in self._to_stocks(rows):
+                found[stock.barcode] = stock
+        return found
+
+    def query(
+        self,
+        include_removed: bool = False,
+        order_by: str = "barcode",
+        limit: Optional[int] = None,
+        as_table: bool = False,
+        **filters
+    ) -> Union[List[Stock], StockTable]:
+        """
+        Stocks matching column filters
+
+        A filter value is matched exactly, or as an inclusive range when
+        given as a ``(low, high)`` tuple where either end may be None.
+        Filters on barcode, product_id and category_id use an index.
+
+        Example:
+            store.query(category_id=1234, quantity=(1, None), price_with_vat=(None, 100))
+
+        Raises:
+            ValueError: If a filter or order_by is not a stock column
+        """
+        clauses, params = [], []
+        for name, value in filters.items():
+            if name not in _TYPES:
+                raise ValueError(f"Unknown stock column: {name}")
+            if isinstance(value, tuple):
+                low, high = value
+                if low is not None:
+                    clauses.append(f"{name} >= ?")
+                    params.append(low)
+                if high is not None:
+                    clauses.append(f"{name} <= ?")
+                    params.append(high)
+            elif value is None:
+                clauses.append(f"{name} IS NULL")
+            else:
+                clauses.append(f"{name} = ?")
+                params.append(value)
+        if not include_removed:
+            clauses.append("removed_at IS NULL")
+        if order_by not in _TYPES:
+            raise ValueError(f"Unknown stock column: {order_by}")
+
+        sql = _SELECT
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        rows = self._fetch(sql, tuple(params))
+        return self._to_table(rows) if as_table else self._to_stocks(rows)
+
+    def removed(self, since: Optional[float] = None) -> List[str]:
+        """Barcodes that disappeared from the catalog, optionally since a timestamp"""
+        rows = self._fetch(
+            "SELECT barcode FROM stocks WHERE removed_at IS NOT NULL AND removed_at >= ? ORDER BY removed_at, barcode",
+            (since or 0,)
+        )
+        return [row[0] for row in rows]
+
+    def last_refresh(self) -> Optional[Dict[str, float]]:
+        """Timing and counts of the last completed refresh"""
+        rows = self._fetch(
+            "SELECT id, started_at, finished_at, rows, removed FROM crawls "
+            "WHERE finished_at IS NOT NULL ORDER BY id DESC LIMIT 1"
+        )
+        if not rows:
+            return None
+        crawl_id, started_at, finished_at, count, removed = rows[0]
+        return {
+            "crawl_id": crawl_id, "started_at": started_at, "finished_at": finished_at,
+            "rows": count, "removed": removed,
+        }
+
+    def __len__(self) -> int:
+        return self._fetch("SELECT COUNT(*) FROM stocks WHERE removed_at IS NULL")[0][0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
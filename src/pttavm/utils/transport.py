@@ -0,0 +1,304 @@
+import gzip
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Optional, Tuple
+
+class CompressionStats:
+    """
+    Thread-safe per-operation byte counters of a transport.
+
+    ``*_bytes`` are the uncompressed body sizes, ``*_wire_bytes`` what was
+    actually sent or received; ``bytes_saved`` is the difference of both.
+    Response savings come from the gzip/deflate encoding that requests and
+    httpx ask for by default, request savings from ``compress_requests``.
+    """
+
+    FIELDS = ("requests", "request_bytes", "request_wire_bytes", "response_bytes", "response_wire_bytes")
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, request: Tuple[int, int], response: Tuple[int, int]):
+        """
+        Args:
+            operation: Operation name
+            request: (body size, bytes sent)
+            response: (body size, bytes received)
+        """
+        with self._lock:
+            counters = self._counters.get(operation)
+            if counters is None:
+                counters = dict.fromkeys(self.FIELDS, 0)
+                self._counters[operation] = counters
+            counters["requests"] += 1
+            counters["request_bytes"] += request[0]
+            counters["request_wire_bytes"] += request[1]
+            counters["response_bytes"] += response[0]
+            counters["response_wire_bytes"] += response[1]
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Copy of the counters keyed by operation, with ``bytes_saved`` added"""
+        with self._lock:
+            result = {}
+            for operation, counters in self._counters.items():
+                counters = dict(counters)
+                counters["bytes_saved"] = (
+                    counters["request_bytes"] - counters["request_wire_bytes"]
+                    + counters["response_bytes"] - counters["response_wire_bytes"]
+                )
+                result[operation] = counters
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+def _operation_of(headers: Optional[Dict[str, str]]) -> str:
+    """Operation name from the SOAPAction header"""
+    action = (headers or {}).get('SOAPAction', '')
+    return action.rpartition('/')[2] or 'unknown'
+
+class _Compression:
+    """Request body compression and response accounting shared by both transports"""
+
+    def __init__(self, compress_requests: bool, compress_min_size: int, compress_level: int):
+        self.compress_requests = compress_requests
+        self.compress_min_size = compress_min_size
+        self.compress_level = compress_level
+        self.stats = CompressionStats()
+
+    def prepare(self, data: bytes, headers: Optional[Dict[str, str]]) -> Tuple[bytes, Dict[str, str]]:
+        """Gzip the body if enabled and large enough"""
+        headers = dict(headers or {})
+        if self.compress_requests and len(data) >= self.compress_min_size:
+            data = gzip.compress(data, compresslevel=self.compress_level)
+            headers['Content-Encoding'] = 'gzip'
+        return data, headers
+
+# Sent instead of the HTTP library's default when compressed responses are turned off
+NO_RESPONSE_COMPRESSION = {'Accept-Encoding': 'identity'}
+
+class HttpTransport:
+    """
+    Connection-pooled HTTP transport shared by the services of a client.
+
+    Wraps a single ``requests.Session`` so that every SOAP call reuses the
+    already established TCP/TLS connections to the PTT AVM endpoint instead
+    of paying a fresh handshake per request.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout: float = 30,
+        verify: bool = False,
+        compress_responses: bool = True,
+        compress_requests: bool = False,
+        compress_min_size: int = 1024,
+        compress_level: int = 6
+    ):
+        """
+        Args:
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Maximum number of connections kept per host
+            pool_block: Block when the per-host pool is exhausted instead of
+                        opening extra, non-pooled connections
+            keep_alive: Keep connections open between requests
+            timeout: Default request timeout in seconds
+            verify: SSL certificate verification
+            compress_responses: Keep the requests default of asking for (and
+                                decoding) gzip/deflate responses; False sends
+                                ``Accept-Encoding: identity``
+            compress_requests: Gzip request bodies (``Content-Encoding: gzip``);
+                               the endpoint has to accept compressed requests
+            compress_min_size: Smallest body in bytes that gets compressed
+            compress_level: gzip compression level (1-9)
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.verify = verify
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+        if not compress_responses:
+            self.session.headers.update(NO_RESPONSE_COMPRESSION)
+        self._compression = _Compression(compress_requests, compress_min_size, compress_level)
+
+    @property
+    def compression_stats(self) -> CompressionStats:
+        """Per-operation request/response sizes before and after compression"""
+        return self._compression.stats
+
+    def post(
+        self,
+        url: str,
+        data: bytes,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None
+    ) -> requests.Response:
+        """
+        POST request over the pooled session.
+
+        Args:
+            url: Request URL
+            data: Encoded request body
+            headers: HTTP headers
+            timeout: Request timeout, defaults to the transport timeout
+
+        Returns:
+            requests.Response: HTTP response
+        """
+        body, headers = self._compression.prepare(data, headers)
+        response = self.session.post(
+            url,
+            data=body,
+            headers=headers,
+            timeout=timeout if timeout is not None else self.timeout
+        )
+        self._compression.stats.record(
+            _operation_of(headers),
+            (len(data), len(body)),
+            (len(response.content), self._received_bytes(response))
+        )
+        return response
+
+    @staticmethod
+    def _received_bytes(response: requests.Response) -> int:
+        """Bytes read from the wire; differs from the body when it was compressed"""
+        tell = getattr(response.raw, 'tell', None)
+        if tell is not None:
+            try:
+                return tell()
+            except Exception:
+                pass
+        return len(response.content)
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class AsyncHttpTransport:
+    """
+    Asyncio-native counterpart of ``HttpTransport`` built on ``httpx``.
+
+    Requires the optional ``async`` extra: ``pip install pttavm-python[async]``
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 5.0,
+        timeout: float = 30,
+        verify: bool = False,
+        compress_responses: bool = True,
+        compress_requests: bool = False,
+        compress_min_size: int = 1024,
+        compress_level: int = 6
+    ):
+        """
+        Args:
+            max_connections: Maximum number of concurrent connections
+            max_keepalive_connections: Maximum number of idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept open
+            timeout: Default request timeout in seconds
+            verify: SSL certificate verification
+            compress_responses: Keep the httpx default of asking for (and
+                                decoding) compressed responses; False sends
+                                ``Accept-Encoding: identity``
+            compress_requests: Gzip request bodies (``Content-Encoding: gzip``)
+            compress_min_size: Smallest body in bytes that gets compressed
+            compress_level: gzip compression level (1-9)
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "AsyncHttpTransport requires httpx. "
+                "Install it with: pip install pttavm-python[async]"
+            )
+
+        self.timeout = timeout
+        self._compression = _Compression(compress_requests, compress_min_size, compress_level)
+        self.client = httpx.AsyncClient(
+            verify=verify,
+            timeout=timeout,
+            headers=None if compress_responses else NO_RESPONSE_COMPRESSION,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            )
+        )
+
+    async def post(
+        self,
+        url: str,
+        data: bytes,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        POST request over the pooled async client.
+
+        Args:
+            url: Request URL
+            data: Encoded request body
+            headers: HTTP headers
+            timeout: Request timeout, defaults to the transport timeout
+
+        Returns:
+            httpx.Response: HTTP response
+        """
+        body, headers = self._compression.prepare(data, headers)
+        response = await self.client.post(
+            url,
+            content=body,
+            headers=headers,
+            timeout=timeout if timeout is not None else self.timeout
+        )
+        self._compression.stats.record(
+            _operation_of(headers),
+            (len(data), len(body)),
+            (len(response.content), response.num_bytes_downloaded)
+        )
+        return response
+
+    @property
+    def compression_stats(self) -> CompressionStats:
+        """Per-operation request/response sizes before and after compression"""
+        return self._compression.stats
+
+    async def close(self):
+        """Close all pooled connections."""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
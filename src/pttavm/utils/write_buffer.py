@@ -0,0 +1,167 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from ..models.variant import StockPriceUpdate, StockPriceUpdateResult, StockUpdateError
+
+logger = logging.getLogger(__name__)
+
+def last_write_wins(previous: StockPriceUpdate, current: StockPriceUpdate) -> StockPriceUpdate:
+    """Default merge: the newest update replaces the pending one"""
+    return current
+
+class StockUpdateBuffer:
+    """
+    Coalescing write buffer in front of ``StockService.update_stock_price``.
+
+    Updates are merged per barcode while they wait; a background worker
+    sends the pending batch ``window`` seconds after the first update
+    arrived, or as soon as ``max_size`` distinct barcodes are pending.
+
+    A batch that could not be sent is reported as failed results, and
+    errors of the worker or ``on_result`` are logged, so the worker keeps
+    running.
+    """
+
+    def __init__(
+        self,
+        stock_service,
+        window: float = 1.0,
+        max_size: int = 100,
+        merge: Optional[Callable[[StockPriceUpdate, StockPriceUpdate], StockPriceUpdate]] = None,
+        max_workers: int = 4,
+        on_result: Optional[Callable[[List[StockPriceUpdateResult]], None]] = None
+    ):
+        """
+        Args:
+            stock_service: StockService used to send the updates
+            window: Seconds an update may wait before the batch is sent
+            max_size: Number of pending barcodes that triggers a flush
+            merge: Function merging a pending and a new update for the same barcode
+            max_workers: Concurrent requests per flush
+            on_result: Called with the results of every background and final flush
+        """
+        self.stock_service = stock_service
+        self.window = window
+        self.max_size = max_size
+        self.merge = merge or last_write_wins
+        self.max_workers = max_workers
+        self.on_result = on_result
+
+        self.received = 0
+        self.coalesced = 0
+        self.sent = 0
+
+        self._pending: Dict[str, StockPriceUpdate] = {}
+        self._first_added_at: Optional[float] = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="StockUpdateBuffer", daemon=True)
+        self._worker.start()
+
+    def add(self, update: StockPriceUpdate):
+        """
+        Queue an update, merging it with a pending one for the same barcode
+
+        Raises:
+            StockUpdateError: If the buffer is closed
+        """
+        with self._condition:
+            if self._closed:
+                raise StockUpdateError("Stock update buffer is closed")
+            self.received += 1
+            previous = self._pending.get(update.barcode)
+            if previous is not None:
+                update = self.merge(previous, update)
+                self.coalesced += 1
+            elif not self._pending:
+                # Wake the worker so it starts the window timer
+                self._first_added_at = time.monotonic()
+                self._condition.notify()
+            self._pending[update.barcode] = update
+            if len(self._pending) >= self.max_size:
+                self._condition.notify()
+
+    def pending_count(self) -> int:
+        """Number of barcodes waiting to be sent"""
+        with self._condition:
+            return len(self._pending)
+
+    def flush(self) -> List[StockPriceUpdateResult]:
+        """
+        Send all pending updates now
+
+        Returns:
+            List[StockPriceUpdateResult]: Per-barcode results of this flush;
+            every update is failed if the batch could not be sent
+        """
+        with self._flush_lock:
+            with self._condition:
+                batch = list(self._pending.values())
+                self._pending = {}
+                self._first_added_at = None
+            if not batch:
+                return []
+            try:
+                results = self.stock_service.update_stock_price_bulk(batch, max_workers=self.max_workers)
+            except Exception as e:
+                results = [
+                    StockPriceUpdateResult(barcode=update.barcode, success=False, error=str(e))
+                    for update in batch
+                ]
+            self.sent += len(batch)
+            return results
+
+    def close(self) -> List[StockPriceUpdateResult]:
+        """
+        Stop the background worker and send what is still pending
+
+        Returns:
+            List[StockPriceUpdateResult]: Results of the final flush
+        """
+        with self._condition:
+            if self._closed:
+                return []
+            self._closed = True
+            self._condition.notify()
+        self._worker.join()
+        results = self.flush()
+        self._report(results)
+        return results
+
+    def _report(self, results: List[StockPriceUpdateResult]):
+        if results and self.on_result:
+            try:
+                self.on_result(results)
+            except Exception:
+                logger.exception("Error in stock update buffer callback")
+
+    def _due(self) -> bool:
+        if not self._pending:
+            return False
+        if len(self._pending) >= self.max_size:
+            return True
+        return time.monotonic() - self._first_added_at >= self.window
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and not self._due():
+                    if self._pending:
+                        timeout = self.window - (time.monotonic() - self._first_added_at)
+                        self._condition.wait(max(timeout, 0))
+                    else:
+                        self._condition.wait()
+                if self._closed:
+                    return
+            try:
+                self._report(self.flush())
+            except Exception:
+                logger.exception("Error flushing stock update buffer")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,274 @@
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+class RawXml(bytes):
+    """Pre-serialized XML that is written into the body without escaping"""
+    pass
+
+class XmlRecords:
+    """Records written by a record writer when the body is built, without an intermediate buffer"""
+
+    __slots__ = ('write', 'records')
+
+    def __init__(self, write: Callable, records: Iterable):
+        self.write = write
+        self.records = records
+
+# Longer texts with markup (HTML descriptions) go into a CDATA section,
+# which costs a single scan instead of one replace pass per character
+CDATA_MIN_LENGTH = 256
+
+def escape_text(text: str) -> str:
+    """Escape ``&``, ``<`` and ``>``; strings without them are returned as is"""
+    if len(text) >= CDATA_MIN_LENGTH and ']]>' not in text and ('<' in text or '&' in text):
+        return '<![CDATA[' + text + ']]>'
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+def _bool_text(value: bool) -> str:
+    return 'true' if value else 'false'
+
+# Exact value type -> text formatter
+_FORMATTERS: Dict[type, Callable[[Any], str]] = {
+    str: escape_text,
+    bool: _bool_text,
+    int: str,
+    float: str,
+    datetime: datetime.isoformat,
+}
+
+def format_value(value: Any) -> str:
+    """Text of a SOAP field value: booleans as ``true``/``false``, dates in ISO format"""
+    formatter = _FORMATTERS.get(value.__class__)
+    if formatter is not None:
+        return formatter(value)
+    if isinstance(value, bool):
+        return _bool_text(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return escape_text(str(value))
+
+# tag -> (opening tag, closing tag), shared by all writers
+_TAGS: Dict[str, Tuple[bytes, bytes]] = {}
+
+def _tag(name: str) -> Tuple[bytes, bytes]:
+    tags = _TAGS.get(name)
+    if tags is None:
+        tags = (f"<{name}>".encode('utf-8'), f"</{name}>".encode('utf-8'))
+        _TAGS[name] = tags
+    return tags
+
+class XmlWriter:
+    """
+    Append-only XML writer on top of a ``bytearray``.
+
+    Elements are encoded and appended as they are written, so large bodies
+    are built without intermediate strings. ``None`` values are left out
+    instead of being sent as ``"None"``.
+    """
+
+    __slots__ = ('buffer',)
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def start(self, name: str):
+        self.buffer += _tag(name)[0]
+
+    def end(self, name: str):
+        self.buffer += _tag(name)[1]
+
+    def raw(self, data: bytes):
+        self.buffer += data
+
+    def element(self, name: str, value: Any):
+        """
+        Write ``<name>value</name>``
+
+        Dicts become nested elements, lists repeat the element per item,
+        RawXml is written unescaped and XmlRecords are written in place.
+        """
+        if value is None:
+            return
+        if isinstance(value, list):
+            for item in value:
+                self.element(name, item)
+            return
+        opening, closing = _tag(name)
+        buffer = self.buffer
+        buffer += opening
+        if isinstance(value, dict):
+            for key, item in value.items():
+                self.element(key, item)
+        elif isinstance(value, RawXml):
+            buffer += value
+        elif isinstance(value, XmlRecords):
+            value.write(self, value.records)
+        else:
+            buffer += format_value(value).encode('utf-8')
+        buffer += closing
+
+    def getvalue(self) -> RawXml:
+        return RawXml(self.buffer)
+
+# (tag, value getter, list writer or None)
+Member = Tuple[str, Callable, Optional[Callable]]
+
+def record_writer(tag: str, members: Iterable[Member]) -> Callable[[XmlWriter, Iterable], None]:
+    """
+    Build a writer for a list of data contract records.
+
+    Tags are encoded once; each record is written member by member straight
+    into the buffer. Members with a list writer hold nested records and are
+    left out when empty.
+    """
+    compiled = tuple(_tag(name) + (get, write) for name, get, write in members)
+    record_open, record_close = _tag(tag)
+    formatters = _FORMATTERS
+
+    def write_records(writer: XmlWriter, records: Iterable) -> None:
+        buffer = writer.buffer
+        for record in records:
+            buffer += record_open
+            for opening, closing, get, write in compiled:
+                value = get(record)
+                if value is None:
+                    continue
+                if write is not None:
+                    if value:
+                        buffer += opening
+                        write(writer, value)
+                        buffer += closing
+                    continue
+                formatter = formatters.get(value.__class__)
+                text = formatter(value) if formatter is not None else format_value(value)
+                buffer += opening
+                buffer += text.encode('utf-8')
+                buffer += closing
+            buffer += record_close
+
+    return write_records
+
+def serialize_list(write: Callable[[XmlWriter, Iterable], None], items) -> Optional[RawXml]:
+    """Serialize a list with one of the record writers; empty lists give None"""
+    if not items:
+        return None
+    writer = XmlWriter()
+    write(writer, items)
+    return writer.getvalue()
+
+# ePttAVMService data contracts; members are written in alphabetical order
+
+write_variant_attributes = record_writer('ept:VariantAttr', (
+    ('ept:Deger', attrgetter('value'), None),
+    ('ept:Fiyat', attrgetter('price'), None),
+    ('ept:FiyatFarkiMi', attrgetter('is_price_difference'), None),
+    ('ept:Tanim', attrgetter('name'), None),
+))
+
+write_variants = record_writer('ept:Variant', (
+    ('ept:AnaUrunKodu', attrgetter('main_barcode'), None),
+    ('ept:Attributes', attrgetter('attributes'), write_variant_attributes),
+    ('ept:Miktar', attrgetter('quantity'), None),
+    ('ept:VariantBarkod', attrgetter('variant_barcode'), None),
+))
+
+write_parts = record_writer('ept:PartRequest', (
+    ('ept:Desi', attrgetter('desi'), None),
+    ('ept:PartComment', lambda part: part.comment or '', None),
+    ('ept:PartNo', attrgetter('part_no'), None),
+))
+
+write_images = record_writer('ept:UrunResim', (
+    ('ept:Sira', attrgetter('order'), None),
+    ('ept:Url', attrgetter('url'), None),
+))
+
+def _dimension(index: int) -> Callable:
+    def get(product):
+        return product.dimensions[index]
+    return get
+
+# StokUrun member -> (ProductUpdateV2 value, list writer)
+PRODUCT_FIELDS: Tuple[Member, ...] = (
+    ('Aciklama', attrgetter('description'), None),
+    ('AdminCode', attrgetter('admin_code'), None),
+    ('Agirlik', attrgetter('weight'), None),
+    ('Aktif', attrgetter('is_active'), None),
+    ('AltKategoriAdi', attrgetter('subcategory_name'), None),
+    ('AltKategoriId', attrgetter('subcategory_id'), None),
+    ('AnaKategoriId', attrgetter('main_category_id'), None),
+    ('Barkod', attrgetter('barcode'), None),
+    ('BoyX', _dimension(0), None),
+    ('BoyY', _dimension(1), None),
+    ('BoyZ', _dimension(2), None),
+    ('Desi', attrgetter('desi'), None),
+    ('Durum', attrgetter('status'), None),
+    ('GarantiSuresi', attrgetter('warranty_period'), None),
+    ('GarantiVerenFirma', attrgetter('warranty_company'), None),
+    ('Gtin', attrgetter('gtin'), None),
+    ('IsAdmin', attrgetter('is_admin'), None),
+    ('Iskonto', attrgetter('discount'), None),
+    ('KDVOran', attrgetter('vat_rate'), None),
+    ('KDVli', attrgetter('price_with_vat'), None),
+    ('KDVsiz', attrgetter('price_without_vat'), None),
+    ('KargoProfilId', attrgetter('cargo_profile_id'), None),
+    ('KategoriBilgisiGuncelle', attrgetter('update_category_info'), None),
+    ('Mevcut', attrgetter('is_available'), None),
+    ('Miktar', attrgetter('quantity'), None),
+    ('Parts', attrgetter('parts'), write_parts),
+    ('SatisBaslangicTarihi', attrgetter('sale_start_date'), None),
+    ('SatisBitisTarihi', attrgetter('sale_end_date'), None),
+    ('ShopId', attrgetter('shop_id'), None),
+    ('SingleBox', attrgetter('is_single_box'), None),
+    ('Tag', attrgetter('tag'), None),
+    ('TahminiKargoSuresi', attrgetter('estimated_shipping_time'), None),
+    ('TedarikciAltKategoriAdi', attrgetter('supplier_subcategory_name'), None),
+    ('TedarikciAltKategoriId', attrgetter('supplier_subcategory_id'), None),
+    ('TedarikciSanalKategoriId', attrgetter('supplier_virtual_category_id'), None),
+    ('UrunAdi', attrgetter('product_name'), None),
+    ('UrunId', attrgetter('product_id'), None),
+    ('UrunKodu', attrgetter('product_code'), None),
+    ('UrunResimleri', attrgetter('product_images'), write_images),
+    ('UrunUrl', attrgetter('product_url'), None),
+    ('UzunAciklama', attrgetter('long_description'), None),
+    ('VariantListesi', attrgetter('variants'), write_variants),
+    ('YeniKategoriId', attrgetter('category_id'), None),
+)
+
+write_products = record_writer(
+    'ept:StokUrun',
+    ((f"ept:{name}", get, write) for name, get, write in PRODUCT_FIELDS)
+)
+
+def serialize_fields(fields: Dict[str, Any]) -> RawXml:
+    """Serialize the members of a record, e.g. to hash or reuse a payload"""
+    writer = XmlWriter()
+    for name, value in fields.items():
+        writer.element(name, value)
+    return writer.getvalue()
+
+def product_fields(product) -> Dict[str, Any]:
+    """StokUrun member values of a ProductUpdateV2, keyed by tag"""
+    return {
+        name: serialize_list(write, get(product)) if write else get(product)
+        for name, get, write in PRODUCT_FIELDS
+    }
+
+def write_params(writer: XmlWriter, params: Optional[Dict[str, Any]]) -> None:
+    """Write operation parameters as ``tem:`` elements"""
+    if params:
+        for key, value in params.items():
+            writer.element(f"tem:{key}", value)
+
+def serialize_params(params: Optional[Dict[str, Any]]) -> bytes:
+    """Serialize operation parameters as ``tem:`` elements"""
+    writer = XmlWriter()
+    write_params(writer, params)
+    return bytes(writer.buffer)
@@ -0,0 +1,130 @@
+import asyncio
+import pytest
+from pttavm.async_client import AsyncPTTClient
+from pttavm.models.barcode import BarcodeError
+from pttavm.models.variant import StockPriceUpdate
+from pttavm.services.stock_service import StockService
+
+class FakeResponse:
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode('utf-8')
+
+class FakeAsyncTransport:
+    """Async transport stub returning canned SOAP responses"""
+
+    def __init__(self, status_code, content):
+        self.response = FakeResponse(status_code, content)
+        self.requests = []
+        self.closed = False
+
+    async def post(self, url, data, headers=None, timeout=None):
+        self.requests.append((url, data, headers))
+        return self.response
+
+    async def close(self):
+        self.closed = True
+
+def soap_response(operation, result_xml):
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+    <soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+        <soap:Body>
+            <{operation}Response xmlns="http://tempuri.org/">
+                <{operation}Result>{result_xml}</{operation}Result>
+            </{operation}Response>
+        </soap:Body>
+    </soap:Envelope>""".encode('utf-8')
+
+def test_async_get_version():
+    transport = FakeAsyncTransport(200, soap_response("GetVersion", "1.0.4.0"))
+
+    async def run():
+        async with AsyncPTTClient("test_user", "test_pass", transport=transport) as client:
+            return await client.get_version()
+
+    assert asyncio.run(run()) == {'version': '1.0.4.0'}
+    assert transport.closed
+
+    url, body, headers = transport.requests[0]
+    assert headers['SOAPAction'] == "http://tempuri.org/IService/GetVersion"
+    assert b"<wsse:Username>test_user</wsse:Username>" in body
+
+def test_async_error_status():
+    transport = FakeAsyncTransport(500, b"error")
+    client = AsyncPTTClient("test_user", "test_pass", transport=transport)
+
+    with pytest.raises(BarcodeError) as exc_info:
+        asyncio.run(client.check_barcode("123"))
+
+    assert 'API call failed with status code: 500' in str(exc_info.value)
+
+def test_async_update_stock_price_bulk():
+    transport = FakeAsyncTransport(200, soap_response("StokFiyatGuncelle3", "true"))
+    client = AsyncPTTClient("test_user", "test_pass", transport=transport)
+    updates = [
+        StockPriceUpdate(barcode=f"BRK-{i}", price_without_vat=10, vat_rate=20)
+        for i in range(3)
+    ]
+
+    results = asyncio.run(client.update_stock_price_bulk(updates, max_concurrency=2))
+
+    assert [(result.barcode, result.success) for result in results] == [
+        ("BRK-0", True), ("BRK-1", True), ("BRK-2", True)
+    ]
+    assert len(transport.requests) == 3
+
+def test_async_services_do_not_open_sessions():
+    client = AsyncPTTClient("test_user", "test_pass", transport=FakeAsyncTransport(200, b""))
+
+    for service in (client._category_service, client._stock_service,
+                    client._product_service, client._version_service):
+        assert not hasattr(service.transport, "session")
+        with pytest.raises(RuntimeError):
+            service.transport.post(service.API_URL, data=b"")
+
+def test_async_get_all_stocks_fetches_pages_concurrently(monkeypatch):
+    monkeypatch.setattr(StockService, "ITEMS_PER_PAGE", 2)
+    client = AsyncPTTClient("test_user", "test_pass", transport=FakeAsyncTransport(200, b""))
+    pages = {0: ["a", "b"], 1: ["c", "d"], 2: ["e"]}
+    requested, in_flight, progress = [], [0], []
+    peak = [0]
+
+    async def get_stocks(page=0):
+        requested.append(page)
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        # Later pages answer first; results must still come back in page order
+        await asyncio.sleep(0.01 * (3 - page))
+        in_flight[0] -= 1
+        return pages.get(page, [])
+
+    client.get_stocks = get_stocks
+    stocks = asyncio.run(client.get_all_stocks(
+        progress_callback=lambda batch, page, total: progress.append((page, total)),
+        max_concurrency=3
+    ))
+
+    assert stocks == ["a", "b", "c", "d", "e"]
+    assert progress == [(1, 2), (2, 4), (3, 5)]
+    assert peak[0] == 3
+    assert requested[:3] == [0, 1, 2]
+    assert asyncio.run(client.get_stock_count(max_concurrency=1)) == 5
+
+def test_async_bulk_update_consumes_input_lazily():
+    transport = FakeAsyncTransport(200, soap_response("StokFiyatGuncelle3", "true"))
+    client = AsyncPTTClient("test_user", "test_pass", transport=transport)
+    produced, in_flight = [0], []
+
+    def updates():
+        for i in range(50):
+            produced[0] += 1
+            # Items are only taken when one of the workers is free
+            in_flight.append(produced[0] - len(transport.requests))
+            yield StockPriceUpdate(barcode=f"BRK-{i}", price_without_vat=10, vat_rate=20)
+
+    results = asyncio.run(client.update_stock_price_bulk(updates(), max_concurrency=3))
+
+    assert [result.barcode for result in results] == [f"BRK-{i}" for i in range(50)]
+    assert all(result.success for result in results)
+    assert max(in_flight) <= 3
@@ -0,0 +1,58 @@
+import time
+from pttavm.models.barcode import BarcodeCheckResult
+from pttavm.models.product_update import ProductUpdateV2
+from pttavm.services.product_service import ProductService
+from pttavm.utils.barcode_cache import BarcodeCache
+
+class FakeProductService(ProductService):
+    """Answers barcode checks locally; barcodes starting with 'NEW' do not exist"""
+
+    def __init__(self, cache):
+        super().__init__(username="test_user", password="test_pass", barcode_cache=cache)
+        self.checked = []
+
+    def call_service(self, operation, params):
+        if operation == "BarkodKontrol":
+            self.checked.append(params["Barkod"])
+            return {"Success": not params["Barkod"].startswith("NEW")}
+        if operation == "BarkodKontrolBulk":
+            barcodes = params["Barkod"]["arr:string"]
+            self.checked.extend(barcodes)
+            return {"BarkodKontrolBulkResult": {
+                barcode: {"Success": not barcode.startswith("NEW")} for barcode in barcodes
+            }}
+        return {"Success": True}
+
+def test_cache_lru_and_ttl():
+    cache = BarcodeCache(max_size=2, ttl=60, negative_ttl=0.05)
+    cache.put(BarcodeCheckResult(barcode="BRK-1", exists=True))
+    cache.put(BarcodeCheckResult(barcode="NEW-1", exists=False))
+
+    assert cache.get("BRK-1").exists
+    assert cache.get(" NEW-1 ").exists is False
+    cache.put(BarcodeCheckResult(barcode="BRK-2", exists=True))
+    assert cache.get("BRK-1") is None  # least recently used entry evicted
+
+    cache.put(BarcodeCheckResult(barcode="NEW-2", exists=False))
+    time.sleep(0.06)
+    assert cache.get("NEW-2") is None  # negative result expired
+    assert cache.stats() == {"hits": 2, "misses": 2, "invalidations": 0, "size": 1}
+
+def test_service_uses_cache_and_invalidates_on_write():
+    cache = BarcodeCache()
+    service = FakeProductService(cache)
+
+    assert service.check_barcode("NEW-1").exists is False
+    assert service.check_barcode("NEW-1").exists is False
+    results = service.check_barcodes_bulk(["NEW-1", "BRK-1", "BRK-1"])
+    assert [r.exists for r in results] == [False, True, True]
+    assert service.checked == ["NEW-1", "BRK-1"]
+
+    service.update_product_v2(ProductUpdateV2(
+        barcode="NEW-1", product_name="Ürün", product_code="KOD", category_id=1
+    ))
+    service.check_barcode("NEW-1")
+
+    assert service.checked == ["NEW-1", "BRK-1", "NEW-1"]
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["invalidations"] == 1
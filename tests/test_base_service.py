@@ -0,0 +1,146 @@
+import xml.etree.ElementTree as ET
+import pytest
+import requests
+from pttavm.services.base_service import BaseService
+from pttavm.utils.retry import RetryPolicy, CircuitBreaker
+
+def test_envelope_segments_are_cached():
+    service = BaseService(username="test_user", password="p&ss")
+
+    headers, body = service._build_request("BarkodKontrol", {"Barkod": "123"})
+    _, other_body = service._build_request("BarkodKontrol", {"Barkod": "456"})
+
+    assert headers['SOAPAction'] == "http://tempuri.org/IService/BarkodKontrol"
+    assert len(service._envelope_cache) == 1
+    assert body.replace(b"123", b"456") == other_body
+
+    root = ET.fromstring(body)
+    ns = {'wsse': "http://docs.oasis-open.org/wss/2004/01/oasis-200401-wss-wssecurity-secext-1.0.xsd"}
+    assert root.find('.//wsse:Password', ns).text == "p&ss"
+
+def test_envelope_matches_string_builder():
+    service = BaseService(username="test_user", password="test_pass")
+    params = {"item": {"Barkod": "123", "Miktar": 5}, "page": 1}
+
+    _, body = service._build_request("StokFiyatGuncelle3", params)
+
+    assert body == service._create_soap_envelope("StokFiyatGuncelle3", params).encode('utf-8')
+    assert b"<tem:item><Barkod>123</Barkod><Miktar>5</Miktar></tem:item><tem:page>1</tem:page>" in body
+
+class FakeResponse:
+    def __init__(self, status_code, content=b""):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode('utf-8')
+
+class FakeTransport:
+    """Transport stub replaying a list of responses or exceptions"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def post(self, url, data, headers=None, timeout=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+def make_service(outcomes, **kwargs):
+    return BaseService(
+        username="test_user",
+        password="test_pass",
+        transport=FakeTransport(outcomes),
+        **kwargs
+    )
+
+def test_retry_read_operation():
+    service = make_service(
+        [requests.ConnectionError("reset"), FakeResponse(503), FakeResponse(200, b"<ok/>")],
+        retry_policy=RetryPolicy(max_attempts=3, backoff_base=0)
+    )
+
+    assert service.call_service_raw("StokKontrolListesi") == b"<ok/>"
+    assert service.transport.calls == 3
+    metrics = service.metrics.snapshot()["StokKontrolListesi"]
+    assert metrics["attempts"] == 3
+    assert metrics["retries"] == 2
+    assert metrics["failures"] == 2
+
+def test_write_operation_not_retried_by_default():
+    service = make_service(
+        [FakeResponse(503), FakeResponse(200)],
+        retry_policy=RetryPolicy(max_attempts=3, backoff_base=0)
+    )
+
+    with pytest.raises(Exception) as exc_info:
+        service.call_service_raw("StokFiyatGuncelle3")
+
+    assert 'status code: 503' in str(exc_info.value)
+    assert service.transport.calls == 1
+
+def test_circuit_breaker_fails_fast():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    service = make_service(
+        [FakeResponse(500), FakeResponse(500)],
+        circuit_breaker=breaker
+    )
+
+    for _ in range(2):
+        with pytest.raises(Exception):
+            service.call_service_raw("GetVersion")
+
+    with pytest.raises(Exception) as exc_info:
+        service.call_service_raw("GetVersion")
+
+    assert 'Circuit breaker is open' in str(exc_info.value)
+    assert service.transport.calls == 2
+    assert service.metrics.snapshot()["GetVersion"]["rejected"] == 1
+
+def test_unexpected_error_settles_half_open_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    service = make_service(
+        [
+            FakeResponse(500),
+            requests.exceptions.ChunkedEncodingError("truncated"),
+            FakeResponse(200, b"<ok/>"),
+        ],
+        circuit_breaker=breaker
+    )
+
+    with pytest.raises(Exception):
+        service.call_service_raw("GetVersion")
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # The half-open trial fails with an error that is not retried
+    with pytest.raises(Exception) as exc_info:
+        service.call_service_raw("GetVersion")
+    assert 'truncated' in str(exc_info.value)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    assert service.call_service_raw("GetVersion") == b"<ok/>"
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert service.metrics.snapshot()["GetVersion"]["failures"] == 2
+
+SOAP_FAULT = b"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>
+<s:Fault><faultcode>s:Client</faultcode><faultstring>Barkod bulunamadi</faultstring></s:Fault>
+</s:Body></s:Envelope>"""
+
+def test_soap_fault_is_not_retried_or_counted_by_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    service = make_service(
+        [FakeResponse(500, SOAP_FAULT) for _ in range(3)],
+        retry_policy=RetryPolicy(max_attempts=3, backoff_base=0),
+        circuit_breaker=breaker
+    )
+
+    for _ in range(3):
+        with pytest.raises(Exception) as exc_info:
+            service.call_service_raw("BarkodKontrol")
+        assert 'Barkod bulunamadi' in str(exc_info.value)
+
+    assert service.transport.calls == 3
+    assert breaker.state == CircuitBreaker.CLOSED
+    metrics = service.metrics.snapshot()["BarkodKontrol"]
+    assert (metrics["retries"], metrics["failures"]) == (0, 0)
@@ -0,0 +1,60 @@
+from pttavm.models.stock import Stock, StockDimensions, StockWarranty, StockPrice, StockProduct
+from pttavm.models.stock_table import StockTable
+from pttavm.models.variant import StockPriceUpdate
+from pttavm.models.product_update import ProductUpdateV2
+from pttavm.utils.catalog_sync import plan_sync
+
+def make_stock(barcode, price=100.0, quantity=5, is_active=True, category_id=10):
+    return Stock(
+        description=None, weight=0.0, is_active=is_active, barcode=barcode,
+        dimensions=StockDimensions(0.0, 0.0, 0.0), desi=1.0, status="Mevcut",
+        warranty=StockWarranty(0, None), gtin=None,
+        price=StockPrice(0.0, 20.0, price * 1.2, price),
+        cargo_profile_id=0, is_available=True, quantity=quantity, shop_id=1,
+        is_single_box=True,
+        product=StockProduct("Ürün", 1, "KOD", None, None),
+        category_id=category_id
+    )
+
+def make_update(barcode, price=100.0, quantity=5, is_active=True):
+    return StockPriceUpdate(
+        barcode=barcode, price_without_vat=price, vat_rate=20,
+        quantity=quantity, is_active=is_active
+    )
+
+SNAPSHOT = [make_stock("BRK-1"), make_stock("BRK-2"), make_stock("BRK-3", is_active=False)]
+
+def test_plan_sync_sends_only_changes():
+    desired = [
+        make_update("BRK-1"),
+        make_update("BRK-2", quantity=7),
+        make_update("BRK-3", price=100.001, is_active=False),
+        make_update("BRK-4"),
+    ]
+
+    plan = plan_sync(desired, SNAPSHOT)
+
+    assert [u.barcode for u in plan.stock_updates] == ["BRK-2", "BRK-4"]
+    assert plan.unchanged == ["BRK-1", "BRK-3"]
+    assert plan.missing == ["BRK-4"]
+    assert [(c.barcode, c.field, c.current, c.desired) for c in plan.changes] == [("BRK-2", "quantity", 5, 7)]
+    assert plan.summary() == {
+        "changed": 2, "unchanged": 2, "missing": 1,
+        "stock_updates": 2, "product_updates": 0,
+        "fields": {"quantity": 1},
+    }
+
+    assert plan_sync(desired, SNAPSHOT, include_missing=False).changed_barcodes == ["BRK-2"]
+
+def test_plan_sync_table_snapshot_and_products():
+    product = ProductUpdateV2(
+        barcode="BRK-1", product_name="Ürün", product_code="KOD", category_id=11,
+        vat_rate=20, price_without_vat=100.0, quantity=5
+    )
+    desired = [product, make_update("BRK-2", is_active=False)]
+
+    plan = plan_sync(desired, StockTable.from_stocks(SNAPSHOT))
+
+    assert plan.product_updates == [product]
+    assert [u.barcode for u in plan.stock_updates] == ["BRK-2"]
+    assert plan.summary()["fields"] == {"category_id": 1, "is_active": 1}
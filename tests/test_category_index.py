@@ -0,0 +1,50 @@
+from pttavm.models.category import Category
+from pttavm.models.category_tree import CategoryTree
+from pttavm.utils.category_index import CategoryIndex, fold, tokenize
+
+def make_tree():
+    tree = CategoryTree(root_id="1")
+    for category_id, name, parent_id in [
+        ("1", "Tüm Kategoriler", None),
+        ("10", "Elektronik", "1"),
+        ("11", "Cep Telefonu", "10"),
+        ("12", "Telefon Aksesuarları", "10"),
+        ("20", "Giyim", "1"),
+        ("21", "Ayakkabı", "20"),
+        ("22", "Kadın Ayakkabı", "21"),
+        ("30", "İç Giyim", "20"),
+    ]:
+        tree.add(Category(id=category_id, name=name, parent_id=parent_id))
+    return tree
+
+def test_turkish_folding():
+    assert fold("İSTANBUL") == fold("istanbul") == fold("Istanbul") == "istanbul"
+    assert fold("IŞIK") == fold("ışık") == "isik"
+    assert tokenize("Elektronik > Cep Telefonu") == ["elektronik", "cep", "telefonu"]
+
+def test_lookup_and_prefix():
+    index = CategoryIndex(make_tree())
+
+    assert len(index) == 7
+    assert [c.id for c in index.lookup("İÇ GİYİM")] == ["30"]
+    assert [c.id for c in index.lookup("giyim > ayakkabi > kadin ayakkabi")] == ["22"]
+    assert [c.id for c in index.prefix("tel")] == ["12"]
+    assert index.paths["22"] == "Giyim > Ayakkabı > Kadın Ayakkabı"
+
+def test_search_ranks_name_over_ancestor():
+    index = CategoryIndex(make_tree())
+
+    assert [m.category.id for m in index.search("AYAKKABI")][:2] == ["21", "22"]
+    assert index.search("giyim kadın ayakkabı")[0].category.id == "22"
+    assert index.search("telefon")[0].category.id == "12"
+    assert index.search("elektronk cep telefnu")[0].category.id == "11"  # fuzzy tokens
+    assert index.search("bahçe mobilyası") == []
+
+def test_resolve():
+    index = CategoryIndex(make_tree())
+
+    match = index.resolve("Elektronik/Cep Telefonları")
+    assert match.category.id == "11"
+    assert match.path == "Elektronik > Cep Telefonu"
+    assert index.resolve("Elektronik/Cep Telefonları") is match
+    assert index.resolve("Kitap") is None
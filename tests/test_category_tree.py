@@ -0,0 +1,75 @@
+import threading
+import pytest
+from pttavm.client import PTTClient
+from pttavm.models.category_tree import CategoryTree
+from pttavm.services.category_service import CategoryService
+
+TREE = {
+    "1": ("Tüm Kategoriler", ["10", "20"]),
+    "10": ("Elektronik", ["11", "12"]),
+    "11": ("Telefon", ["111"]),
+    "111": ("Cep Telefonu", []),
+    "12": ("Bilgisayar", []),
+    "20": ("Giyim", ["21"]),
+    "21": ("Ayakkabı", []),
+}
+
+def category_response(category_id):
+    name, children = TREE[category_id]
+    return {"a:category": {
+        "a:id": category_id,
+        "a:name": name,
+        "a:updated_at": "2024-01-01",
+        "a:children": {"a:category": [
+            {"a:id": child, "a:name": TREE[child][0], "a:parent_id": category_id} for child in children
+        ]} if children else None,
+    }}
+
+class FakeCategoryService(CategoryService):
+    def __init__(self, failing=None):
+        super().__init__(username="test_user", password="test_pass")
+        self.calls = []
+        self.failing = failing
+        self._lock = threading.Lock()
+
+    def call_service(self, operation, params):
+        with self._lock:
+            self.calls.append(params["id"])
+        if params["id"] == self.failing:
+            raise Exception("Sunucu hatası")
+        return category_response(params["id"])
+
+def test_category_tree_crawl():
+    service = FakeCategoryService()
+    tree = service.get_category_tree(max_workers=3)
+
+    assert sorted(service.calls) == sorted(TREE)
+    assert len(tree) == len(TREE)
+    assert [c.id for c in tree.root.children] == ["10", "20"]
+    assert [c.name for c in tree.parent_chain("111")] == ["Tüm Kategoriler", "Elektronik", "Telefon", "Cep Telefonu"]
+    assert tree.path(111) == "Elektronik > Telefon > Cep Telefonu"
+    assert tree.get("12").updated_at == "2024-01-01"
+    assert tree.parent_chain("999") == []
+    assert tree.is_fresh(60)
+
+def test_category_tree_crawl_failure():
+    with pytest.raises(Exception, match="Failed to get category tree"):
+        FakeCategoryService(failing="11").get_category_tree(max_workers=2)
+
+def test_client_category_tree_cache(tmp_path):
+    path = str(tmp_path / "categories.json")
+    client = PTTClient(username="test_user", password="test_pass")
+    client._category_service = FakeCategoryService()
+    tree = client.get_category_tree(path)
+
+    restored = CategoryTree.load(path)
+    assert restored.to_dict() == tree.to_dict()
+    assert restored.path("21") == "Giyim > Ayakkabı"
+
+    second = PTTClient(username="test_user", password="test_pass")
+    second._category_service = FakeCategoryService()
+    assert len(second.get_category_tree(path)) == len(TREE)
+    assert second._category_service.calls == []
+
+    second.get_category_tree(path, max_age=0)
+    assert len(second._category_service.calls) == len(TREE)
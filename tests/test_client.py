@@ -22,3 +22,18 @@ def test_client_invalid_credentials():
     )
     with pytest.raises(Exception):
         client.get_version()
+
+def test_services_share_transport():
+    """Test that all services share a single pooled transport"""
+    client = PTTClient(
+        username="test_user",
+        password="test_pass",
+        pool_maxsize=32
+    )
+    transport = client._transport
+    assert transport.pool_maxsize == 32
+    for name in ('category', 'stock', 'product', 'version'):
+        service = client.get_service(name)
+        assert service.transport is transport
+        assert service.username == "test_user"
+        assert service.password == "test_pass"
@@ -0,0 +1,81 @@
+from pttavm.models.variant import StockPriceUpdate
+from pttavm.models.product_update import ProductUpdateV2
+from pttavm.services.stock_service import StockService
+from pttavm.services.product_service import ProductService
+from pttavm.utils.fingerprint import PayloadFingerprints
+
+class FakeStockService(StockService):
+    """Records sent barcodes; barcodes starting with 'ERR' fail"""
+
+    def __init__(self, fingerprints):
+        super().__init__(username="test_user", password="test_pass", fingerprints=fingerprints)
+        self.sent = []
+
+    def call_service(self, operation, params):
+        body = self._serialize_params(params)
+        self.sent.append(body)
+        if b"ERR" in body:
+            raise Exception("Sunucu hatası")
+        return {"Success": True}
+
+class FakeProductService(ProductService):
+    def __init__(self, fingerprints):
+        super().__init__(username="test_user", password="test_pass", fingerprints=fingerprints)
+        self.requests = []
+
+    def call_service(self, operation, params):
+        self.requests.append((operation, self._serialize_params(params).count(b"<ept:StokUrun>")))
+        return {"Success": True}
+
+def make_update(barcode, quantity):
+    return StockPriceUpdate(barcode=barcode, price_without_vat=10, vat_rate=20, quantity=quantity)
+
+def make_product(barcode, name="Ürün"):
+    return ProductUpdateV2(barcode=barcode, product_name=name, product_code=barcode, category_id=5)
+
+def test_stock_update_skips_identical_payload():
+    fingerprints = PayloadFingerprints()
+    service = FakeStockService(fingerprints)
+
+    assert service.update_stock_price(make_update("BRK-1", 5))
+    assert service.update_stock_price(make_update("BRK-1", 5))
+    assert service.update_stock_price(make_update("BRK-1", 6))
+    assert len(service.sent) == 2
+    assert fingerprints.stats() == {"checked": 3, "skipped": 1, "recorded": 2, "size": 1}
+
+def test_failed_write_is_not_remembered():
+    fingerprints = PayloadFingerprints()
+    service = FakeStockService(fingerprints)
+
+    results = service.update_stock_price_bulk([make_update("ERR-1", 1), make_update("ERR-1", 1)], max_workers=1)
+    assert [r.success for r in results] == [False, False]
+    assert len(service.sent) == 2
+
+def test_chunked_products_filter_before_chunking():
+    service = FakeProductService(PayloadFingerprints())
+    service.update_products_v2_chunked([make_product(f"BRK-{i}") for i in range(4)], chunk_size=2)
+
+    products = [make_product(f"BRK-{i}") for i in range(4)] + [make_product("BRK-0", "Yeni ad"), make_product("BRK-9")]
+    report = service.update_products_v2_chunked(products, chunk_size=2)
+
+    assert service.requests[2:] == [("StokGuncelleV2Bulk", 2)]
+    assert report.skipped == ["BRK-0", "BRK-1", "BRK-2", "BRK-3"]
+    assert report.barcode_results == {"BRK-0": True, "BRK-1": True, "BRK-2": True, "BRK-3": True, "BRK-9": True}
+    assert service.update_products_v2_bulk([make_product("BRK-9")])
+    assert len(service.requests) == 3
+
+def test_product_update_replaces_stock_fingerprint(tmp_path):
+    path = str(tmp_path / "fingerprints.json")
+    fingerprints = PayloadFingerprints(path)
+    stock_service = FakeStockService(fingerprints)
+    product_service = FakeProductService(fingerprints)
+
+    stock_service.update_stock_price(make_update("BRK-1", 5))
+    product_service.update_product_v2(make_product("BRK-1"))
+    stock_service.update_stock_price(make_update("BRK-1", 5))
+    assert len(stock_service.sent) == 2
+
+    fingerprints.save()
+    restored = FakeStockService(PayloadFingerprints(path))
+    restored.update_stock_price(make_update("BRK-1", 5))
+    assert restored.sent == []
@@ -0,0 +1,177 @@
+import json
+import sqlite3
+from datetime import datetime
+import pytest
+from pttavm.models.variant import (
+    StockPriceUpdate, StockPriceUpdateResult, StockUpdateError, Variant, VariantAttribute
+)
+from pttavm.models.product_update import (
+    ProductUpdateV2, ProductImage, ProductPart, BulkUpdateReport, ChunkResult
+)
+from pttavm.utils.outbox import UpdateOutbox, decode_item, encode_item
+from pttavm.utils.retry import RetryPolicy
+
+class FakeStockService:
+    """Records sent batches; barcodes in ``failing`` are rejected"""
+
+    def __init__(self, failing=()):
+        self.batches = []
+        self.failing = set(failing)
+
+    def update_stock_price_bulk(self, update_data_list, max_workers=4):
+        batch = list(update_data_list)
+        self.batches.append([(item.barcode, item.quantity) for item in batch])
+        return [
+            StockPriceUpdateResult(barcode=item.barcode, success=False, error="Sunucu hatası")
+            if item.barcode in self.failing
+            else StockPriceUpdateResult(barcode=item.barcode, success=True)
+            for item in batch
+        ]
+
+class FakeProductService:
+    def __init__(self):
+        self.batches = []
+
+    def update_products_v2_chunked(self, products, chunk_size=100, max_workers=4):
+        products = list(products)
+        self.batches.append([product.barcode for product in products])
+        return BulkUpdateReport(chunks=[
+            ChunkResult(index=0, barcodes=[product.barcode for product in products], success=True)
+        ])
+
+def make_update(barcode, quantity):
+    return StockPriceUpdate(barcode=barcode, price_without_vat=10, vat_rate=20, quantity=quantity)
+
+def make_outbox(path, stock_service, product_service=None, **kwargs):
+    kwargs.setdefault("retry_policy", RetryPolicy(max_attempts=2, backoff_base=0, jitter=False))
+    return UpdateOutbox(str(path), stock_service, product_service or FakeProductService(), **kwargs)
+
+def test_outbox_sends_latest_update_per_barcode(tmp_path):
+    stock_service = FakeStockService()
+    with make_outbox(tmp_path / "outbox.db", stock_service) as outbox:
+        outbox.enqueue_many([make_update("BRK-1", 1), make_update("BRK-2", 5), make_update("BRK-1", 3)])
+        totals = outbox.drain()
+
+        assert stock_service.batches == [[("BRK-1", 3), ("BRK-2", 5)]]
+        assert totals == {"done": 2, "superseded": 1, "retried": 0, "failed": 0}
+        assert outbox.stats() == {"pending": 0, "done": 2, "failed": 0, "superseded": 1}
+        assert outbox.drain()["done"] == 0
+
+def test_outbox_keeps_kind_order_in_batch(tmp_path):
+    stock_service, product_service = FakeStockService(), FakeProductService()
+    with make_outbox(tmp_path / "outbox.db", stock_service, product_service) as outbox:
+        outbox.enqueue(ProductUpdateV2(barcode="BRK-1", product_name="Ürün", product_code="U-1", category_id=5))
+        outbox.enqueue(make_update("BRK-1", 4))
+        outbox.drain()
+
+        assert product_service.batches == [["BRK-1"]]
+        assert stock_service.batches == [[("BRK-1", 4)]]
+        with pytest.raises(StockUpdateError):
+            outbox.enqueue("BRK-1")
+
+def test_outbox_retries_then_fails(tmp_path):
+    stock_service = FakeStockService(failing={"BRK-1"})
+    with make_outbox(tmp_path / "outbox.db", stock_service) as outbox:
+        outbox.enqueue(make_update("BRK-1", 1))
+
+        assert outbox.drain(max_batches=1)["retried"] == 1
+        assert outbox.drain()["failed"] == 1
+        assert outbox.failed_items() == [
+            {"id": 1, "kind": "stock", "barcode": "BRK-1", "attempts": 2, "error": "Sunucu hatası"}
+        ]
+
+        stock_service.failing.clear()
+        assert outbox.retry_failed() == 1
+        assert outbox.drain()["done"] == 1
+
+def test_outbox_resumes_after_restart(tmp_path):
+    path = tmp_path / "outbox.db"
+    first = FakeStockService()
+    outbox = make_outbox(path, first, batch_size=2)
+    outbox.enqueue_many([make_update(f"BRK-{i}", i) for i in range(5)])
+    outbox.drain(max_batches=1)
+    outbox.close()
+
+    second = FakeStockService()
+    with make_outbox(path, second, batch_size=2) as outbox:
+        outbox.drain()
+
+    assert first.batches == [[("BRK-0", 0), ("BRK-1", 1)]]
+    assert second.batches == [[("BRK-2", 2), ("BRK-3", 3)], [("BRK-4", 4)]]
+
+def test_outbox_success_supersedes_pending_retry(tmp_path):
+    stock_service = FakeStockService(failing={"BRK-1"})
+    with make_outbox(tmp_path / "outbox.db", stock_service,
+                     retry_policy=RetryPolicy(max_attempts=3, backoff_base=60, jitter=False)) as outbox:
+        outbox.enqueue(make_update("BRK-1", 1))
+        outbox.drain()
+
+        stock_service.failing.clear()
+        outbox.enqueue(make_update("BRK-1", 2))
+        outbox.drain()
+
+        assert outbox.stats() == {"pending": 0, "done": 1, "failed": 0, "superseded": 1}
+
+def test_outbox_payloads_round_trip_as_json(tmp_path):
+    variant = Variant(
+        main_barcode="BRK-1", variant_barcode="BRK-1-S", quantity=2,
+        attributes=[VariantAttribute(name="Beden", value="S")]
+    )
+    update = StockPriceUpdate(barcode="BRK-1", price_without_vat=100, vat_rate=20, discount=10)
+    product = ProductUpdateV2(
+        barcode="BRK-1", product_name="Ürün", product_code="U-1", category_id=5,
+        dimensions=(1, 2, 3), parts=[ProductPart(part_no=1, desi=2.5)],
+        product_images=[ProductImage(url="https://example.com/1.jpg", order=1)],
+        sale_start_date=datetime(2024, 1, 2, 3, 4), variants=[variant]
+    )
+
+    # The discount is applied once, when the update is created
+    assert decode_item("stock", encode_item(update)) == update
+    assert decode_item("product", encode_item(product)) == product
+
+    path = tmp_path / "outbox.db"
+    with make_outbox(path, FakeStockService()) as outbox:
+        outbox.enqueue(update)
+    with sqlite3.connect(path) as connection:
+        payload = json.loads(connection.execute("SELECT payload FROM outbox").fetchone()[0])
+    assert payload["price_without_vat"] == 90
+    assert json.loads(encode_item(product))["variants"][0]["attributes"] == [
+        {"name": "Beden", "value": "S", "price": 0.0, "is_price_difference": False}
+    ]
+
+def test_outbox_fails_unreadable_payload(tmp_path):
+    path = tmp_path / "outbox.db"
+    stock_service = FakeStockService()
+    with make_outbox(path, stock_service) as outbox:
+        outbox.enqueue_many([make_update("BRK-1", 1), make_update("BRK-2", 2)])
+        with sqlite3.connect(path) as connection:
+            connection.execute("UPDATE outbox SET payload = ? WHERE barcode = ?", ('{"barcode": "BRK-1"}', "BRK-1"))
+
+        assert outbox.drain() == {"done": 1, "superseded": 0, "retried": 0, "failed": 1}
+        assert stock_service.batches == [[("BRK-2", 2)]]
+        assert outbox.failed_items()[0]["error"].startswith("Unreadable payload")
+
+def test_client_writes_go_through_outbox(tmp_path):
+    from pttavm.client import PTTClient
+
+    stock_service, product_service = FakeStockService(failing={"BRK-2"}), FakeProductService()
+    client = PTTClient("test_user", "test_pass", outbox=str(tmp_path / "outbox.db"))
+    client._stock_service.update_stock_price_bulk = stock_service.update_stock_price_bulk
+    client._product_service.update_products_v2_chunked = product_service.update_products_v2_chunked
+    try:
+        assert client.update_stock_price(make_update("BRK-1", 1)) is True
+        results = client.update_stock_price_bulk([make_update("BRK-1", 2), make_update("BRK-2", 3)])
+        assert [(r.barcode, r.success) for r in results] == [("BRK-1", True), ("BRK-2", False)]
+        assert "Sunucu hatası" in results[1].error
+
+        with pytest.raises(StockUpdateError):
+            client.update_stock_price(make_update("BRK-2", 4))
+        assert client.update_product_v2(
+            ProductUpdateV2(barcode="BRK-1", product_name="Ürün", product_code="U-1", category_id=5)
+        ) is True
+
+        assert stock_service.batches[:2] == [[("BRK-1", 1)], [("BRK-1", 2), ("BRK-2", 3)]]
+        assert product_service.batches == [["BRK-1"]]
+        assert client._outbox.stats()["done"] == 3
+    finally:
+        client.close()
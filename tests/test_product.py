@@ -142,4 +142,74 @@ def test_update_products_v2_bulk(client):
             )
             for i in range(101)  # API limit is 100
         ]
-        client.update_products_v2_bulk(many_products)
\ No newline at end of file
+        client.update_products_v2_bulk(many_products)
+
+def make_products(count):
+    return (
+        ProductUpdateV2(
+            barcode=f"test-{i}",
+            product_name=f"Test Product {i}",
+            product_code=f"test-{i}",
+            category_id=1
+        )
+        for i in range(count)
+    )
+
+def test_update_products_v2_chunked():
+    """Test chunked bulk update report"""
+    from pttavm.services.product_service import ProductService
+
+    class FakeProductService(ProductService):
+        def __init__(self):
+            super().__init__(username="test_user", password="test_pass")
+            self.chunk_sizes = []
+
+        def update_products_v2_bulk(self, products):
+            self.chunk_sizes.append(len(products))
+            if products[0].barcode == "test-100":
+                raise Exception("API call failed")
+            return True
+
+    service = FakeProductService()
+    report = service.update_products_v2_chunked(make_products(250), max_workers=3)
+
+    assert sorted(service.chunk_sizes) == [50, 100, 100]
+    assert [chunk.index for chunk in report.chunks] == [0, 1, 2]
+    assert [chunk.success for chunk in report.chunks] == [True, False, True]
+    assert report.chunks[1].error == "API call failed"
+    assert not report.success
+    assert len(report.failed) == 100
+    assert report.barcode_results["test-0"] is True
+    assert report.barcode_results["test-150"] is False
+
+def test_check_barcodes_bulk_unbounded():
+    """Test deduplicated, chunked bulk barcode check"""
+    import threading
+    from pttavm.services.product_service import ProductService
+
+    class FakeProductService(ProductService):
+        def __init__(self):
+            super().__init__(username="test_user", password="test_pass")
+            self.requests = []
+            self.lock = threading.Lock()
+
+        def call_service(self, operation, params):
+            barcodes = params["Barkod"]["arr:string"]
+            with self.lock:
+                self.requests.append(list(barcodes))
+            return {"BarkodKontrolBulkResult": {
+                barcode: {"Success": int(barcode[4:]) % 2 == 0}
+                for barcode in barcodes
+            }}
+
+    barcodes = [f" BRK-{i} " for i in range(250)] + ["BRK-3", "BRK-0"]
+    service = FakeProductService()
+    results = service.check_barcodes_bulk(barcodes, max_workers=3)
+
+    assert sorted(len(request) for request in service.requests) == [50, 100, 100]
+    assert len(results) == 252
+    assert [r.barcode for r in results[:3]] == ["BRK-0", "BRK-1", "BRK-2"]
+    assert [r.exists for r in results[-2:]] == [False, True]
+
+    with pytest.raises(ValidationError):
+        service.check_barcodes_bulk(["BRK-1", "  "])
@@ -0,0 +1,100 @@
+import threading
+from pttavm.client import PTTClient
+from pttavm.services.stock_service import StockService
+from pttavm.services.product_service import ProductService
+from pttavm.utils.product_index import ProductIdIndex
+
+def stock_response(details):
+    return (
+        b'<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>'
+        b'<StokKontrolListesiResponse xmlns="http://tempuri.org/">'
+        b'<StokKontrolListesiResult xmlns:a="http://schemas.datacontract.org/2004/07/ePttAVMService">'
+        + b"".join(
+            b"<a:StokKontrolDetay><a:Barkod>%s</a:Barkod>%s</a:StokKontrolDetay>"
+            % (barcode, b"<a:UrunId>%d</a:UrunId>" % product_id if product_id else b"")
+            for barcode, product_id in details
+        )
+        + b"</StokKontrolListesiResult></StokKontrolListesiResponse></s:Body></s:Envelope>"
+    )
+
+STOCK_LIST_RESPONSE = stock_response([(b"BRK-1", 101), (b"BRK-2", None)])
+
+class FakeStockService(StockService):
+    def __init__(self, product_index):
+        super().__init__(username="test_user", password="test_pass", product_index=product_index)
+        self.lookups = []
+        self._lock = threading.Lock()
+
+    def call_service_raw(self, operation, params):
+        if "SearchPage" in params:
+            return STOCK_LIST_RESPONSE
+        with self._lock:
+            self.lookups.append(params["Barkod"])
+        if params["Barkod"] == "BRK-9":
+            return stock_response([(b"BRK-9", 909)])
+        return stock_response([])
+
+class FakeProductService(ProductService):
+    def __init__(self):
+        super().__init__(username="test_user", password="test_pass")
+        self.activations = []
+
+    def activate_product(self, activation):
+        self.activations.append((activation.product_id, activation.is_active))
+        return True
+
+def make_client(index=None):
+    client = PTTClient(username="test_user", password="test_pass", product_index=index if index is not None else ProductIdIndex())
+    client._stock_service = FakeStockService(client.get_product_index())
+    client._product_service = FakeProductService()
+    return client
+
+def test_index_filled_from_stock_pages(tmp_path):
+    client = make_client()
+    client.get_stocks(0)
+
+    index = client.get_product_index()
+    assert index.get("BRK-1") == (101, None)
+    assert "BRK-2" not in index  # no UrunId in the response
+
+    path = str(tmp_path / "products.json")
+    index.save(path)
+    assert ProductIdIndex(path).product_id("BRK-1") == 101
+
+def test_activate_by_barcode_uses_index():
+    client = make_client()
+    client.get_stocks(0)
+
+    assert client.activate_by_barcode("BRK-1", is_active=False)
+    assert client.get_product_id("BRK-9") == 909
+    assert client._stock_service.lookups == ["BRK-9"]
+    assert client._product_service.activations == [(101, False)]
+
+def test_activate_by_barcodes_bulk():
+    index = ProductIdIndex()
+    index.put("BRK-1", 101, "KOD-1")
+    client = make_client(index)
+
+    results = client.activate_by_barcodes(["BRK-1", "BRK-9", "NOPE", "BRK-1"], max_workers=2)
+
+    assert [(r.barcode, r.success, r.product_id, r.error) for r in results] == [
+        ("BRK-1", True, 101, None),
+        ("BRK-9", True, 909, None),
+        ("NOPE", False, None, "Product not found"),
+    ]
+    assert sorted(client._stock_service.lookups) == ["BRK-9", "NOPE"]
+    assert sorted(client._product_service.activations) == [(101, True), (909, True)]
+
+def test_activation_without_index():
+    client = PTTClient(username="test_user", password="test_pass")
+    client._stock_service = FakeStockService(client.get_product_index())
+    client._product_service = FakeProductService()
+    client.get_stocks(0)
+
+    assert client.get_product_index() is None
+    assert client.activate_by_barcode("BRK-9")
+    results = client.activate_by_barcodes(["BRK-9", "NOPE"])
+
+    assert [(r.barcode, r.success, r.product_id) for r in results] == [("BRK-9", True, 909), ("NOPE", False, None)]
+    assert client._stock_service.lookups == ["BRK-9", "BRK-9", "NOPE"]
+    assert client._product_service.activations == [(909, True), (909, True)]
@@ -0,0 +1,48 @@
+import threading
+import time
+from pttavm.client import PTTClient
+from pttavm.utils.rate_limiter import TokenBucket, RateLimiter
+
+def test_token_bucket_burst_then_paced():
+    bucket = TokenBucket(rate=50, burst=5)
+
+    waits = [bucket.acquire() for _ in range(10)]
+
+    assert waits[:5] == [0.0] * 5
+    assert all(wait > 0 for wait in waits[5:])
+
+def test_rate_limiter_shared_across_threads():
+    limiter = RateLimiter(rate=100, burst=1)
+    start = time.monotonic()
+
+    threads = [
+        threading.Thread(target=lambda: [limiter.acquire("BarkodKontrol") for _ in range(5)])
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 20 calls at 100/s with a single token burst take at least ~0.19s
+    assert time.monotonic() - start >= 0.18
+
+def test_operation_rate_limit():
+    limiter = RateLimiter(operation_rates={"StokFiyatGuncelle3": 20})
+
+    waits = [limiter.acquire("StokFiyatGuncelle3") for _ in range(21)]
+
+    assert limiter.acquire("BarkodKontrol") == 0.0
+    assert waits[-1] > 0
+    assert limiter.total_wait >= waits[-1]
+
+def test_client_shares_rate_limiter():
+    client = PTTClient(
+        username="test_user",
+        password="test_pass",
+        rate_limit=10,
+        operation_rate_limits={"StokKontrolListesi": 2}
+    )
+
+    limiters = {id(client.get_service(name).rate_limiter) for name in ('category', 'stock', 'product', 'version')}
+    assert limiters == {id(client._rate_limiter)}
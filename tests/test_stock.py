@@ -1,5 +1,53 @@
+import threading
 import pytest
 from pttavm.services.stock_service import StockService
+from pttavm.models.stock_table import StockTable
+from pttavm.models.variant import StockPriceUpdate
+
+STOCK_LIST_RESPONSE = b"""<?xml version="1.0" encoding="utf-8"?>
+<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+    <s:Body>
+        <StokKontrolListesiResponse xmlns="http://tempuri.org/">
+            <StokKontrolListesiResult xmlns:a="http://schemas.datacontract.org/2004/07/ePttAVMService" xmlns:i="http://www.w3.org/2001/XMLSchema-instance">
+                <a:StokKontrolDetay>
+                    <a:Aciklama>Kisa aciklama</a:Aciklama>
+                    <a:Agirlik>1.5</a:Agirlik>
+                    <a:Aktif>true</a:Aktif>
+                    <a:Barkod>BRK-1</a:Barkod>
+                    <a:GarantiVerenFirma i:nil="true"/>
+                    <a:KDVli>120</a:KDVli>
+                    <a:Miktar>7</a:Miktar>
+                    <a:UrunAdi>Urun 1</a:UrunAdi>
+                    <a:UrunId>101</a:UrunId>
+                    <a:UzunAciklama>&lt;p&gt;Uzun&lt;/p&gt;</a:UzunAciklama>
+                    <a:YeniKategoriId>55</a:YeniKategoriId>
+                </a:StokKontrolDetay>
+                <a:StokKontrolDetay>
+                    <a:Aktif>false</a:Aktif>
+                    <a:Barkod>BRK-2</a:Barkod>
+                    <a:Miktar>0</a:Miktar>
+                </a:StokKontrolDetay>
+            </StokKontrolListesiResult>
+        </StokKontrolListesiResponse>
+    </s:Body>
+</s:Envelope>"""
+
+class PagedStockService(StockService):
+    """StockService with canned pages instead of API calls"""
+    ITEMS_PER_PAGE = 3
+
+    def __init__(self, total_items):
+        super().__init__(username="test_username", password="test_password")
+        self.total_items = total_items
+        self.requested_pages = []
+        self._lock = threading.Lock()
+
+    def get_stock_list(self, page: int = 0):
+        with self._lock:
+            self.requested_pages.append(page)
+        start = page * self.ITEMS_PER_PAGE
+        end = min(start + self.ITEMS_PER_PAGE, self.total_items)
+        return list(range(start, end))
 
 def test_get_stock_list():
     service = StockService(
@@ -59,5 +107,145 @@ def test_get_all_stocks():
     if all_stocks:
         assert len(all_stocks) == service.get_total_stock_count()
 
+@pytest.mark.parametrize("max_workers", [1, 4])
+@pytest.mark.parametrize("total_items", [0, 2, 9, 10])
+def test_get_all_stocks_prefetch(max_workers, total_items):
+    service = PagedStockService(total_items)
+    pages = []
+
+    def callback(stocks, page, total):
+        pages.append(page)
+
+    all_stocks = service.get_all_stocks(batch_callback=callback, max_workers=max_workers)
+
+    assert all_stocks == list(range(total_items))
+    assert pages == list(range(1, len(pages) + 1))
+    # Prefetching never runs more than max_workers pages past the last one
+    last_page = total_items // service.ITEMS_PER_PAGE
+    assert max(service.requested_pages) <= last_page + max_workers
+
+def test_iter_stocks_stops_early():
+    service = PagedStockService(30)
+
+    iterator = service.iter_stocks()
+    first = [next(iterator) for _ in range(4)]
+    iterator.close()
+
+    assert first == [0, 1, 2, 3]
+    assert service.requested_pages == [0, 1]
+
+def test_iter_stocks_pages():
+    service = PagedStockService(7)
+
+    pages = list(service.iter_stocks(pages=True, max_workers=2))
+
+    assert pages == [[0, 1, 2], [3, 4, 5], [6]]
+
+def test_parse_stock_list_stream():
+    service = StockService(username="test_username", password="test_password")
+
+    stocks = service._parse_stock_list_response(STOCK_LIST_RESPONSE)
+
+    assert [stock.barcode for stock in stocks] == ["BRK-1", "BRK-2"]
+    first = stocks[0]
+    assert first.is_active is True
+    assert first.weight == 1.5
+    assert first.quantity == 7
+    assert first.price.price_with_vat == 120.0
+    assert first.warranty.warranty_company is None
+    assert first.product.product_id == 101
+    assert first.product.product_long_description == "<p>Uzun</p>"
+    assert first.category_id == 55
+    assert stocks[1].is_active is False
+    assert stocks[1].product.product_id == 0
+
+def test_parse_single_stock_stream():
+    service = StockService(username="test_username", password="test_password")
+
+    stock = service._parse_single_stock_response(STOCK_LIST_RESPONSE)
+
+    assert stock.barcode == "BRK-1"
+
+def test_stock_table_round_trip():
+    service = StockService(username="test_username", password="test_password")
+    stocks = service._parse_stock_list_response(STOCK_LIST_RESPONSE)
+
+    table = StockTable.from_stocks(stocks)
+
+    assert len(table) == 2
+    assert [table.to_stock(i) for i in range(len(table))] == stocks
+    row = table[0]
+    assert row.barcode == "BRK-1"
+    assert row.is_active is True
+    assert row.price_with_vat == 120.0
+    assert row.product_id == 101
+    assert table[-1].barcode == "BRK-2"
+    assert list(table.column('quantity')) == [7, 0]
+    with pytest.raises(AttributeError):
+        row.extra = 1
+
+def test_get_all_stocks_as_table():
+    parsed = StockService(
+        username="test_username", password="test_password"
+    )._parse_stock_list_response(STOCK_LIST_RESPONSE)
+
+    class TableStockService(StockService):
+        def get_stock_list(self, page: int = 0):
+            return parsed if page == 0 else []
+
+    service = TableStockService(username="test_username", password="test_password")
+    table = service.get_all_stocks(as_table=True)
+
+    assert isinstance(table, StockTable)
+    assert [row.barcode for row in table] == ["BRK-1", "BRK-2"]
+
+def test_parse_records_field_errors():
+    service = StockService(username="test_username", password="test_password")
+    content = STOCK_LIST_RESPONSE.replace(b"<a:Miktar>7</a:Miktar>", b"<a:Miktar>yedi</a:Miktar>")
+
+    stocks = service._parse_stock_list_response(content)
+
+    # The bad field falls back to its default, the row is kept
+    assert [stock.barcode for stock in stocks] == ["BRK-1", "BRK-2"]
+    assert stocks[0].quantity == 0
+    assert stocks[0].weight == 1.5
+    error = service.parse_errors[0]
+    assert (error.row, error.barcode, error.field, error.value) == (0, "BRK-1", "quantity", "yedi")
+
+def test_parse_stock_data_dict():
+    service = StockService(username="test_username", password="test_password")
+
+    stock = service._parse_stock_data({
+        'a:Barkod': "BRK-9",
+        'a:Miktar': "3",
+        'a:Gtin': {'@i:nil': 'true'},
+        'a:UrunId': "abc"
+    })
+
+    assert stock.barcode == "BRK-9"
+    assert stock.quantity == 3
+    assert stock.gtin is None
+    assert stock.product.product_id == 0
+    assert service.parse_errors[-1].tag == "UrunId"
+
+def test_update_stock_price_bulk():
+    class FakeStockService(StockService):
+        def update_stock_price(self, update_data):
+            if update_data.barcode == "BRK-2":
+                raise Exception("Failed to update stock price: timeout")
+            return True
+
+    service = FakeStockService(username="test_username", password="test_password")
+    updates = (
+        StockPriceUpdate(barcode=f"BRK-{i}", price_without_vat=10, vat_rate=20, quantity=i)
+        for i in range(5)
+    )
+
+    results = service.update_stock_price_bulk(updates, max_workers=3)
+
+    assert [result.barcode for result in results] == [f"BRK-{i}" for i in range(5)]
+    assert [result.success for result in results] == [True, True, False, True, True]
+    assert "timeout" in results[2].error
+
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
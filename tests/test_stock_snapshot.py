@@ -0,0 +1,64 @@
+import multiprocessing
+import pytest
+from pttavm.models.stock import Stock, StockDimensions, StockWarranty, StockPrice, StockProduct
+from pttavm.models.stock_table import StockTable
+from pttavm.utils.catalog_sync import snapshot_index
+from pttavm.utils.stock_snapshot import MappedStockTable, open_stock_snapshot, write_stock_snapshot
+
+def make_stock(barcode, product_id, quantity=5, description=None):
+    return Stock(
+        description=description, weight=1.5, is_active=product_id % 2 == 0, barcode=barcode,
+        dimensions=StockDimensions(1.0, 2.0, 3.0), desi=1.0, status="Mevcut",
+        warranty=StockWarranty(24, "Üretici"), gtin=None,
+        price=StockPrice(0.0, 20.0, 120.0, 100.0),
+        cargo_profile_id=0, is_available=True, quantity=quantity, shop_id=1,
+        is_single_box=False,
+        product=StockProduct(f"Ürün {product_id}", product_id, f"KOD-{product_id}", None, "<p>Açıklama</p>"),
+        category_id=10
+    )
+
+STOCKS = [make_stock(f"BRK-{i}", i, quantity=i * 3, description="şık" if i == 2 else None) for i in range(200)]
+
+def test_snapshot_roundtrip(tmp_path):
+    path = str(tmp_path / "stocks.snap")
+    assert write_stock_snapshot(StockTable.from_stocks(STOCKS), path) == 200
+
+    with open_stock_snapshot(path) as snapshot:
+        assert len(snapshot) == 200
+        assert [snapshot.to_stock(i) for i in range(200)] == STOCKS
+        assert snapshot.find("BRK-42") == 42
+        assert snapshot.find("BRK-999") is None
+        assert snapshot.get("BRK-7").quantity == 21
+        assert snapshot.get("BRK-7").is_active is False
+        assert snapshot.get_stock("BRK-2").description == "şık"
+        assert isinstance(snapshot.column("quantity"), memoryview)
+        assert snapshot_index(snapshot) == snapshot_index(STOCKS)
+        with pytest.raises(TypeError):
+            snapshot.append(STOCKS[0])
+
+def test_snapshot_empty_and_invalid(tmp_path):
+    path = str(tmp_path / "empty.snap")
+    write_stock_snapshot([], path)
+    with MappedStockTable(path) as snapshot:
+        assert len(snapshot) == 0
+        assert snapshot.find("BRK-1") is None
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"x" * 200)
+    with pytest.raises(ValueError):
+        MappedStockTable(str(other))
+
+def _read_quantity(path, barcode, queue):
+    with open_stock_snapshot(path) as snapshot:
+        queue.put(snapshot.get(barcode).quantity)
+
+def test_snapshot_shared_between_processes(tmp_path):
+    path = str(tmp_path / "stocks.snap")
+    write_stock_snapshot(STOCKS, path)
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_read_quantity, args=(path, "BRK-10", queue))
+    process.start()
+    process.join(30)
+    assert queue.get(timeout=5) == 30
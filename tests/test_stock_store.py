@@ -0,0 +1,94 @@
+import threading
+import pytest
+from pttavm.models.stock import Stock, StockDimensions, StockWarranty, StockPrice, StockProduct
+from pttavm.models.stock_table import StockTable
+from pttavm.utils import stock_store
+from pttavm.utils.stock_store import StockSnapshotStore
+
+def make_stock(barcode, product_id, quantity=5, price=100.0, category_id=10):
+    return Stock(
+        description=None, weight=0.0, is_active=True, barcode=barcode,
+        dimensions=StockDimensions(0.0, 0.0, 0.0), desi=1.0, status="Mevcut",
+        warranty=StockWarranty(0, None), gtin=None,
+        price=StockPrice(0.0, 20.0, price * 1.2, price),
+        cargo_profile_id=0, is_available=True, quantity=quantity, shop_id=1,
+        is_single_box=False,
+        product=StockProduct("Ürün", product_id, f"KOD-{product_id}", None, None),
+        category_id=category_id
+    )
+
+def test_store_roundtrip_and_queries(tmp_path):
+    stocks = [make_stock(f"BRK-{i}", i, quantity=i, category_id=10 + i % 2) for i in range(1, 7)]
+    with StockSnapshotStore(str(tmp_path / "stocks.db")) as store:
+        assert store.refresh(StockTable.from_stocks(stocks)) == {"crawl_id": 1, "rows": 6, "removed": 0}
+
+        assert store.get("BRK-3") == stocks[2]
+        assert store.get("NOPE") is None
+        assert sorted(store.get_many(["BRK-1", "BRK-2", "NOPE"])) == ["BRK-1", "BRK-2"]
+        assert [s.barcode for s in store.query(product_id=4)] == ["BRK-4"]
+        assert [s.barcode for s in store.query(category_id=11, quantity=(2, None))] == ["BRK-3", "BRK-5"]
+        assert [s.barcode for s in store.query(barcode=("BRK-2", "BRK-4"))] == ["BRK-2", "BRK-3", "BRK-4"]
+
+        table = store.query(order_by="quantity", limit=2, as_table=True)
+        assert list(table.column("quantity")) == [1, 2]
+
+        with pytest.raises(ValueError):
+            store.query(**{"quantity; DROP TABLE stocks": 1})
+
+def test_store_refresh_marks_removed(tmp_path, monkeypatch):
+    path = str(tmp_path / "stocks.db")
+    with StockSnapshotStore(path) as store:
+        store.refresh([make_stock("BRK-1", 1), make_stock("BRK-2", 2)])
+        summary = store.refresh(iter([make_stock("BRK-2", 2, quantity=9), make_stock("BRK-3", 3)]))
+
+        assert summary == {"crawl_id": 2, "rows": 2, "removed": 1}
+        assert store.get("BRK-1") is None
+        assert store.get("BRK-1", include_removed=True).barcode == "BRK-1"
+        assert store.get("BRK-2").quantity == 9
+        assert store.removed() == ["BRK-1"]
+        assert len(store) == 2
+
+    def failing_crawl():
+        yield make_stock("BRK-9", 9)
+        raise Exception("Sayfa alınamadı")
+
+    monkeypatch.setattr(stock_store, "BATCH_SIZE", 1)
+    with StockSnapshotStore(path) as store:
+        with pytest.raises(Exception):
+            store.refresh(failing_crawl())
+        # Completed batches are kept, but nothing is marked removed
+        assert store.get("BRK-9") is not None
+        assert len(store) == 3
+        assert store.last_refresh()["crawl_id"] == 2
+
+        store.refresh([make_stock("BRK-1", 1)])
+        assert store.get("BRK-1") is not None
+        assert store.removed() == ["BRK-2", "BRK-3", "BRK-9"]
+
+def test_store_refresh_does_not_block_readers(tmp_path, monkeypatch):
+    monkeypatch.setattr(stock_store, "BATCH_SIZE", 1)
+    seen = []
+
+    with StockSnapshotStore(str(tmp_path / "stocks.db")) as store:
+        store.refresh([make_stock("BRK-1", 1)])
+
+        def crawl():
+            yield make_stock("BRK-2", 2)
+            yield make_stock("BRK-3", 3)
+            # While the next page is fetched, earlier batches are readable
+            reader = threading.Thread(target=lambda: seen.extend(store.get_many(["BRK-1", "BRK-2"])))
+            reader.start()
+            reader.join(timeout=5)
+            yield make_stock("BRK-4", 4)
+
+        assert store.refresh(crawl()) == {"crawl_id": 2, "rows": 3, "removed": 1}
+        assert sorted(seen) == ["BRK-1", "BRK-2"]
+
+def test_store_skips_rows_without_barcode(tmp_path):
+    stocks = [make_stock("BRK-1", 1), make_stock("", 2), make_stock(None, 3)]
+    with StockSnapshotStore(str(tmp_path / "stocks.db")) as store:
+        for _ in range(2):
+            assert store.refresh(stocks)["rows"] == 1
+            assert store.refresh(StockTable.from_stocks(stocks))["rows"] == 1
+        assert len(store) == 1
+        assert store.query(include_removed=True, product_id=(2, None)) == []
@@ -0,0 +1,78 @@
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+import requests
+from pttavm.utils.transport import HttpTransport
+
+RESPONSE_BODY = b"<Envelope>" + b"<a:Miktar>1</a:Miktar>" * 500 + b"</Envelope>"
+
+class GzipHandler(BaseHTTPRequestHandler):
+    """Echoes request encoding details and answers gzip when asked"""
+
+    received = []
+    accept_encodings = []
+
+    def do_POST(self):
+        self.accept_encodings.append(self.headers.get('Accept-Encoding'))
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        self.received.append((self.headers.get('Content-Encoding'), body))
+
+        payload = RESPONSE_BODY
+        self.send_response(200)
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            payload = gzip.compress(payload)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server_url():
+    server = HTTPServer(('127.0.0.1', 0), GzipHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    GzipHandler.received = []
+    GzipHandler.accept_encodings = []
+    yield f"http://127.0.0.1:{server.server_port}/service.svc"
+    server.shutdown()
+    server.server_close()
+
+def test_gzip_request_and_response(server_url):
+    transport = HttpTransport(compress_requests=True, compress_min_size=100)
+    body = b"<tem:UzunAciklama>" + b"x" * 5000 + b"</tem:UzunAciklama>"
+    headers = {'SOAPAction': 'http://tempuri.org/IService/StokGuncelleV2Bulk'}
+
+    response = transport.post(server_url, data=body, headers=headers)
+    transport.post(server_url, data=b"<small/>", headers=headers)
+
+    assert response.content == RESPONSE_BODY
+    assert GzipHandler.received == [('gzip', body), (None, b"<small/>")]
+    # Responses are requested with the requests default, which includes gzip
+    assert GzipHandler.accept_encodings == [requests.utils.default_headers()['Accept-Encoding']] * 2
+    assert response.headers['Content-Encoding'] == 'gzip'
+    stats = transport.compression_stats.snapshot()['StokGuncelleV2Bulk']
+    assert stats['requests'] == 2
+    assert stats['request_bytes'] == len(body) + 8
+    assert stats['request_wire_bytes'] < len(body)
+    assert stats['response_bytes'] == 2 * len(RESPONSE_BODY)
+    assert stats['response_wire_bytes'] < len(RESPONSE_BODY)
+    assert stats['bytes_saved'] > len(body) + len(RESPONSE_BODY)
+    transport.close()
+
+def test_uncompressed_responses(server_url):
+    transport = HttpTransport(compress_responses=False)
+
+    transport.post(server_url, data=b"<x/>", headers={'SOAPAction': 'http://tempuri.org/IService/GetVersion'})
+
+    assert GzipHandler.accept_encodings == ['identity']
+    assert GzipHandler.received == [(None, b"<x/>")]
+    stats = transport.compression_stats.snapshot()['GetVersion']
+    assert stats['response_wire_bytes'] == stats['response_bytes'] == len(RESPONSE_BODY)
+    assert stats['bytes_saved'] == 0
+    transport.close()
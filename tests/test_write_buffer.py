@@ -0,0 +1,95 @@
+import threading
+import pytest
+from pttavm.models.variant import StockPriceUpdate, StockPriceUpdateResult, StockUpdateError
+from pttavm.utils.write_buffer import StockUpdateBuffer
+
+class FakeStockService:
+    """Records the batches sent by the buffer"""
+
+    def __init__(self):
+        self.batches = []
+        self.sent = threading.Event()
+
+    def update_stock_price_bulk(self, update_data_list, max_workers=4):
+        batch = list(update_data_list)
+        self.batches.append(batch)
+        self.sent.set()
+        return [StockPriceUpdateResult(barcode=item.barcode, success=True) for item in batch]
+
+def make_update(barcode, quantity):
+    return StockPriceUpdate(barcode=barcode, price_without_vat=10, vat_rate=20, quantity=quantity)
+
+def test_buffer_coalesces_per_barcode():
+    service = FakeStockService()
+    buffer = StockUpdateBuffer(service, window=60, max_size=100)
+
+    buffer.add(make_update("BRK-1", 1))
+    buffer.add(make_update("BRK-1", 2))
+    buffer.add(make_update("BRK-2", 5))
+    buffer.add(make_update("BRK-1", 3))
+    results = buffer.flush()
+
+    assert [(u.barcode, u.quantity) for u in service.batches[0]] == [("BRK-1", 3), ("BRK-2", 5)]
+    assert [r.barcode for r in results] == ["BRK-1", "BRK-2"]
+    assert (buffer.received, buffer.coalesced, buffer.sent) == (4, 2, 2)
+
+    buffer.close()
+    with pytest.raises(StockUpdateError):
+        buffer.add(make_update("BRK-3", 1))
+
+def test_buffer_custom_merge():
+    service = FakeStockService()
+
+    def add_quantities(previous, current):
+        current.quantity += previous.quantity
+        return current
+
+    with StockUpdateBuffer(service, window=60, merge=add_quantities) as buffer:
+        buffer.add(make_update("BRK-1", 2))
+        buffer.add(make_update("BRK-1", 3))
+
+    assert service.batches[0][0].quantity == 5
+
+def test_buffer_flushes_on_size_and_window():
+    service = FakeStockService()
+    results = []
+    buffer = StockUpdateBuffer(service, window=0.05, max_size=2, on_result=results.extend)
+
+    buffer.add(make_update("BRK-1", 1))
+    buffer.add(make_update("BRK-2", 1))
+    assert service.sent.wait(1)
+
+    service.sent.clear()
+    buffer.add(make_update("BRK-3", 1))
+    assert service.sent.wait(1)
+    buffer.close()
+
+    assert [len(batch) for batch in service.batches] == [2, 1]
+    assert [r.barcode for r in results] == ["BRK-1", "BRK-2", "BRK-3"]
+
+class FailingStockService(FakeStockService):
+    def update_stock_price_bulk(self, update_data_list, max_workers=4):
+        super().update_stock_price_bulk(update_data_list, max_workers)
+        raise ConnectionError("Sunucuya ulaşılamadı")
+
+def test_buffer_reports_failed_batch_and_keeps_running(caplog):
+    service = FailingStockService()
+    results = []
+
+    def on_result(batch):
+        results.extend(batch)
+        raise ValueError("callback hatası")
+
+    buffer = StockUpdateBuffer(service, window=0.01, on_result=on_result)
+    buffer.add(make_update("BRK-1", 1))
+    assert service.sent.wait(1)
+
+    service.sent.clear()
+    buffer.add(make_update("BRK-2", 1))
+    assert service.sent.wait(1)
+    buffer.close()
+
+    assert [(r.barcode, r.success, r.error) for r in results] == [
+        ("BRK-1", False, "Sunucuya ulaşılamadı"), ("BRK-2", False, "Sunucuya ulaşılamadı")
+    ]
+    assert "Error in stock update buffer callback" in caplog.text
@@ -0,0 +1,67 @@
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pttavm.models.product_update import ProductUpdateV2, ProductImage, ProductPart
+from pttavm.models.variant import StockPriceUpdate, Variant, VariantAttribute
+from pttavm.services.product_service import ProductService
+from pttavm.services.stock_service import StockService
+from pttavm.utils.xml_writer import XmlWriter, serialize_params
+
+EPT = "{http://schemas.datacontract.org/2004/07/ePttAVMService}"
+
+def make_product(i=1):
+    return ProductUpdateV2(
+        barcode=f"BRK-{i}",
+        product_name="Kalem & Defter <Set>",
+        product_code=f"KOD-{i}",
+        category_id=1,
+        long_description="<p>Uzun &amp; açıklama</p>",
+        sale_start_date=datetime(2024, 1, 2),
+        parts=[ProductPart(part_no=1, desi=2.5)],
+        product_images=[ProductImage(url="https://img/1.jpg?a=1&b=2", order=1)],
+        variants=[Variant(
+            main_barcode=f"BRK-{i}", variant_barcode=f"BRK-{i}-K", quantity=3,
+            attributes=[VariantAttribute(name="Renk", value="Kırmızı")]
+        )]
+    )
+
+def test_writer_escapes_and_skips_none():
+    writer = XmlWriter()
+    writer.element("a", "x < y & z")
+    writer.element("b", None)
+    writer.element("c", True)
+    writer.element("d", ["1", "2"])
+    writer.element("e", {"f": 1.5})
+
+    assert bytes(writer.buffer) == b"<a>x &lt; y &amp; z</a><c>true</c><d>1</d><d>2</d><e><f>1.5</f></e>"
+    assert serialize_params({"Barkod": "BRK-1"}) == b"<tem:Barkod>BRK-1</tem:Barkod>"
+
+def test_bulk_body_round_trips():
+    service = ProductService(username="test_user", password="test_pass")
+    products = [make_product(i) for i in range(3)]
+
+    _, body = service._build_request("StokGuncelleV2Bulk", service._products_v2_bulk_params(products))
+    items = ET.fromstring(body).findall(f".//{EPT}StokUrun")
+
+    assert len(items) == 3
+    item = items[0]
+    assert item.find(f"{EPT}UrunAdi").text == "Kalem & Defter <Set>"
+    assert item.find(f"{EPT}UzunAciklama").text == "<p>Uzun &amp; açıklama</p>"
+    assert item.find(f"{EPT}SatisBaslangicTarihi").text == "2024-01-02T00:00:00"
+    assert item.find(f"{EPT}AdminCode") is None
+    assert item.find(f"{EPT}UrunResimleri/{EPT}UrunResim/{EPT}Url").text == "https://img/1.jpg?a=1&b=2"
+    assert item.find(f"{EPT}Parts/{EPT}PartRequest/{EPT}Desi").text == "2.5"
+    assert item.find(f".//{EPT}VariantAttr/{EPT}Deger").text == "Kırmızı"
+
+def test_single_update_bodies_are_well_formed():
+    product_service = ProductService(username="test_user", password="test_pass")
+    _, body = product_service._build_request("StokGuncelleV2", product_service._product_v2_params(make_product()))
+    item = ET.fromstring(body).find(".//{http://tempuri.org/}item")
+    assert item.find("UrunAdi").text == "Kalem & Defter <Set>"
+    assert item.find(f"VariantListesi/{EPT}Variant/{EPT}VariantBarkod").text == "BRK-1-K"
+
+    stock_service = StockService(username="test_user", password="test_pass")
+    update = StockPriceUpdate(barcode="BRK-1", price_without_vat=10, vat_rate=20, is_active=False)
+    _, body = stock_service._build_request("StokFiyatGuncelle3", stock_service._stock_price_params(update))
+    item = ET.fromstring(body).find(".//{http://tempuri.org/}item")
+    assert item.find("Aktif").text == "false"
+    assert item.find("VariantListesi") is None